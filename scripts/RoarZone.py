@@ -1,6 +1,14 @@
-import requests
 import json
 import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+
+import m3u
+import net
 
 SERVER_URL = "http://160.187.56.254:8096"
 CLIENT = "Emby Data Extractor"
@@ -11,18 +19,88 @@ VERSION = "1.0.0"
 USERNAME = "RoarZone_Guest"
 PASSWORD = ""
 
-def authenticate():
+# Library items per /Items request, and how many requests are kept in flight
+PAGE_SIZE = 500
+PAGE_WORKERS = 4
+ITEM_FIELDS = "Overview,Path,MediaSources,ImageTags,Genres,ProductionYear,CommunityRating,OfficialRating,RunTimeTicks,MediaStreams,OriginalTitle,OriginalLanguage,ProductionLocations,DateLastSaved,DateLastMediaAdded"
+# Series expansion: series expanded at once, and season episode lists in flight
+SERIES_WORKERS = 4
+EPISODE_WORKERS = 8
+
+OUTPUT_DIR = "playlist"
+JSON_PATH = os.path.join(OUTPUT_DIR, "RoarZone.json")
+M3U_PATH = os.path.join(OUTPUT_DIR, "RoarZone.m3u")
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+# Access token and user id, reused until the server rejects them
+AUTH_CACHE = os.path.join(CACHE_DIR, "roarzone-auth.json")
+# Delta sync: what the outputs were built from, kept between runs
+SYNC_STATE = os.path.join(CACHE_DIR, "roarzone-sync.json")
+SYNC_VERSION = 2
+# Episodes of every series, reused while the series is unchanged
+SERIES_CACHE = os.path.join(CACHE_DIR, "roarzone-series.json")
+# ROARZONE_FULL_SYNC=1 forces a full sync; one also runs weekly to restore
+# the library's sort order (delta syncs append new items at the end)
+FULL_SYNC_ENV = "ROARZONE_FULL_SYNC"
+FULL_SYNC_EVERY = 7 * 24 * 3600
+# Id listing for deletions carries almost nothing per item, so pages are big
+ID_PAGE_SIZE = 5000
+IDS_PER_REQUEST = 100
+
+def session():
+    """The pooled session shared by every request, one connection per possible worker."""
+    return net.session("roarzone", pool_size=PAGE_WORKERS + SERIES_WORKERS + EPISODE_WORKERS)
+
+def login():
+    """Signs in with USERNAME/PASSWORD, returns (access token, user id)."""
     url = f"{SERVER_URL}/Users/AuthenticateByName"
     headers = {
         "Content-Type": "application/json",
         "X-Emby-Authorization": f'MediaBrowser Client="{CLIENT}", Device="{DEVICE}", DeviceId="{DEVICE_ID}", Version="{VERSION}"'
     }
     data = {"Username": USERNAME, "Pw": PASSWORD}
-    response = requests.post(url, headers=headers, json=data)
+    response = session().post(url, headers=headers, json=data, timeout=30)
     response.raise_for_status()
     result = response.json()
     return result["AccessToken"], result["User"]["Id"]
 
+def token_is_valid(api_key, user_id):
+    """Cheap check that the server still accepts a token: fetches the user record."""
+    response = session().get(
+        f"{SERVER_URL}/Users/{user_id}", headers={"X-Emby-Token": api_key}, timeout=30
+    )
+    if response.status_code in (401, 403):
+        return False
+    response.raise_for_status()
+    return True
+
+def authenticate():
+    """
+    The cached (access token, user id) if the server still accepts it,
+    otherwise a fresh login, which is then cached. Every stream URL embeds
+    the token, so reusing it keeps RoarZone.m3u byte-stable between runs.
+    """
+    try:
+        with open(AUTH_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+
+    if cached and cached.get("server") == SERVER_URL and cached.get("username") == USERNAME:
+        if token_is_valid(cached["api_key"], cached["user_id"]):
+            print("Reusing cached access token.")
+            return cached["api_key"], cached["user_id"]
+        print("Cached access token was rejected, signing in again...")
+
+    api_key, user_id = login()
+    m3u.write_json(AUTH_CACHE, {
+        "server": SERVER_URL,
+        "username": USERNAME,
+        "api_key": api_key,
+        "user_id": user_id,
+    })
+    return api_key, user_id
+
 def format_duration(ticks):
     if not ticks:
         return ""
@@ -33,17 +111,44 @@ def format_duration(ticks):
         return f"{hours}h {minutes}m"
     return f"{minutes}m"
 
-def get_items(api_key, user_id):
+def iter_item_pages(api_key, user_id, page_size=PAGE_SIZE, **filters):
+    """
+    Yields the library's Items one page (page_size) at a time, in order.
+    The first page gives TotalRecordCount; after that PAGE_WORKERS page
+    requests stay in flight, so the next pages download while the current
+    one is being written.
+    """
     url = f"{SERVER_URL}/Users/{user_id}/Items"
     headers = {"X-Emby-Token": api_key}
-    # Requesting more fields
+    # Requesting more fields; a fixed sort keeps the pages from overlapping
     params = {
         "IncludeItemTypes": "Movie,Series", 
         "Recursive": "true", 
-        "Fields": "Overview,Path,MediaSources,ImageTags,Genres,ProductionYear,CommunityRating,OfficialRating,RunTimeTicks,MediaStreams,OriginalTitle,OriginalLanguage,ProductionLocations"
+        "Fields": ITEM_FIELDS,
+        "SortBy": "SortName",
+        "SortOrder": "Ascending",
+        "Limit": page_size,
+        **filters,
     }
-    response = requests.get(url, headers=headers, params=params)
-    return response.json().get("Items", [])
+
+    def fetch(start):
+        response = session().get(url, headers=headers, params={**params, "StartIndex": start}, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+    first = fetch(0)
+    total = first.get("TotalRecordCount", 0)
+    yield first.get("Items", [])
+
+    starts = iter(range(page_size, total, page_size))
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+        pending = deque(executor.submit(fetch, start) for start in islice(starts, PAGE_WORKERS))
+        while pending:
+            page = pending.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(executor.submit(fetch, start))
+            yield page.get("Items", [])
 
 def determine_category(language_code, original_language, production_locations):
     # Normalize inputs
@@ -85,140 +190,486 @@ def determine_category(language_code, original_language, production_locations):
     
     return "Other"
 
+class Movie(m3u.Channel):
+    """A library item: the playlist fields plus the metadata kept in RoarZone.json."""
+    __slots__ = ("title", "overview", "genres", "year", "rating", "content_rating",
+                 "duration", "video_quality", "audio_info", "content_type")
+
+    def __init__(self, item_id, title, display_name, stream_url, image, category, content_type,
+                 overview="", genres="", year="", rating="", content_rating="", duration="",
+                 video_quality="", audio_info=""):
+        super().__init__(display_name, stream_url, logo=image, group=category, tvg_id=item_id)
+        self.title = title
+        self.overview = overview
+        self.genres = genres
+        self.year = year
+        self.rating = rating
+        self.content_rating = sys.intern(content_rating) if content_rating else ""
+        self.duration = duration
+        self.video_quality = sys.intern(video_quality) if video_quality else ""
+        self.audio_info = sys.intern(audio_info) if audio_info else ""
+        self.content_type = sys.intern(content_type)
+
+    @property
+    def library_id(self):
+        """Id of the library item this record came from."""
+        return self.tvg_id
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a record from its RoarZone.json entry."""
+        if "series_id" in data:
+            return Episode.from_dict(data)
+        return cls(
+            data["id"], data["title"], display_name(data["title"], data["year"], data["video_quality"]),
+            data["stream_url"], data["image"], data["category"], data["type"],
+            overview=data["overview"],
+            genres=data["genres"],
+            year=data["year"],
+            rating=data["rating"],
+            content_rating=data["content_rating"],
+            duration=data["duration"],
+            video_quality=data["video_quality"],
+            audio_info=data["audio_info"]
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.tvg_id,
+            "title": self.title,
+            "overview": self.overview,
+            "genres": self.genres,
+            "year": self.year,
+            "rating": self.rating,
+            "content_rating": self.content_rating,
+            "duration": self.duration,
+            "video_quality": self.video_quality,
+            "audio_info": self.audio_info,
+            "image": self.logo,
+            "stream_url": self.url,
+            "category": self.group,
+            "type": self.content_type
+        }
+
+class Episode(Movie):
+    """
+    One playable episode. Its playlist group is "<Series> - <Season>"; the
+    JSON keeps the series' category next to the series and season fields.
+    """
+    __slots__ = ("category", "series_id", "series", "season", "season_name", "episode")
+
+    def __init__(self, item_id, title, stream_url, image, category, series_id, series,
+                 season, season_name, episode, **metadata):
+        name = f"{series} S{season:02d}E{episode:02d} - {title}"
+        if metadata.get("video_quality"): name += f" - [{metadata['video_quality']}]"
+        super().__init__(item_id, title, name, stream_url, image, f"{series} - {season_name}",
+                         "Web Series", **metadata)
+        self.category = sys.intern(category) if category else ""
+        self.series_id = series_id
+        self.series = series
+        self.season = season
+        self.season_name = season_name
+        self.episode = episode
+
+    @property
+    def library_id(self):
+        return self.series_id
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["id"], data["title"], data["stream_url"], data["image"], data["category"],
+            data["series_id"], data["series"], data["season"], data["season_name"], data["episode"],
+            overview=data["overview"],
+            genres=data["genres"],
+            year=data["year"],
+            rating=data["rating"],
+            content_rating=data["content_rating"],
+            duration=data["duration"],
+            video_quality=data["video_quality"],
+            audio_info=data["audio_info"]
+        )
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["category"] = self.category
+        data["series_id"] = self.series_id
+        data["series"] = self.series
+        data["season"] = self.season
+        data["season_name"] = self.season_name
+        data["episode"] = self.episode
+        return data
+
+def display_name(title, year, video_quality):
+    """The M3U title: "Name (2021) - [1080p H264]"."""
+    title_ext = f"{title} ({year})"
+    if video_quality: title_ext += f" - [{video_quality}]"
+    return title_ext
+
 def determine_type(item_type):
     if item_type == "Series":
         return "Web Series"
     return "Movie"
 
+def make_movie(item, api_key):
+    """Builds the playlist/JSON record for one library item."""
+    item_id = item.get("Id")
+    name = item.get("Name")
+    overview = item.get("Overview", "")
+    item_type = item.get("Type", "Movie")
+    
+    # Metadata for categorization
+    original_language = item.get("OriginalLanguage", "")
+    production_locations = item.get("ProductionLocations", [])
+    
+    # 1. Genres
+    genres = item.get("Genres", [])
+    genre_str = ", ".join(genres) if genres else ""
+    
+    # 2. Year & Rating
+    year = item.get("ProductionYear", "")
+    rating_score = item.get("CommunityRating", "") # e.g. 7.1
+    official_rating = item.get("OfficialRating", "") # e.g. PG-13
+    
+    # 3. Duration
+    duration = format_duration(item.get("RunTimeTicks"))
+    
+    # 4. Media Info (Video/Audio)
+    video_quality = ""
+    audio_info = ""
+    language_code = "und" # Default undefined
+    container = "mp4" # default
+    
+    if item.get("MediaSources"):
+        source = item["MediaSources"][0]
+        container = source.get("Container", "mp4")
+        
+        # Video Details
+        streams = source.get("MediaStreams", [])
+        video_stream = next((s for s in streams if s.get("Type") == "Video"), None)
+        if video_stream:
+            width = video_stream.get("Width")
+            height = video_stream.get("Height")
+            codec = video_stream.get("Codec", "").upper()
+            
+            if width and height:
+                if width >= 3800: res = "4K"
+                elif width >= 1900: res = "1080p"
+                elif width >= 1200: res = "720p"
+                else: res = "SD"
+                video_quality = f"{res} {codec}"
+            else:
+                video_quality = codec
+
+        # Audio Details
+        audio_stream = next((s for s in streams if s.get("Type") == "Audio" and s.get("IsDefault")), None)
+        if not audio_stream and streams:
+             # Fallback to first audio stream
+             audio_stream = next((s for s in streams if s.get("Type") == "Audio"), None)
+        
+        if audio_stream:
+            lang = audio_stream.get("Language", "Unknown")
+            language_code = lang # Keep raw code for logic
+            lang_display = lang.title()
+            codec = audio_stream.get("Codec", "").upper()
+            channels = audio_stream.get("Channels", "")
+            channel_layout = "5.1" if channels == 6 else "2.0" # Simplification
+            audio_info = f"{lang_display} {codec} {channel_layout}"
+
+    # Construct Image URL
+    image_url = ""
+    if item.get("ImageTags", {}).get("Primary"):
+        image_url = f"{SERVER_URL}/Items/{item_id}/Images/Primary?maxHeight=400&maxWidth=267&quality=90"
+
+    # Construct Video Stream URL
+    stream_url = f"{SERVER_URL}/Videos/{item_id}/stream.{container}?static=true&api_key={api_key}"
+    
+    # Category & Type Logic
+    category = determine_category(language_code, original_language, production_locations) 
+    content_type = determine_type(item_type)
+
+    # M3U Entry
+    title_ext = display_name(name, year, video_quality)
+    
+    # Add category to group-title in M3U (Simplified)
+    return Movie(
+        item_id, name, title_ext, stream_url, image_url, category, content_type,
+        overview=overview,
+        genres=genre_str,
+        year=year,
+        rating=rating_score,
+        content_rating=official_rating,
+        duration=duration,
+        video_quality=video_quality,
+        audio_info=audio_info
+    )
+
+def make_episode(item, season, series, api_key):
+    """Builds the Episode record for one episode item of series (a Movie record)."""
+    record = make_movie(item, api_key)
+    return Episode(
+        record.tvg_id, item.get("Name", ""), record.url, record.logo or series.logo, series.group,
+        series.tvg_id, series.title, season.get("IndexNumber") or 0, season.get("Name", ""),
+        item.get("IndexNumber") or 0,
+        overview=record.overview,
+        genres=series.genres,
+        year=series.year,
+        rating=series.rating,
+        content_rating=series.content_rating,
+        duration=record.duration,
+        video_quality=record.video_quality,
+        audio_info=record.audio_info
+    )
+
+class SeriesExpander:
+    """
+    Turns Series items into their episodes, used as a context manager.
+
+    submit() returns a Future of the series' Episode records, in season and
+    episode order. Uncached series are expanded on SERIES_WORKERS threads:
+    each lists its seasons, then fetches every season's episodes at once on
+    a shared EPISODE_WORKERS pool. Results are kept in SERIES_CACHE keyed on
+    the series' item_version(), so an unchanged series costs no requests on
+    the next full sync. Entries are dropped when the access token changes,
+    since the cached stream URLs embed it.
+    """
+
+    def __init__(self, api_key, user_id, path=SERIES_CACHE):
+        self.api_key = api_key
+        self.user_id = user_id
+        self.path = path
+        self.hits = 0
+        self.fetched = 0
+        self._lock = threading.Lock()
+        self._session = session()
+        self._series_pool = ThreadPoolExecutor(max_workers=SERIES_WORKERS)
+        self._episode_pool = ThreadPoolExecutor(max_workers=EPISODE_WORKERS)
+        try:
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        self.entries = cached.get("series", {}) if cached.get("api_key") == api_key else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._series_pool.shutdown(cancel_futures=exc_type is not None)
+        self._episode_pool.shutdown(cancel_futures=exc_type is not None)
+        m3u.write_json(self.path, {"api_key": self.api_key, "series": self.entries}, indent=None)
+        print(f"Series: {self.hits} from cache, {self.fetched} fetched.")
+        return False
+
+    def _get(self, path, **params):
+        response = self._session.get(f"{SERVER_URL}{path}", headers={"X-Emby-Token": self.api_key},
+                                     params={"UserId": self.user_id, **params}, timeout=60)
+        response.raise_for_status()
+        return response.json().get("Items", [])
+
+    def _season_episodes(self, series, season):
+        items = self._get(f"/Shows/{series.tvg_id}/Episodes", SeasonId=season["Id"], Fields=ITEM_FIELDS)
+        return [make_episode(item, season, series, self.api_key) for item in items]
+
+    def _expand(self, item, series):
+        seasons = self._get(f"/Shows/{series.tvg_id}/Seasons")
+        futures = [self._episode_pool.submit(self._season_episodes, series, season) for season in seasons]
+        episodes = [episode for future in futures for episode in future.result()]
+        episodes.sort(key=lambda episode: (episode.season, episode.episode))
+        with self._lock:
+            self.entries[series.tvg_id] = {
+                "version": item_version(item),
+                "episodes": [episode.to_dict() for episode in episodes],
+            }
+            self.fetched += 1
+        return episodes
+
+    def submit(self, item, series):
+        cached = self.entries.get(series.tvg_id)
+        if cached is not None and cached["version"] == item_version(item):
+            self.hits += 1
+            future = Future()
+            future.set_result([Episode.from_dict(data) for data in cached["episodes"]])
+            return future
+        return self._series_pool.submit(self._expand, item, series)
+
+    def prune(self, keep_ids):
+        """Forgets series that are no longer in the library."""
+        with self._lock:
+            self.entries = {key: value for key, value in self.entries.items() if key in keep_ids}
+
+def stream_to(writer, movies):
+    """Passes movies through, writing each to the playlist on the way."""
+    for movie in movies:
+        writer.write_entry(movie)
+        yield movie
+
+def item_version(item):
+    """
+    What decides whether a stored copy of an item is current. Episodes
+    added to a series bump DateLastMediaAdded, not the series' DateLastSaved.
+    """
+    return f'{item.get("DateLastSaved", "")}|{item.get("DateLastMediaAdded", "")}'
+
+def iter_library(api_key, user_id, saved=None, expander=None, **filters):
+    """
+    (item id, records) for the library items matching filters, page by page
+    as the pages arrive. A movie is one record; with an expander a series
+    is its episodes (possibly none). Each item's version is put in saved.
+    """
+    seen_ids = set()
+    for items in iter_item_pages(api_key, user_id, **filters):
+        # Expand the page's series concurrently, then emit in library order
+        page = []
+        for item in items:
+            item_id = item.get("Id")
+            # Paging by offset can repeat an item if the library changes mid-sync
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+            if saved is not None:
+                saved[item_id] = item_version(item)
+            movie = make_movie(item, api_key)
+            if expander is not None and item.get("Type") == "Series":
+                page.append((item_id, expander.submit(item, movie)))
+            else:
+                page.append((item_id, [movie]))
+        for item_id, records in page:
+            yield item_id, records if isinstance(records, list) else records.result()
+
+def write_outputs(movies):
+    """Streams movies into RoarZone.m3u and RoarZone.json in one pass, returns the count."""
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    try:
+        with m3u.M3UWriter(M3U_PATH) as writer, open(JSON_PATH + ".tmp", "w", encoding="utf-8") as f:
+            count = m3u.write_json_array(f, stream_to(writer, movies), indent=4, ensure_ascii=False)
+    except BaseException:
+        if os.path.exists(JSON_PATH + ".tmp"):
+            os.remove(JSON_PATH + ".tmp")
+        raise
+    m3u.replace_if_changed(JSON_PATH + ".tmp", JSON_PATH)
+    return count
+
+def load_sync_state():
+    try:
+        with open(SYNC_STATE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_sync_state(api_key, items, full_synced_at):
+    """Remembers what the outputs were built from: Id -> item_version() of every item."""
+    m3u.write_json(SYNC_STATE, {
+        "version": SYNC_VERSION,
+        "api_key": api_key,
+        "full_synced_at": full_synced_at,
+        "watermark": max((version.split("|")[0] for version in items.values()), default=""),
+        "items": items,
+    }, indent=None)
+
+def needs_full_sync(state, api_key):
+    return (
+        state is None
+        or state.get("version") != SYNC_VERSION
+        or os.environ.get(FULL_SYNC_ENV) == "1"
+        # Every stream URL embeds the key, so a new key changes every entry
+        or state.get("api_key") != api_key
+        or time.time() - state.get("full_synced_at", 0) > FULL_SYNC_EVERY
+        or not (os.path.exists(JSON_PATH) and os.path.exists(M3U_PATH))
+    )
+
+def full_sync(api_key, user_id):
+    # Each page goes straight to both writers, so only PAGE_WORKERS pages
+    # are ever held in memory whatever the size of the library
+    saved = {}
+    with SeriesExpander(api_key, user_id) as expander:
+        library = iter_library(api_key, user_id, saved, expander)
+        count = write_outputs(record for _, records in library for record in records)
+        expander.prune(saved)
+    save_sync_state(api_key, saved, time.time())
+    return count
+
+def delta_sync(api_key, user_id, state):
+    """
+    Fetches only the items saved since the last sync (MinDateLastSaved),
+    lists every Id once to find deletions and anything the watermark
+    missed (new episodes included), then patches the previous
+    RoarZone.json / RoarZone.m3u: changed items are replaced where they
+    stand, new ones appended, deleted ones dropped. Returns the entry
+    count, or None if nothing changed.
+    """
+    previous_saved = state["items"]
+    saved = dict(previous_saved)
+    changed = {}
+    with SeriesExpander(api_key, user_id) as expander:
+        for item_id, records in iter_library(api_key, user_id, saved, expander,
+                                             MinDateLastSaved=state["watermark"]):
+            # MinDateLastSaved is inclusive, so the items at the watermark come
+            # back on every run without having changed
+            if saved[item_id] != previous_saved.get(item_id):
+                changed[item_id] = records
+
+        listed = {}
+        for items in iter_item_pages(api_key, user_id, page_size=ID_PAGE_SIZE,
+                                     Fields="DateLastSaved,DateLastMediaAdded", EnableImages="false"):
+            for item in items:
+                listed[item["Id"]] = item_version(item)
+
+        missed = [item_id for item_id, version in listed.items()
+                  if item_id not in changed and previous_saved.get(item_id) != version]
+        for start in range(0, len(missed), IDS_PER_REQUEST):
+            batch = ",".join(missed[start:start + IDS_PER_REQUEST])
+            for item_id, records in iter_library(api_key, user_id, saved, expander, Ids=batch):
+                changed[item_id] = records
+
+        removed = {item_id for item_id in saved if item_id not in listed}
+        for item_id in removed:
+            del saved[item_id]
+        expander.prune(saved)
+    print(f"Delta sync: {len(changed)} added or changed, {len(removed)} removed.")
+    if not changed and not removed:
+        return None
+
+    with open(JSON_PATH, encoding="utf-8") as f:
+        previous = m3u.load_json_array(f, cls=Movie)
+
+    def patched():
+        done = set()
+        for movie in previous:
+            item_id = movie.library_id
+            if item_id in removed or item_id in done:
+                continue
+            if item_id in changed:
+                # A changed series replaces all of its old episodes at once
+                done.add(item_id)
+                yield from changed.pop(item_id)
+            else:
+                yield movie
+        for records in changed.values():
+            yield from records
+
+    count = write_outputs(patched())
+    save_sync_state(api_key, saved, state["full_synced_at"])
+    return count
+
 def main():
     print(f"Logging in as {USERNAME}...")
     try:
         api_key, user_id = authenticate()
         print("Login success!")
-        
-        items = get_items(api_key, user_id)
-        print(f"Found {len(items)} items.")
-        
-        json_data = []
-        m3u_lines = ["#EXTM3U"]
-        
-        for item in items:
-            item_id = item.get("Id")
-            name = item.get("Name")
-            overview = item.get("Overview", "")
-            item_type = item.get("Type", "Movie")
-            
-            # Metadata for categorization
-            original_language = item.get("OriginalLanguage", "")
-            production_locations = item.get("ProductionLocations", [])
-            
-            # 1. Genres
-            genres = item.get("Genres", [])
-            genre_str = ", ".join(genres) if genres else ""
-            
-            # 2. Year & Rating
-            year = item.get("ProductionYear", "")
-            rating_score = item.get("CommunityRating", "") # e.g. 7.1
-            official_rating = item.get("OfficialRating", "") # e.g. PG-13
-            
-            # 3. Duration
-            duration = format_duration(item.get("RunTimeTicks"))
-            
-            # 4. Media Info (Video/Audio)
-            video_quality = ""
-            audio_info = ""
-            language_code = "und" # Default undefined
-            container = "mp4" # default
-            
-            if item.get("MediaSources"):
-                source = item["MediaSources"][0]
-                container = source.get("Container", "mp4")
-                
-                # Video Details
-                streams = source.get("MediaStreams", [])
-                video_stream = next((s for s in streams if s.get("Type") == "Video"), None)
-                if video_stream:
-                    width = video_stream.get("Width")
-                    height = video_stream.get("Height")
-                    codec = video_stream.get("Codec", "").upper()
-                    
-                    if width and height:
-                        if width >= 3800: res = "4K"
-                        elif width >= 1900: res = "1080p"
-                        elif width >= 1200: res = "720p"
-                        else: res = "SD"
-                        video_quality = f"{res} {codec}"
-                    else:
-                        video_quality = codec
-
-                # Audio Details
-                audio_stream = next((s for s in streams if s.get("Type") == "Audio" and s.get("IsDefault")), None)
-                if not audio_stream and streams:
-                     # Fallback to first audio stream
-                     audio_stream = next((s for s in streams if s.get("Type") == "Audio"), None)
-                
-                if audio_stream:
-                    lang = audio_stream.get("Language", "Unknown")
-                    language_code = lang # Keep raw code for logic
-                    lang_display = lang.title()
-                    codec = audio_stream.get("Codec", "").upper()
-                    channels = audio_stream.get("Channels", "")
-                    channel_layout = "5.1" if channels == 6 else "2.0" # Simplification
-                    audio_info = f"{lang_display} {codec} {channel_layout}"
-
-            # Construct Image URL
-            image_url = ""
-            if item.get("ImageTags", {}).get("Primary"):
-                image_tag = item["ImageTags"]["Primary"]
-                image_url = f"{SERVER_URL}/Items/{item_id}/Images/Primary?maxHeight=400&maxWidth=267&quality=90"
-
-            # Construct Video Stream URL
-            stream_url = f"{SERVER_URL}/Videos/{item_id}/stream.{container}?static=true&api_key={api_key}"
-            
-            # Category & Type Logic
-            category = determine_category(language_code, original_language, production_locations) 
-            content_type = determine_type(item_type)
-
-            movie_obj = {
-                "id": item_id,
-                "title": name,
-                "overview": overview,
-                "genres": genre_str,
-                "year": year,
-                "rating": rating_score,
-                "content_rating": official_rating,
-                "duration": duration,
-                "video_quality": video_quality,
-                "audio_info": audio_info,
-                "image": image_url,
-                "stream_url": stream_url,
-                "category": category,      # New Field
-                "type": content_type       # New Field
-            }
-            json_data.append(movie_obj)
-            
-            # M3U Entry
-            title_ext = f"{name} ({year})"
-            if video_quality: title_ext += f" - [{video_quality}]"
-            
-            # Add category to group-title in M3U (Simplified)
-            group_title = category
-            
-            m3u_lines.append(f'#EXTINF:-1 tvg-id="{item_id}" tvg-logo="{image_url}" group-title="{group_title}",{title_ext}')
-            m3u_lines.append(stream_url)
-            
-        # Ensure output directory exists
-        output_dir = "playlist"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
 
-        with open(os.path.join(output_dir, "RoarZone.json"), "w", encoding="utf-8") as f:
-            json.dump(json_data, f, indent=4, ensure_ascii=False)
-        
-        with open(os.path.join(output_dir, "RoarZone.m3u"), "w", encoding="utf-8") as f:
-            f.write("\n".join(m3u_lines))
+        state = load_sync_state()
+        if needs_full_sync(state, api_key):
+            print("Running a full library sync...")
+            count = full_sync(api_key, user_id)
+        else:
+            count = delta_sync(api_key, user_id, state)
+            if count is None:
+                print("Library unchanged since the last sync, keeping the existing files.")
+                return
             
-        print(f"Data saved to {output_dir}/RoarZone.json and {output_dir}/RoarZone.m3u. Extracted {len(json_data)} items.")
+        print(f"Data saved to {JSON_PATH} and {M3U_PATH}. Extracted {count} items.")
         
     except Exception as e:
         import traceback
@@ -1,60 +1,99 @@
-import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
 import re
 import time
 import sys
 import logging
 
+import dom
+import m3u
+import net
+
 logging.basicConfig(level=logging.INFO)
 
 BASE_URL = "http://tv.roarzone.info/"
 PLAYER_URL_TEMPLATE = "http://tv.roarzone.info/player.php?stream={}"
 
+# Player pages are cheap to serve, 75 in flight is what the site tolerates
+HOST_BUDGETS = {"tv.roarzone.info": net.HostBudget(concurrency=75)}
+# Tokenised m3u8 links are reused for at most this long (less if the link
+# carries its own expiry)
+RESOLVE_TTL = 3600
+
+
+def iter_cards(html):
+    """
+    Streams (attrs, img_attrs) for each div.channel-card on the main page
+    without building a tree: the channel data lives in the card's data-*
+    attributes, and its logo is the first <img> inside it (None if the
+    card has none). The card's end is found by counting nested divs.
+    """
+    card = img = None
+    depth = 0
+    for tag in dom.iter_tags(html, {"div", "img"}, end_tags=True):
+        if tag.name == "div":
+            if card is not None:
+                depth += 1
+            elif dom.has_class(tag, "channel-card"):
+                card, img, depth = tag.attrs, None, 1
+        elif tag.name == "/div":
+            if card is not None:
+                depth -= 1
+                if not depth:
+                    yield card, img
+                    card = None
+        elif card is not None and img is None:
+            img = tag.attrs
+    if card is not None:
+        yield card, img
+
 
 async def fetch_main_page(session):
     """Fetches the main page content."""
     print("Fetching main channel list...")
     try:
-        async with session.get(BASE_URL) as response:
-            if response.status == 200:
-                return await response.text()
-            else:
-                print(f"Error fetching main page: {response.status}")
-                return None
+        response = await session.get(BASE_URL)
+        if response.status == 200:
+            return response.text
+        else:
+            print(f"Error fetching main page: {response.status}")
+            return None
     except Exception as e:
         logging.exception(f"Exception fetching main page: {e}")
         print(f"Exception fetching main page: {e}")
         return None
 
 
-async def process_channel(session, channel, semaphore):
+async def process_channel(session, channel, resolutions):
     """Process a single channel to find its auth token."""
-    async with semaphore:
-        stream_path = channel.get("stream_path")
-        name = channel.get("name")
-        if not stream_path:
-            return None
-        player_url = PLAYER_URL_TEMPLATE.format(stream_path)
-        try:
-            async with session.get(player_url) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    m3u8_matches = re.findall(
-                        "https?://[^\\s\\\"'<>]+\\.m3u8[^\\s\\\"'<>]*", text
-                    )
-                    if m3u8_matches:
-                        channel["m3u8_url"] = m3u8_matches[0]
-                        print(f"[OK] Found token for {name}")
-                        return channel
-                    else:
-                        print(f"[ERR] No m3u8 found for {name}")
-                else:
-                    print(f"[ERR] HTTP {response.status} for {name}")
-        except Exception as e:
-            logging.exception(f"[EXC] Error processing {name}: {e}")
-            print(f"[EXC] Error processing {name}: {e}")
+    stream_path = channel.get("stream_path")
+    name = channel.get("name")
+    if not stream_path:
         return None
+    cached = resolutions.lookup(stream_path)
+    if cached:
+        channel["m3u8_url"] = cached.url
+        return channel
+    player_url = PLAYER_URL_TEMPLATE.format(stream_path)
+    try:
+        response = await session.get(player_url)
+        if response.status == 200:
+            m3u8_matches = re.findall(
+                "https?://[^\\s\\\"'<>]+\\.m3u8[^\\s\\\"'<>]*", response.text
+            )
+            if m3u8_matches:
+                channel["m3u8_url"] = m3u8_matches[0]
+                resolutions.store(stream_path, channel["m3u8_url"], channel.get("logo", ""))
+                print(f"[OK] Found token for {name}")
+                return channel
+            else:
+                print(f"[ERR] No m3u8 found for {name}")
+        else:
+            print(f"[ERR] HTTP {response.status} for {name}")
+    except Exception as e:
+        logging.exception(f"[EXC] Error processing {name}: {e}")
+        print(f"[EXC] Error processing {name}: {e}")
+    resolutions.fail(stream_path)
+    return None
 
 
 async def main():
@@ -64,20 +103,16 @@ async def main():
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Referer": BASE_URL,
     }
-    timeout = aiohttp.ClientTimeout(total=60)
-    async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+    async with net.FetchEngine(HOST_BUDGETS, headers=headers, timeout=60) as session:
         html = await fetch_main_page(session)
         if not html:
             print("Failed to retrieve channel list. Exiting.")
             return
-        soup = BeautifulSoup(html, "html.parser")
-        channel_cards = soup.find_all("div", class_="channel-card")
         extracted_channels = []
-        for idx, card in enumerate(channel_cards):
+        for idx, (card, img) in enumerate(iter_cards(html)):
             stream_path = card.get("data-stream", "")
             title = card.get("data-title", "")
             tags = card.get("data-tags", "")
-            img = card.find("img")
             logo = img.get("src", "") if img else ""
             if logo and (not logo.startswith("http")):
                 logo = f"{BASE_URL.rstrip('/')}/{logo.lstrip('/')}"
@@ -96,45 +131,27 @@ async def main():
         print(
             f"Found {total_channels} channels. Starting concurrent token extraction (75 workers)..."
         )
-        semaphore = asyncio.Semaphore(75)
-        tasks = [process_channel(session, c, semaphore) for c in extracted_channels]
-        results = await asyncio.gather(*tasks)
+        with net.ResolutionCache("roarzonetv", ttl=RESOLVE_TTL) as resolutions:
+            resolutions.prune(c["stream_path"] for c in extracted_channels)
+            tasks = [process_channel(session, c, resolutions) for c in extracted_channels]
+            results = await asyncio.gather(*tasks)
         valid_channels = [r for r in results if r is not None]
         print(
             f"\nScraping complete. Found {len(valid_channels)} valid streams out of {total_channels}."
         )
         filename = "playlist/RoarZoneTv.m3u"
         print(f"Generating M3U playlist: {filename}")
-        # Calculate BD Time (UTC + 6)
-        import datetime
-        utc_now = datetime.datetime.utcnow()
-        bd_time = utc_now + datetime.timedelta(hours=6)
-        formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-        count = len(valid_channels)
-
-        m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {count}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  
-"""
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(m3u_header)
+        with m3u.M3UWriter(filename, header=m3u.omnix_banner) as writer:
             for channel in valid_channels:
                 name = channel["name"].replace(",", " ")
-                logo = channel["logo"]
-                group = channel["tags"] or "Uncategorized"
-                url = channel["m3u8_url"]
-                f.write(
-                    f'#EXTINF:-1 tvg-id="{name}" tvg-name="{name}" tvg-logo="{logo}" group-title="{group}",{name}\n'
-                )
-                f.write(f"{url}\n")
+                writer.write_entry(m3u.Channel(
+                    name,
+                    channel["m3u8_url"],
+                    logo=channel["logo"],
+                    group=channel["tags"] or "Uncategorized",
+                    tvg_id=name,
+                    tvg_name=name,
+                ))
         print("Playlist file created successfully.")
         print(f"File saved locally as: {filename}")
     print(f"Total execution time: {time.time() - start_time:.2f} seconds")
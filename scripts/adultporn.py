@@ -1,7 +1,7 @@
 import requests
 import os
-import datetime
-import re
+
+import m3u
 
 def fetch_and_filter_adult_m3u():
     # URL to fetch the M3U data
@@ -67,28 +67,10 @@ def fetch_and_filter_adult_m3u():
             else:
                 i += 1
         
-        # Calculate time
-        utc_now = datetime.datetime.now(datetime.timezone.utc)
-        bd_time = utc_now + datetime.timedelta(hours=6)
-        current_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-        
         # Write Output
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write('#EXTM3U\n')
-            f.write('#=================================\n')
-            f.write('# Developed By: OMNIX EMPIER\n')
-            f.write('# IPTV Telegram Channels: https://t.me/omnix_Empire\n')
-            f.write(f'# Last Updated: {current_time} (BD Time)\n')
-            f.write(f'# TV channel counts :- {len(channels)}\n')
-            f.write('# Disclaimer:\n')
-            f.write('# This tool does NOT host any content.\n')
-            f.write('# It aggregates publicly available data for informational purposes only.\n')
-            f.write('# For any issues or concerns, please contact the developer.\n')
-            f.write('#==================================  \n')
-            
+        with m3u.M3UWriter(output_file, header=m3u.omnix_banner) as writer:
             for extinf, stream_url in channels:
-                f.write(f"{extinf}\n")
-                f.write(f"{stream_url}\n")
+                writer.write_entry(m3u.Entry(extinf, stream_url))
                 
         print(f"Successfully created: {output_file}")
         print(f"Total Adult channels extracted: {len(channels)}")
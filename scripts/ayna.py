@@ -1,217 +1,12 @@
-<<<<<<< Updated upstream
-import requests
-try:
-    from curl_cffi import requests as crequests
-except ImportError:
-    print("curl_cffi not found, falling back to requests (may fail)")
-    crequests = requests
-
-import re
-import time
-import sys
-import base64
-from urllib.parse import urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import socket
-import datetime
-
-
-BASE_URL = "https://n.shopnojaal.top/ayna/"
-# Match href that contains play.php
-LINK_PATTERN = r'<a[^>]+href=["\']([^"\']*play\.php\?id=[^"\']+)["\'][^>]*>(.*?)</a>'
-VIDEO_SRC_PATTERN = r'var\s+streamUrl\s*=\s*atob\("([^"]+)"\)'
-# Non-greedy match for src to avoid skipping to onerror
-LOGO_PATTERN = r'<img[^>]*?\bsrc=["\']([^"\']+)["\']'
-CATEGORY_PATTERN = r'<span[^>]*class=["\']channel-category["\'][^>]*>(.*?)</span>'
-
-def log(msg):
-    print(msg)
-    sys.stdout.flush()
-
-def process_channel(args):
-    """
-    Worker function to process a single channel using curl_cffi.
-    args is a tuple: (base_url, url, name, logo_url, category)
-    """
-    base_url, url, name, logo_url, category = args
-    full_url = urljoin(base_url, url)
-    
-    try:
-        # Use simple get with retry logic if possible or just timeout
-        # impersonate="chrome" handles the TLS fingerprint
-        play_resp = crequests.get(full_url, impersonate="chrome", timeout=15)
-        
-        if play_resp.status_code != 200:
-            # log(f"[{name}] Failed: Status {play_resp.status_code}")
-            return None
-        
-        play_resp_text = play_resp.text
-        
-        # Extract video source
-        match = re.search(VIDEO_SRC_PATTERN, play_resp_text)
-        if match:
-            b64_src = match.group(1)
-            try:
-                # Decode Base64
-                video_src = base64.b64decode(b64_src).decode('utf-8')
-                return {
-                    "name": name,
-                    "logo": logo_url,
-                    "group": category,
-                    "url": video_src
-                }
-            except Exception as e:
-                log(f"[{name}] Failed to decode base64: {e}") 
-    except Exception as e:
-        log(f"Error processing {name}: {e}")
-        pass
-    
-    return None
-
-def main():
-    log(f"Fetching channel list from {BASE_URL}...")
-    headers = {
-        'User-Agent': 'Mozilla/5.0',
-        'Accept': '*/*',
-        'Connection': 'keep-alive',
-    }
-    
-    # Use curl_cffi for main page too
-    try:
-        response = crequests.get(BASE_URL, impersonate="chrome", timeout=30)
-        if response.status_code != 200:
-            log(f"Failed to fetch main page: Status {response.status_code}")
-            return
-        response_text = response.text
-    except Exception as e:
-        log(f"Failed to fetch main page: {e}")
-        return
-
-    # Find all channel links and names
-    raw_matches = re.findall(LINK_PATTERN, response_text, re.IGNORECASE | re.DOTALL)
-    
-    channels_to_process = []
-    seen_urls = set()
-    
-    log(f"Found {len(raw_matches)} raw matches. Parsing...")
-
-    for url, name_html in raw_matches:
-        # Extract Logo
-        logo_url = ""
-        logo_match = re.search(LOGO_PATTERN, name_html, re.IGNORECASE)
-        if logo_match:
-            raw_logo = logo_match.group(1)
-            logo_url = urljoin(BASE_URL, raw_logo)
-
-        # Extract Category
-        category = "Ayna TV" # Default
-        cat_match = re.search(CATEGORY_PATTERN, name_html, re.IGNORECASE)
-        if cat_match:
-            category = cat_match.group(1).strip()
-
-        # Clean Name
-        name_match = re.search(r'<h6[^>]*class=["\']channel-name["\'][^>]*>(.*?)</h6>', name_html, re.IGNORECASE)
-        if name_match:
-            clean_name = name_match.group(1).strip()
-        else:
-            clean_name = re.sub(r'<[^>]+>', '', name_html).strip() # Fallback
-        
-        clean_name = re.sub(r'\s+', ' ', clean_name)
-        full_url = urljoin(BASE_URL, url)
-        
-        if full_url not in seen_urls:
-            channels_to_process.append((full_url, clean_name, logo_url, category))
-            seen_urls.add(full_url)
-    
-    log(f"Processing {len(channels_to_process)} unique channels with threading...")
-
-    if not channels_to_process:
-        log("DEBUG: No channels found. Response content start:")
-        log(response.text[:500])
-        return
-    
-    m3u_content = []
-    
-    # Calculate BD Time (UTC + 6)
-    utc_now = datetime.datetime.utcnow()
-    bd_time = utc_now + datetime.timedelta(hours=6)
-    formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-
-    m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {len(results)}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  """
-
-    m3u_content.append(m3u_header)
-    
-    
-    work_items = []
-    for url, name, logo, category in channels_to_process:
-        work_items.append((BASE_URL, url, name, logo, category))
-        
-    results = []
-    completed_count = 0
-    total = len(work_items)
-
-    # Using 5 threads as per plan to avoid blocking/captcha
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_channel = {executor.submit(process_channel, item): item for item in work_items}
-        
-        for future in as_completed(future_to_channel):
-            completed_count += 1
-            res = future.result()
-            if res:
-                log(f"[{completed_count}/{total}] Found: {res['name']}")
-                # Append immediately or collect? Collecting is safer for ordering if needed, but M3U order doesn't matter much.
-                # Let's collect.
-                results.append(res)
-            else:
-                log(f"[{completed_count}/{total}] Failed/No Stream")
-
-    # Generate M3U
-    for item in results:
-        logo_attr = f' tvg-logo="{item["logo"]}"' if item["logo"] else ""
-        group = item.get("group", "Ayna TV")
-        m3u_content.append(f'#EXTINF:-1 group-title="{group}"{logo_attr},{item["name"]}')
-        m3u_content.append(item["url"])
-
-    import os
-    output_dir = "playlist"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    output_file = os.path.join(output_dir, "ayna.m3u")
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(m3u_content))
-    
-    log(f"Saved playlist to {output_file} with {len(results)} channels.")
-
-if __name__ == "__main__":
-    main()
-
-=======
-import requests
-try:
-    from curl_cffi import requests as crequests
-except ImportError:
-    print("curl_cffi not found, falling back to requests (may fail)")
-    crequests = requests
-
 import re
-import time
 import sys
 import base64
 from urllib.parse import urljoin
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import socket
-import datetime
+import os
+
+import m3u
+import net
 
 
 BASE_URL = "https://n.shopnojaal.top/ayna/"
@@ -221,23 +16,75 @@ VIDEO_SRC_PATTERN = r'var\s+streamUrl\s*=\s*atob\("([^"]+)"\)'
 # Non-greedy match for src to avoid skipping to onerror
 LOGO_PATTERN = r'<img[^>]*?\bsrc=["\']([^"\']+)["\']'
 CATEGORY_PATTERN = r'<span[^>]*class=["\']channel-category["\'][^>]*>(.*?)</span>'
+NAME_PATTERN = r'<h6[^>]*class=["\']channel-name["\'][^>]*>(.*?)</h6>'
+
+# Compiled once; the three per-card fields are picked up by a single
+# alternation scan of the card instead of three separate searches
+LINK_RE = re.compile(LINK_PATTERN, re.IGNORECASE | re.DOTALL)
+FIELD_RE = re.compile(f"{LOGO_PATTERN}|{CATEGORY_PATTERN}|{NAME_PATTERN}", re.IGNORECASE)
+VIDEO_SRC_RE = re.compile(VIDEO_SRC_PATTERN)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+# Decoded stream URLs stay valid for a few hours; within that window a
+# channel is not re-resolved from its play.php page
+RESOLVE_TTL = 2 * 3600
 
 def log(msg):
     print(msg)
     sys.stdout.flush()
 
-def process_channel(args):
+def absolute_url(base_url, ref):
+    """urljoin, short-cut for plain relative paths like play.php?id=1 (nearly every link on the page)."""
+    if (base_url.endswith('/') and ref and ref[0] not in './?#'
+            and ':' not in ref.split('/', 1)[0] and '/.' not in ref):
+        return base_url + ref
+    return urljoin(base_url, ref)
+
+def iter_channels(html, base_url=BASE_URL):
+    """
+    Walks the listing page once and yields (url, name, logo, category) for
+    every play.php card, in page order.
+    """
+    for link in LINK_RE.finditer(html):
+        url, name_html = link.groups()
+        logo = category = name = None
+        for field in FIELD_RE.finditer(name_html):
+            src, cat, title = field.groups()
+            if src is not None:
+                if logo is None:
+                    logo = src
+            elif cat is not None:
+                if category is None:
+                    category = cat
+            elif name is None:
+                name = title
+
+        if name is None:
+            name = TAG_RE.sub('', name_html) # Fallback
+        yield (
+            absolute_url(base_url, url),
+            SPACE_RE.sub(' ', name.strip()),
+            absolute_url(base_url, logo) if logo else "",
+            category.strip() if category is not None else "Ayna TV",
+        )
+
+def process_channel(args, resolutions):
     """
     Worker function to process a single channel using curl_cffi.
     args is a tuple: (base_url, url, name, logo_url, category)
     """
     base_url, url, name, logo_url, category = args
     full_url = urljoin(base_url, url)
+
+    cached = resolutions.lookup(full_url)
+    if cached:
+        return m3u.Channel(name, cached.url, logo=logo_url, group=category or "Ayna TV")
     
     try:
-        # Use simple get with retry logic if possible or just timeout
-        # impersonate="chrome" handles the TLS fingerprint
-        play_resp = crequests.get(full_url, impersonate="chrome", timeout=15)
+        # Each worker thread reuses its own impersonating session, so the
+        # TLS handshake with the host is paid once per thread, not per page
+        play_resp = net.impersonated_session("chrome").get(full_url, timeout=15)
         
         if play_resp.status_code != 200:
             # log(f"[{name}] Failed: Status {play_resp.status_code}")
@@ -246,37 +93,28 @@ def process_channel(args):
         play_resp_text = play_resp.text
         
         # Extract video source
-        match = re.search(VIDEO_SRC_PATTERN, play_resp_text)
+        match = VIDEO_SRC_RE.search(play_resp_text)
         if match:
             b64_src = match.group(1)
             try:
                 # Decode Base64
                 video_src = base64.b64decode(b64_src).decode('utf-8')
-                return {
-                    "name": name,
-                    "logo": logo_url,
-                    "group": category,
-                    "url": video_src
-                }
+                resolutions.store(full_url, video_src, logo_url)
+                return m3u.Channel(name, video_src, logo=logo_url, group=category or "Ayna TV")
             except Exception as e:
                 log(f"[{name}] Failed to decode base64: {e}") 
     except Exception as e:
         log(f"Error processing {name}: {e}")
         pass
     
+    resolutions.fail(full_url)
     return None
 
 def main():
     log(f"Fetching channel list from {BASE_URL}...")
-    headers = {
-        'User-Agent': 'Mozilla/5.0',
-        'Accept': '*/*',
-        'Connection': 'keep-alive',
-    }
-    
     # Use curl_cffi for main page too
     try:
-        response = crequests.get(BASE_URL, impersonate="chrome", timeout=30)
+        response = net.impersonated_session("chrome").get(BASE_URL, timeout=30)
         if response.status_code != 200:
             log(f"Failed to fetch main page: Status {response.status_code}")
             return
@@ -286,37 +124,10 @@ def main():
         return
 
     # Find all channel links and names
-    raw_matches = re.findall(LINK_PATTERN, response_text, re.IGNORECASE | re.DOTALL)
-    
     channels_to_process = []
     seen_urls = set()
-    
-    log(f"Found {len(raw_matches)} raw matches. Parsing...")
-
-    for url, name_html in raw_matches:
-        # Extract Logo
-        logo_url = ""
-        logo_match = re.search(LOGO_PATTERN, name_html, re.IGNORECASE)
-        if logo_match:
-            raw_logo = logo_match.group(1)
-            logo_url = urljoin(BASE_URL, raw_logo)
 
-        # Extract Category
-        category = "Ayna TV" # Default
-        cat_match = re.search(CATEGORY_PATTERN, name_html, re.IGNORECASE)
-        if cat_match:
-            category = cat_match.group(1).strip()
-
-        # Clean Name
-        name_match = re.search(r'<h6[^>]*class=["\']channel-name["\'][^>]*>(.*?)</h6>', name_html, re.IGNORECASE)
-        if name_match:
-            clean_name = name_match.group(1).strip()
-        else:
-            clean_name = re.sub(r'<[^>]+>', '', name_html).strip() # Fallback
-        
-        clean_name = re.sub(r'\s+', ' ', clean_name)
-        full_url = urljoin(BASE_URL, url)
-        
+    for full_url, clean_name, logo_url, category in iter_channels(response_text):
         if full_url not in seen_urls:
             channels_to_process.append((full_url, clean_name, logo_url, category))
             seen_urls.add(full_url)
@@ -324,74 +135,37 @@ def main():
     log(f"Processing {len(channels_to_process)} unique channels with threading...")
 
     if not channels_to_process:
-        log("DEBUG: No channels found. Response content start:")
-        log(response.text[:500])
+        log(f"No channels found on {BASE_URL}, the page layout may have changed")
         return
     
-    m3u_content = []
-    
-    # Calculate BD Time (UTC + 6)
-    utc_now = datetime.datetime.utcnow()
-    bd_time = utc_now + datetime.timedelta(hours=6)
-    formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-
-    m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {len(results)}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  """
-
-    m3u_content.append(m3u_header)
-    
-    
     work_items = []
     for url, name, logo, category in channels_to_process:
         work_items.append((BASE_URL, url, name, logo, category))
         
-    results = []
     completed_count = 0
     total = len(work_items)
 
     # Using 5 threads as per plan to avoid blocking/captcha
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_channel = {executor.submit(process_channel, item): item for item in work_items}
+    with net.ResolutionCache("ayna", ttl=RESOLVE_TTL) as resolutions, ThreadPoolExecutor(max_workers=5) as executor:
+        resolutions.prune(seen_urls)
+        futures = [executor.submit(process_channel, item, resolutions) for item in work_items]
         
-        for future in as_completed(future_to_channel):
+        for future in as_completed(futures):
             completed_count += 1
             res = future.result()
             if res:
-                log(f"[{completed_count}/{total}] Found: {res['name']}")
-                # Append immediately or collect? Collecting is safer for ordering if needed, but M3U order doesn't matter much.
-                # Let's collect.
-                results.append(res)
+                log(f"[{completed_count}/{total}] Found: {res.name}")
             else:
                 log(f"[{completed_count}/{total}] Failed/No Stream")
 
-    # Generate M3U
-    for item in results:
-        logo_attr = f' tvg-logo="{item["logo"]}"' if item["logo"] else ""
-        group = item.get("group", "Ayna TV")
-        m3u_content.append(f'#EXTINF:-1 group-title="{group}"{logo_attr},{item["name"]}')
-        m3u_content.append(item["url"])
-
-    import os
-    output_dir = "playlist"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # Keep the listing order so an unchanged channel list writes an unchanged playlist
+    results = [future.result() for future in futures if future.result()]
 
-    output_file = os.path.join(output_dir, "ayna.m3u")
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(m3u_content))
+    # Generate M3U
+    output_file = os.path.join("playlist", "ayna.m3u")
+    m3u.write_playlist(output_file, results, header=m3u.omnix_banner)
     
     log(f"Saved playlist to {output_file} with {len(results)} channels.")
 
 if __name__ == "__main__":
     main()
-
->>>>>>> Stashed changes
@@ -0,0 +1,154 @@
+"""
+Parse-time microbenchmarks for the scrapers, run against saved pages in
+bench/fixtures/ so a slower extractor shows up without touching the sites.
+
+    python scripts/bench/listing.py                  # time every case
+    python scripts/bench/listing.py --record         # re-save the fixtures from the live sites
+    python scripts/bench/listing.py --save-baseline  # remember these timings on this machine
+    python scripts/bench/listing.py --check          # exit 1 if a case got >25% slower
+
+Cases without a saved fixture run on a synthetic page of the same shape
+(marked "synthetic" in the report), so the benchmark also works offline.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = os.path.dirname(BENCH_DIR)
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+# Timings only mean something on the machine that took them, so the
+# baseline lives in the untracked cache directory
+BASELINE_FILE = os.path.join(REPO_ROOT, ".cache", "bench-baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+# run(page) is timed and must return an iterable of results; synthesize()
+# builds a stand-in page and record() fetches the live one.
+Case = namedtuple("Case", ["name", "fixture", "run", "synthesize", "record"], defaults=[None])
+
+
+def load_script(script):
+    """Imports a generator script by file name, like run_all does."""
+    module_name = os.path.splitext(script)[0].replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPT_DIR, script))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return module
+
+
+def load_fixture(case):
+    """(page, synthetic) for a case: the saved fixture if there is one."""
+    path = os.path.join(FIXTURE_DIR, case.fixture)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read(), False
+    return case.synthesize(), True
+
+
+def record_fixture(case):
+    page = case.record()
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(os.path.join(FIXTURE_DIR, case.fixture), "w", encoding="utf-8") as f:
+        f.write(page)
+    print(f"recorded {case.fixture} ({len(page)} chars)")
+
+
+def measure(run, page, repeat=5, min_time=0.2):
+    """Best seconds per call over repeat rounds of at least min_time each, and the result count."""
+    results = len(list(run(page)))
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            for _ in run(page):
+                pass
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            for _ in run(page):
+                pass
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, results
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(suite, cases, argv=None):
+    """Command line for one benchmark suite; returns the exit status."""
+    parser = argparse.ArgumentParser(description=f"Parse-time benchmark: {suite}")
+    parser.add_argument("cases", nargs="*", help="only these cases (default: all)")
+    parser.add_argument("--record", action="store_true", help="re-save the fixtures from the live sites first")
+    parser.add_argument("--save-baseline", action="store_true", help="store these timings as the baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a case is slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown for --check (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    selected = [case for case in cases if not args.cases or case.name in args.cases]
+    baseline = load_baseline()
+    timings = {}
+    regressions = []
+
+    print(f"=== {suite} ===")
+    print(f"{'case':<28} {'results':>7} {'ms/page':>9} {'baseline':>9}  page")
+    for case in selected:
+        if args.record:
+            if case.record is None:
+                print(f"{case.name}: nothing to record")
+            else:
+                record_fixture(case)
+        page, synthetic = load_fixture(case)
+        try:
+            seconds, results = measure(case.run, page)
+        except ImportError as e:
+            # Same as run_all: a missing optional dependency only skips its case
+            print(f"{case.name:<28} skipped: {e}")
+            continue
+        key = f"{suite}/{case.name}"
+        timings[key] = seconds
+
+        previous = baseline.get(key)
+        note = f"{previous * 1000:9.3f}" if previous else f"{'-':>9}"
+        if previous and seconds > previous * (1 + args.tolerance):
+            regressions.append(case.name)
+            note += " SLOWER"
+        source = "synthetic" if synthetic else case.fixture
+        print(f"{case.name:<28} {results:>7} {seconds * 1000:>9.3f} {note}  {source}")
+
+    if args.save_baseline:
+        baseline.update(timings)
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {BASELINE_FILE}")
+
+    if args.check and regressions:
+        print(f"slower than baseline: {', '.join(regressions)}")
+        return 1
+    return 0
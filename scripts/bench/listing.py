@@ -0,0 +1,73 @@
+"""
+Listing-page extraction benchmark: ayna.iter_channels and Crichd.iter_channels.
+
+    python scripts/bench/listing.py [--record] [--save-baseline] [--check]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench
+import net
+
+CARDS = 400
+
+
+def synthetic_ayna():
+    cards = []
+    for i in range(CARDS):
+        cards.append(
+            f'<div class="col-6 col-md-3">\n'
+            f'  <a href="play.php?id={i}" class="channel-card text-decoration-none">\n'
+            f'    <div class="logo-wrap"><img src="logos/{i}.png" alt="" loading="lazy" '
+            f'onerror="this.src=\'img/default.png\'"></div>\n'
+            f'    <span class="channel-category">{("Sports", "News", "Movies", "Kids")[i % 4]}</span>\n'
+            f'    <h6 class="channel-name">  Channel   {i} HD </h6>\n'
+            f'  </a>\n'
+            f'</div>\n'
+        )
+    return "<html><body><div class=\"row\">\n" + "".join(cards) + "</div></body></html>"
+
+
+def synthetic_crichd():
+    cards = []
+    for i in range(CARDS):
+        cards.append(
+            f'<div class="col">\n'
+            f'  <a href="play.php?id={i:08x}" class="card h-100">\n'
+            f'    <div class="ratio ratio-16x9"><img src="https://img.example/{i}.png" class="card-img-top" alt=""></div>\n'
+            f'    <div class="card-body"><h6 class="card-title"> Sports {i} </h6></div>\n'
+            f'  </a>\n'
+            f'</div>\n'
+        )
+    return "<html><body><div class=\"row\">\n" + "".join(cards) + "</div></body></html>"
+
+
+def record_ayna():
+    ayna = bench.load_script("ayna.py")
+    return net.impersonated_session("chrome").get(ayna.BASE_URL, timeout=30).text
+
+
+def record_crichd():
+    crichd = bench.load_script("Crichd.py")
+    session = net.session("crichd", headers=crichd.HEADERS)
+    return session.get(crichd.TARGET_URL + "/index.php", timeout=15).text
+
+
+def run_ayna(page):
+    return bench.load_script("ayna.py").iter_channels(page)
+
+
+def run_crichd(page):
+    return bench.load_script("Crichd.py").iter_channels(page)
+
+
+CASES = [
+    bench.Case("ayna", "ayna_index.html", run_ayna, synthetic_ayna, record_ayna),
+    bench.Case("Crichd", "crichd_index.html", run_crichd, synthetic_crichd, record_crichd),
+]
+
+
+if __name__ == "__main__":
+    sys.exit(bench.main("listing", CASES))
@@ -0,0 +1,101 @@
+"""
+Channel-name matching benchmark: m3u.NameIndex on every #EXTINF title of
+playlist/*.m3u, against comparing each query with every name.
+
+    python scripts/bench/names.py [--record] [--save-baseline] [--check]
+
+--record snapshots the titles to fixtures/channel_names.txt so timings stay
+comparable while the playlists change; without a snapshot the cases read
+the playlists on disk (reported as "synthetic").
+"""
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench
+import m3u
+
+# Queries for the index-against-pairwise comparison; pairwise over the
+# whole corpus would take minutes
+SAMPLE = 100
+# Derived from the other playlists, so they would only repeat their names
+DERIVED = {"union.m3u", "mirrors.m3u"}
+
+_indexes = {}
+
+
+def playlist_names():
+    names = []
+    for path in sorted(glob.glob(os.path.join(bench.REPO_ROOT, "playlist", "*.m3u"))):
+        if os.path.basename(path) not in DERIVED:
+            names.extend(entry.title for entry in m3u.parse_file(path) if entry.extinf)
+    return "\n".join(names)
+
+
+def build_index(names):
+    index = m3u.NameIndex()
+    for name in names:
+        index.add(name)
+    return index
+
+
+def warm_index(page):
+    """(names, index) built once per corpus, like a merge that queries as it goes."""
+    if page not in _indexes:
+        names = page.split("\n")
+        _indexes[page] = names, build_index(names)
+    return _indexes[page]
+
+
+def sample(names):
+    return names[::max(1, len(names) // SAMPLE)][:SAMPLE]
+
+
+def run_build(page):
+    names, _ = warm_index(page)
+    index = build_index(names)
+    return range(len(index))
+
+
+def run_match(page):
+    names, index = warm_index(page)
+    return [index.match(name) for name in names]
+
+
+def run_match_sample(page):
+    names, index = warm_index(page)
+    return [index.match(name) for name in sample(names)]
+
+
+def run_pairwise_sample(page):
+    """What NameIndex avoids: every query scored against every normalized name."""
+    names, _ = warm_index(page)
+    keys = {m3u.normalize_name(name) for name in names} - {""}
+    grams = [(key, m3u.names.trigrams(key), m3u.names._numbers(key)) for key in keys]
+    results = []
+    for name in sample(names):
+        query = m3u.normalize_name(name)
+        query_grams, numbers = m3u.names.trigrams(query), m3u.names._numbers(query)
+        candidates = []
+        for key, other, other_numbers in grams:
+            common = len(query_grams & other)
+            score = common / (len(query_grams) + len(other) - common)
+            if score >= m3u.names.MIN_SCORE and other_numbers == numbers:
+                candidates.append(m3u.Candidate(key, score))
+        candidates.sort(key=lambda candidate: (-candidate.score, candidate.key))
+        results.append(candidates[:5])
+    return results
+
+
+CASES = [
+    bench.Case("NameIndex/build", "channel_names.txt", run_build, playlist_names, playlist_names),
+    bench.Case("NameIndex/match", "channel_names.txt", run_match, playlist_names),
+    bench.Case(f"NameIndex/match-{SAMPLE}", "channel_names.txt", run_match_sample, playlist_names),
+    bench.Case(f"pairwise/match-{SAMPLE}", "channel_names.txt", run_pairwise_sample, playlist_names),
+]
+
+
+if __name__ == "__main__":
+    sys.exit(bench.main("names", CASES))
@@ -0,0 +1,94 @@
+"""
+HTML parser backend benchmark: omni_v5on category pages on each dom
+backend, and the RoarZoneTv main page as a full tree vs streamed tags.
+
+    python scripts/bench/parsers.py [--record] [--save-baseline] [--check]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench
+import dom
+import net
+
+CARDS = 400
+CATEGORIES = ("Sports", "News", "Movies", "Kids", "Music")
+
+
+def synthetic_v5on():
+    nav = "".join(f'<a class="btn" href="?cat={name}">{name}</a>\n' for name in CATEGORIES)
+    cards = []
+    for i in range(CARDS):
+        cards.append(
+            f'<div class="col-4">\n'
+            f'  <div class="channel-card">\n'
+            f'    <a href="play.php?id={i}&amp;cat=all" class="stretched-link">\n'
+            f'      <img src="/logos/{i}.png" alt="Channel {i}" loading="lazy">\n'
+            f'      <h6 class="channel-name"> Channel {i} HD </h6>\n'
+            f'    </a>\n'
+            f'    <span class="badge">{CATEGORIES[i % len(CATEGORIES)]}</span>\n'
+            f'  </div>\n'
+            f'</div>\n'
+        )
+    return (
+        "<html><head><script>var cards = '<div class=\"card\">';</script></head><body>\n"
+        f"<nav>{nav}</nav><div class=\"row\">\n" + "".join(cards) + "</div></body></html>"
+    )
+
+
+def synthetic_roarzone():
+    cards = []
+    for i in range(CARDS):
+        cards.append(
+            f'<div class="channel-card col" data-stream="ch{i}" data-title="Channel {i}" '
+            f'data-tags="{CATEGORIES[i % len(CATEGORIES)]}">\n'
+            f'  <div class="thumb"><img src="logos/{i}.png" alt="Channel {i}"></div>\n'
+            f'  <div class="info"><span class="name">Channel {i}</span></div>\n'
+            f'</div>\n'
+        )
+    return "<html><body><div class=\"grid\">\n" + "".join(cards) + "</div></body></html>"
+
+
+def record_v5on():
+    v5on = bench.load_script("omni_v5on.py")
+    pages = [category["url"] for category in v5on.get_categories() if "?cat=" in category["url"]]
+    if not pages:
+        raise RuntimeError(f"no ?cat= category links on {v5on.BASE_URL}")
+    return v5on.session.get(pages[0], timeout=15).text
+
+
+def record_roarzone():
+    roarzone = bench.load_script("RoarZoneTv.py")
+    return net.session().get(roarzone.BASE_URL, timeout=30).text
+
+
+def v5on_case(backend):
+    def run(page):
+        v5on = bench.load_script("omni_v5on.py")
+        return v5on.extract_channels(dom.parse(page, backend), "All")
+    return bench.Case(f"v5on/{backend}", "v5on_category.html", run, synthetic_v5on, record_v5on)
+
+
+def roarzone_tree(page):
+    """What RoarZoneTv did before streaming: a full html.parser tree."""
+    cards = []
+    for card in dom.parse(page, "bs4").select("div.channel-card"):
+        img = card.select_one("img")
+        cards.append((card.get("data-stream"), img.get("src") if img else None))
+    return cards
+
+
+def roarzone_stream(page):
+    return bench.load_script("RoarZoneTv.py").iter_cards(page)
+
+
+CASES = [v5on_case(backend) for backend in dom.PREFERENCE] + [
+    bench.Case("roarzonetv/bs4-tree", "roarzonetv_index.html", roarzone_tree, synthetic_roarzone, record_roarzone),
+    bench.Case("roarzonetv/stream", "roarzonetv_index.html", roarzone_stream, synthetic_roarzone, record_roarzone),
+]
+
+
+if __name__ == "__main__":
+    sys.exit(bench.main("parsers", CASES))
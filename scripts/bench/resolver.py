@@ -0,0 +1,194 @@
+"""
+yt-dlp resolution benchmark: yt_omnix's thread and process resolver modes
+on the same videos, through warm pools as in a real run.
+
+    python scripts/bench/resolver.py [--record] [--save-baseline] [--check]
+
+--record resolves a few live videos for real and saves every response
+yt-dlp received to fixtures/yt_responses.json; the cases then replay them
+with no network. Without a recording, a stand-in extractor does a similar
+amount of CPU work (player JSON parsing and format sorting) per video.
+"""
+import atexit
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench
+
+VIDEOS = 40
+RECORD_CATEGORIES = ("News", "Sports")
+RECORD_PER_CATEGORY = 5
+FORMATS = 120
+
+_resolvers = {}
+_stack = contextlib.ExitStack()
+atexit.register(_stack.close)
+
+
+def request_key(req):
+    data = req.data if isinstance(req.data, bytes) else b""
+    return f"{req.method} {req.url} {hashlib.sha1(data).hexdigest()}"
+
+
+def yt_dlp_class():
+    import yt_dlp
+
+    return yt_dlp.YoutubeDL
+
+
+def no_disk_cache(options):
+    # The player JS has to be part of the recording, not read from ~/.cache
+    return dict(options, cachedir=False)
+
+
+class Recorder:
+    """YoutubeDL factory whose extractors save every response they receive."""
+
+    def __init__(self):
+        self.responses = {}
+
+    def __call__(self, options):
+        from yt_dlp.networking import Request, Response
+
+        responses = self.responses
+
+        class RecordingYoutubeDL(yt_dlp_class()):
+            def urlopen(self, req):
+                if isinstance(req, str):
+                    req = Request(req)
+                res = super().urlopen(req)
+                body = res.read()
+                responses[request_key(req)] = {
+                    "url": res.url,
+                    "status": res.status,
+                    "headers": dict(res.headers),
+                    "body": body.decode("latin-1"),
+                }
+                return Response(io.BytesIO(body), res.url, res.headers, res.status)
+
+        return RecordingYoutubeDL(no_disk_cache(options))
+
+
+class Replayer:
+    """YoutubeDL factory answering every request from a recording; picklable for worker processes."""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def __call__(self, options):
+        from yt_dlp.networking import Request, Response
+        from yt_dlp.networking.exceptions import HTTPError, TransportError
+
+        responses = self.responses
+
+        class ReplayYoutubeDL(yt_dlp_class()):
+            def urlopen(self, req):
+                if isinstance(req, str):
+                    req = Request(req)
+                saved = responses.get(request_key(req))
+                if saved is None:
+                    raise TransportError(f"not in the recording: {req.url}")
+                res = Response(io.BytesIO(saved["body"].encode("latin-1")), saved["url"],
+                               saved["headers"], saved["status"])
+                if res.status >= 400:
+                    raise HTTPError(res)
+                return res
+
+        return ReplayYoutubeDL(no_disk_cache(options))
+
+
+class SyntheticYoutubeDL:
+    """Stand-in extractor: parses and sorts a player response of realistic size."""
+
+    def __init__(self, options):
+        self.options = options
+
+    def extract_info(self, url, download=False):
+        video_id = url.rsplit("=", 1)[-1]
+        formats = ",".join(
+            f'{{"itag":{i},"url":"https://rr{i % 8}.googlevideo.com/videoplayback?expire=1999999999'
+            f'&id={video_id}&itag={i}&sig={"ab" * 60}","bitrate":{(i * 7919) % 5000000},'
+            f'"width":{256 * (1 + i % 8)},"height":{144 * (1 + i % 8)},"mimeType":"video/mp4; codecs=\\"avc1\\"",'
+            f'"qualityLabel":"{144 * (1 + i % 8)}p","fps":{(25, 30, 60)[i % 3]}}}'
+            for i in range(FORMATS)
+        )
+        player = json.loads(
+            f'{{"videoDetails":{{"videoId":"{video_id}","title":"Live {video_id}","author":"Channel",'
+            f'"isLive":true,"shortDescription":"{"x" * 2000}"}},'
+            f'"streamingData":{{"hlsManifestUrl":"https://manifest.googlevideo.com/{video_id}/index.m3u8",'
+            f'"adaptiveFormats":[{formats}]}}}}'
+        )
+        ranked = sorted(player["streamingData"]["adaptiveFormats"],
+                        key=lambda f: (f["height"], f["fps"], f["bitrate"]), reverse=True)
+        details = player["videoDetails"]
+        return {
+            "id": details["videoId"],
+            "title": details["title"],
+            "uploader": details["author"],
+            "is_live": details["isLive"],
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault_live.jpg",
+            "url": player["streamingData"]["hlsManifestUrl"],
+            "formats": ranked,
+        }
+
+    def close(self):
+        pass
+
+
+def synthetic_videos():
+    videos = [[f"https://www.youtube.com/watch?v=synthetic{i:02d}", "android"] for i in range(VIDEOS)]
+    return json.dumps({"videos": videos})
+
+
+def record_videos():
+    yt = bench.load_script("yt_omnix.py")
+    search = yt.ExtractorPool()
+    recorder = Recorder()
+    pool = yt.ExtractorPool(recorder)
+    videos = []
+    try:
+        for category in RECORD_CATEGORIES:
+            live = 0
+            for _, video_url in yt.search_videos(search, category, yt.CLIENTS[0]):
+                if yt.resolve_stream_info(pool, video_url, yt.CLIENTS[0]):
+                    videos.append([video_url, yt.CLIENTS[0]])
+                    live += 1
+                    if live == RECORD_PER_CATEGORY:
+                        break
+    finally:
+        search.close()
+        pool.close()
+    return json.dumps({"videos": videos, "responses": recorder.responses})
+
+
+def warm_resolver(mode, page):
+    """(executor, resolve, videos) kept open across measure() calls, like in a run."""
+    if mode not in _resolvers:
+        yt = bench.load_script("yt_omnix.py")
+        fixture = json.loads(page)
+        factory = Replayer(fixture["responses"]) if "responses" in fixture else SyntheticYoutubeDL
+        executor, resolve = _stack.enter_context(yt.resolver(mode, yt.RESOLVE_WORKERS, factory))
+        _resolvers[mode] = executor, resolve, fixture["videos"]
+    return _resolvers[mode]
+
+
+def resolver_case(mode, record=None):
+    def run(page):
+        executor, resolve, videos = warm_resolver(mode, page)
+        futures = [executor.submit(resolve, video_url, client) for video_url, client in videos]
+        return [info for info in (future.result() for future in futures) if info]
+    return bench.Case(f"yt_omnix/{mode}", "yt_responses.json", run, synthetic_videos, record)
+
+
+# Both modes replay the same recording, so only the first case records it
+CASES = [resolver_case("thread", record_videos), resolver_case("process")]
+
+
+if __name__ == "__main__":
+    sys.exit(bench.main("resolver", CASES))
@@ -1,9 +1,10 @@
 import requests
 import re
 import os
-import datetime
 import urllib.parse
 
+import m3u
+
 def fetch_and_generate_m3u():
     url = "https://crichd2h.xfireflixbd.workers.dev/"
     
@@ -106,32 +107,17 @@ def fetch_and_generate_m3u():
         
         channel_count = len(channels)
         
-        # Calculate BD Time (UTC + 6)
-        utc_now = datetime.datetime.utcnow()
-        bd_time = utc_now + datetime.timedelta(hours=6)
-        formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-
-        m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {channel_count}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  
-"""
-        
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(m3u_header)
+        with m3u.M3UWriter(output_file, header=m3u.omnix_banner) as writer:
             for channel in channels:
                 # Sanitize name for tvg-id if needed or just use name
-                line1 = f'#EXTINF:-1 tvg-id="{channel["name"]}" tvg-name="{channel["name"]}" tvg-logo="{channel["logo"]}" group-title="{channel["group"]}",{channel["name"]}'
-                line2 = channel["url"]
-                f.write(line1 + "\n")
-                f.write(line2 + "\n")
+                writer.write_entry(m3u.Channel(
+                    channel["name"],
+                    channel["url"],
+                    logo=channel["logo"],
+                    group=channel["group"],
+                    tvg_id=channel["name"],
+                    tvg_name=channel["name"],
+                ))
             
         print(f"Successfully created: {output_file}")
         print(f"Total Live TV channels extracted: {channel_count}")
@@ -0,0 +1,32 @@
+"""
+HTML parsing for the scrapers, behind one small API whichever parser is
+installed: selectolax (lexbor) or lxml when available, BeautifulSoup's
+html.parser otherwise.
+
+    import dom
+
+    page = dom.parse(html)
+    for card in page.select(".channel-card"):
+        link = card.select_one("a")
+        print(card.get("data-title"), link.get("href") if link else None)
+
+    # Selector-only streaming: start tags and attributes, no tree at all
+    for tag in dom.iter_tags(html, {"div", "img"}):
+        if dom.has_class(tag, "channel-card"):
+            print(tag.attrs.get("data-stream"))
+"""
+from .backends import BACKENDS, PREFERENCE, Node, available_backends, default_backend, parse
+from .stream import StartTag, has_class, iter_tags, parse_attrs
+
+__all__ = [
+    "BACKENDS",
+    "Node",
+    "PREFERENCE",
+    "StartTag",
+    "available_backends",
+    "default_backend",
+    "has_class",
+    "iter_tags",
+    "parse",
+    "parse_attrs",
+]
@@ -0,0 +1,157 @@
+import functools
+import os
+
+# HTML_BACKEND=bs4 (or lxml, selectolax) forces a backend; by default the
+# fastest installed one is used
+BACKEND_ENV = "HTML_BACKEND"
+PREFERENCE = ("selectolax", "lxml", "bs4")
+
+
+class Node:
+    """
+    The slice of an element the scrapers use, the same whichever parser
+    built the tree: tag, attributes, stripped text and CSS selection.
+    select() returns descendants (never the node itself) once each, in
+    document order, like BeautifulSoup does.
+    """
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.tag}>"
+
+    def select_one(self, selector):
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+
+class SelectolaxNode(Node):
+    __slots__ = ()
+
+    @property
+    def tag(self):
+        return self._node.tag
+
+    def get(self, name, default=None):
+        value = self._node.attributes.get(name)
+        return default if value is None else value
+
+    def text(self):
+        return self._node.text(strip=True)
+
+    def select(self, selector):
+        # lexbor includes the node itself, and reports a node once per
+        # selector in a group that matches it
+        seen = {self._node.mem_id}
+        matches = []
+        for node in self._node.css(selector):
+            if node.mem_id not in seen:
+                seen.add(node.mem_id)
+                matches.append(SelectolaxNode(node))
+        return matches
+
+
+@functools.lru_cache(maxsize=64)
+def _lxml_selector(selector):
+    from cssselect import HTMLTranslator
+    from lxml import etree
+
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix="descendant::"))
+
+
+class LxmlNode(Node):
+    __slots__ = ()
+
+    @property
+    def tag(self):
+        return self._node.tag
+
+    def get(self, name, default=None):
+        return self._node.get(name, default)
+
+    def text(self):
+        return "".join(part.strip() for part in self._node.itertext())
+
+    def select(self, selector):
+        return [LxmlNode(node) for node in _lxml_selector(selector)(self._node)]
+
+
+class SoupNode(Node):
+    __slots__ = ()
+
+    @property
+    def tag(self):
+        return self._node.name
+
+    def get(self, name, default=None):
+        value = self._node.get(name, default)
+        # bs4 splits multi-valued attributes (class, rel) into lists
+        return " ".join(value) if isinstance(value, list) else value
+
+    def text(self):
+        return self._node.get_text(strip=True)
+
+    def select(self, selector):
+        return [SoupNode(node) for node in self._node.select(selector)]
+
+    def select_one(self, selector):
+        node = self._node.select_one(selector)
+        return SoupNode(node) if node is not None else None
+
+
+def _parse_selectolax(html):
+    from selectolax.lexbor import LexborHTMLParser
+
+    return SelectolaxNode(LexborHTMLParser(html).root)
+
+
+def _parse_lxml(html):
+    import lxml.cssselect  # needs the cssselect package, fail here rather than in select()
+    import lxml.html
+
+    return LxmlNode(lxml.html.document_fromstring(html))
+
+
+def _parse_bs4(html):
+    from bs4 import BeautifulSoup
+
+    return SoupNode(BeautifulSoup(html, "html.parser"))
+
+
+BACKENDS = {
+    "selectolax": _parse_selectolax,
+    "lxml": _parse_lxml,
+    "bs4": _parse_bs4,
+}
+
+
+def available_backends():
+    """Installed backends, fastest first."""
+    found = []
+    for name in PREFERENCE:
+        try:
+            BACKENDS[name]("<p></p>")
+        except ImportError:
+            continue
+        found.append(name)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def default_backend():
+    forced = os.environ.get(BACKEND_ENV)
+    if forced:
+        if forced not in BACKENDS:
+            raise ValueError(f"{BACKEND_ENV}={forced!r}, expected one of {', '.join(BACKENDS)}")
+        return forced
+    found = available_backends()
+    if not found:
+        raise ImportError("no HTML parser installed (pip install selectolax, or lxml cssselect, or beautifulsoup4)")
+    return found[0]
+
+
+def parse(html, backend=None):
+    """Parses a page into a Node tree with the given or default backend."""
+    return BACKENDS[backend or default_backend()](html)
@@ -0,0 +1,71 @@
+import html
+import re
+from collections import namedtuple
+
+# A start tag as it appears in the page; start/end are offsets into it.
+# With iter_tags(end_tags=True) end tags come as StartTag("/div", {}, ...).
+StartTag = namedtuple("StartTag", ["name", "attrs", "start", "end"])
+
+# Comments are matched so tags inside them can be skipped; quoted attribute
+# values may contain '>'
+TAG_PATTERN = re.compile(
+    r"<!--.*?-->|<(/?)([a-zA-Z][a-zA-Z0-9:-]*)((?:\"[^\"]*\"|'[^']*'|[^'\">])*)>",
+    re.DOTALL,
+)
+ATTR_PATTERN = re.compile(r"""([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+RAW_TEXT = {"script": re.compile(r"</script\s*>", re.I), "style": re.compile(r"</style\s*>", re.I)}
+
+
+def parse_attrs(text):
+    """Attribute dict of a start tag's attribute text; the first of a repeated name wins."""
+    attrs = {}
+    for match in ATTR_PATTERN.finditer(text):
+        name = match.group(1).lower()
+        if name not in attrs:
+            value = match.group(2)
+            if value is None:
+                value = match.group(3)
+            if value is None:
+                value = match.group(4) or ""
+            attrs[name] = html.unescape(value) if "&" in value else value
+    return attrs
+
+
+def iter_tags(page, names=None, end_tags=False):
+    """
+    Streams the start tags of page in order, without building a tree, as
+    StartTag(name, attrs, start, end). With names, a set of lowercase tag
+    names, other tags are skipped before their attributes are parsed.
+    With end_tags, the end tags of those names are reported too, named
+    "/div" and so on, so a caller can tell where an element closes.
+    Comments and the contents of <script> and <style> are never reported.
+
+    Good enough for selecting cards by tag, class and data-* attributes;
+    anything needing text or nesting should use parse() instead.
+    """
+    pos = 0
+    search = TAG_PATTERN.search
+    while True:
+        match = search(page, pos)
+        if match is None:
+            return
+        pos = match.end()
+        name = match.group(2)
+        if name is None:
+            continue
+        name = name.lower()
+        if match.group(1):
+            if end_tags and (names is None or name in names):
+                yield StartTag("/" + name, {}, match.start(), match.end())
+            continue
+        raw = RAW_TEXT.get(name)
+        if raw is not None:
+            close = raw.search(page, pos)
+            pos = close.end() if close else len(page)
+        if names is None or name in names:
+            yield StartTag(name, parse_attrs(match.group(3)), match.start(), match.end())
+
+
+def has_class(tag, class_name):
+    """True if a StartTag's class attribute lists class_name."""
+    return class_name in tag.attrs.get("class", "").split()
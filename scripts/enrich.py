@@ -0,0 +1,141 @@
+"""
+Enrichment stage: fetches the HLS master playlist behind every entry of
+the generated playlists and writes its best quality into the #EXTINF,
+as resolution="1920x1080" bandwidth="5000000" codecs="...", so players
+(and the mirror ranking) can tell streams apart without opening them.
+
+    python scripts/enrich.py                          # PLAYLISTS
+    python scripts/enrich.py playlist/ayna.m3u        # any playlist
+
+Masters are cached by content hash in .cache/manifests.json: one that
+has not changed since it was last seen is fetched but never parsed again.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+
+import m3u
+import net
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAYLISTS = [
+    "playlist/ayna.m3u",
+    "playlist/RoarZoneTv.m3u",
+    "playlist/Crichd.m3u",
+    "playlist/sony_liv.m3u",
+]
+MANIFEST_CACHE = os.path.join(REPO_DIR, ".cache", "manifests.json")
+FETCH_BUDGET = net.HostBudget(4)
+FETCH_TIMEOUT = 10
+# Masters are a few KiB; anything longer is not one
+MAX_MANIFEST_BYTES = 256 * 1024
+
+
+class ManifestCache:
+    """Quality summary of every master playlist seen, by sha1 of its text."""
+
+    def __init__(self, path=MANIFEST_CACHE):
+        self.path = path
+        self.parsed = 0
+        self.reused = 0
+        self._used = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._summaries = json.load(f)
+        except (OSError, ValueError):
+            self._summaries = {}
+
+    def summary(self, text):
+        """EXTINF attributes for a master's best variant, {} for a media playlist."""
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        summary = self._summaries.get(digest)
+        if summary is None:
+            self.parsed += 1
+            summary = self._summaries[digest] = summarize(m3u.parse_master(text))
+        else:
+            self.reused += 1
+        self._used[digest] = summary
+        return summary
+
+    def save(self):
+        # Only masters seen this run, so the file does not grow forever
+        m3u.write_json(self.path, self._used, indent=None)
+
+
+def summarize(variants):
+    best = m3u.best_variant(variants)
+    if best is None:
+        return {}
+    summary = {"bandwidth": max(variant.bandwidth for variant in variants)}
+    if best.resolution:
+        summary["resolution"] = f"{best.resolution[0]}x{best.resolution[1]}"
+    if best.codecs:
+        summary["codecs"] = best.codecs
+    return summary
+
+
+def is_hls(url):
+    return url.startswith(("http://", "https://")) and ".m3u8" in url.lower()
+
+
+async def fetch_manifest(engine, url, headers):
+    try:
+        response = await engine.get(url, headers=headers, max_bytes=MAX_MANIFEST_BYTES)
+    except Exception:
+        return None
+    return response.text if response.ok and "#EXT-X-" in response.text else None
+
+
+async def enrich_playlist(path, engine, cache):
+    """Rewrites one playlist with quality attributes on the entries whose master could be read; returns how many."""
+    entries = list(m3u.parse_file(path))
+    targets = {}
+    for entry in entries:
+        url, headers = net.stream_request(entry)
+        if entry.extinf and is_hls(url):
+            targets.setdefault(url, headers)
+    texts = await asyncio.gather(*(fetch_manifest(engine, url, headers) for url, headers in targets.items()))
+    summaries = {url: cache.summary(text) for url, text in zip(targets, texts) if text}
+
+    enriched = 0
+    with m3u.M3UWriter(path, header=m3u.read_banner(path), ignore_attrs=()) as writer:
+        for entry in entries:
+            summary = summaries.get(net.stream_request(entry)[0])
+            if summary:
+                enriched += 1
+                entry = m3u.Entry(m3u.set_extinf_attrs(entry.extinf, summary), entry.url, entry.directives)
+            writer.write_entry(entry)
+    print(f"[enrich] {os.path.basename(path)}: {enriched}/{len(entries)} entries with quality, "
+          f"{len(summaries)}/{len(targets)} manifests read")
+    return enriched
+
+
+async def enrich_playlists(paths):
+    cache = ManifestCache()
+    async with net.FetchEngine(default=FETCH_BUDGET, timeout=FETCH_TIMEOUT, retries=1) as engine:
+        await asyncio.gather(*(enrich_playlist(path, engine, cache) for path in paths))
+    cache.save()
+    print(f"[enrich] manifests: {cache.parsed} parsed, {cache.reused} unchanged since last seen")
+
+
+def enrich_all(paths=None):
+    """run_all entry point: by default the PLAYLISTS that exist."""
+    if paths is None:
+        paths = [os.path.join(REPO_DIR, path) for path in PLAYLISTS]
+        paths = [path for path in paths if os.path.exists(path)]
+    asyncio.run(enrich_playlists(paths))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write HLS master playlist quality into playlist entries.")
+    parser.add_argument("playlists", nargs="*", help="playlist files (default: PLAYLISTS)")
+    args = parser.parse_args(argv)
+    enrich_all(args.playlists or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 import requests
 import os
-import datetime
 import sys
 
+import m3u
+
 # Configuration
 URL = "https://hotstarlive.delta-cloud.workers.dev/?token=240bb9-374e2e-3c13f0-4a7xz5"
 OUTPUT_FILE = "playlist/jiohotstar_liv.m3u"
@@ -59,33 +60,16 @@ def main():
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
 
     if content:
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            # Calculate BD Time (UTC + 6)
-            utc_now = datetime.datetime.utcnow()
-            bd_time = utc_now + datetime.timedelta(hours=6)
-            formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-            
-            lines = content.splitlines()
-            channel_count = sum(1 for line in lines if line.strip().startswith("#EXTINF"))
-            
-            # Remove existing #EXTM3U if present
-            if lines and lines[0].startswith("#EXTM3U"):
-                lines.pop(0)
+        lines = content.splitlines()
+        channel_count = sum(1 for line in lines if line.strip().startswith("#EXTINF"))
+
+        # Remove existing #EXTM3U if present
+        if lines and lines[0].startswith("#EXTM3U"):
+            lines.pop(0)
 
-            m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {channel_count}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  
-"""
-            f.write(m3u_header)
-            f.write("\n".join(lines))
+        with m3u.M3UWriter(OUTPUT_FILE, header=m3u.omnix_banner(channel_count)) as writer:
+            for line in lines:
+                writer.write_line(line)
         print(f"Saved playlist to {OUTPUT_FILE}")
     else:
         print("Failed to fetch content.")
@@ -1,15 +1,19 @@
 import os
-import requests
 import re
 import sys
 
+import m3u
+import net
+
 def get_playlist_urls():
+    """Returns (urls, changed); changed is False when the list was a 304."""
     url = "https://raw.githubusercontent.com/omnixmain/OMNIX-PLAYLIST-ZONE/refs/heads/main/playlists_list.md"
     urls = []
+    changed = True
     print(f"Fetching playlist list from: {url}", flush=True)
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        response = net.cached_get(url, session=net.session("kodi-tv", pool_size=10), timeout=10)
+        changed = not response.not_modified
         lines = response.text.splitlines()
         for line in lines:
             # Look for lines like | Name | URL |
@@ -18,55 +22,37 @@ def get_playlist_urls():
                 urls.append(match.group(1))
     except Exception as e:
         print(f"Error fetching playlist list: {e}", flush=True)
-    return urls
+    return urls, changed
 
 def fetch_and_parse_m3u(url):
+    """Returns (entries, changed); changed is False when the playlist was a 304."""
     entries = []
+    changed = True
     print(f"Fetching: {url}", flush=True)
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        lines = response.text.splitlines()
-        
-        current_extinf = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith('#EXTINF:'):
-                current_extinf = line
-            elif not line.startswith('#'):
-                # It's a URL
-                if current_extinf:
-                    entries.append((current_extinf, line))
-                    current_extinf = None
-                else:
-                    entries.append((f'#EXTINF:-1,Channel', line))
-
+        response = net.cached_get(url, session=net.session("kodi-tv", pool_size=10), timeout=10)
+        changed = not response.not_modified
+        for entry in m3u.parse(response.iter_content()):
+            if entry.extinf is None:
+                entry.extinf = '#EXTINF:-1,Channel'
+            entries.append(entry)
     except Exception as e:
         print(f"Error fetching {url}: {e}", flush=True)
     
-    return entries
+    return entries, changed
 
 def save_m3u(entries, output_file):
-    seen_urls = set()
-    unique_entries = []
-    
-    for extinf, url in entries:
-        if url not in seen_urls:
-            unique_entries.append((extinf, url))
-            seen_urls.add(url)
-            
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    
+    # The same stream is often listed by several playlists with its own token
+    seen = set()
+
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('#EXTM3U\n')
-            for extinf, url in unique_entries:
-                f.write(f'{extinf}\n{url}\n')
-        print(f"Saved {len(unique_entries)} channels to {output_file}", flush=True)
+        with m3u.M3UWriter(output_file) as writer:
+            for entry in entries:
+                key = m3u.fingerprint(entry.url)
+                if key not in seen:
+                    writer.write_entry(entry)
+                    seen.add(key)
+        print(f"Saved {writer.count} channels to {output_file}", flush=True)
     except Exception as e:
         print(f"Error writing to {output_file}: {e}", flush=True)
 
@@ -77,7 +63,7 @@ def main():
     
     output_file = os.path.join(repo_root, 'playlist', 'kodi-tv.m3u')
     
-    urls = get_playlist_urls()
+    urls, changed = get_playlist_urls()
     print(f"Found {len(urls)} playlists.", flush=True)
     
     all_channels = []
@@ -94,14 +80,18 @@ def main():
         for i, future in enumerate(concurrent.futures.as_completed(future_to_url)):
             url = future_to_url[future]
             try:
-                channels = future.result()
+                channels, playlist_changed = future.result()
+                changed = changed or playlist_changed
                 all_channels.extend(channels)
                 print(f"Completed {i+1}/{len(urls)}: {url} ({len(channels)} channels)", flush=True)
             except Exception as e:
                 print(f"Excpetion fetching {url}: {e}", flush=True)
         
     print(f"Total channels found (before dedupe): {len(all_channels)}", flush=True)
-    save_m3u(all_channels, output_file)
+    if not changed and os.path.exists(output_file):
+        print("No playlist changed since the last run, keeping existing output.", flush=True)
+    else:
+        save_m3u(all_channels, output_file)
     print("Script finished.", flush=True)
 
 if __name__ == "__main__":
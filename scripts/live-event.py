@@ -1,8 +1,10 @@
-import requests
 import json
 import datetime
 import os
 
+import m3u
+import net
+
 # Source URLs
 FANCODE_URL_1 = "https://raw.githubusercontent.com/Jitendra-unatti/fancode/refs/heads/main/data/fancode.json"
 FANCODE_URL_2 = "https://raw.githubusercontent.com/drmlive/fancode-live-events/main/fancode.json"
@@ -13,15 +15,38 @@ SONYLIV_URL = "https://raw.githubusercontent.com/drmlive/sliv-live-events/main/s
 JSON_OUTPUT = "playlist/live-event.json"
 M3U_OUTPUT = "playlist/live-event.m3u"
 
+# JIOHOTSTAR-EVENT.json is published from this repo, so the checked-out copy
+# is read directly and JIOHOTSTAR_URL is only a fallback
+JIOHOTSTAR_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "playlist", "JIOHOTSTAR-EVENT.json")
+
+# Labels of the feeds that changed since the last run
+changed_feeds = []
+
 def fetch_data(url, label):
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
+        # Conditional GET, unchanged feeds are served from .cache/http
+        response = net.cached_get(url, timeout=15)
+        if not response.not_modified:
+            changed_feeds.append(label)
         return response.json()
     except Exception as e:
         print(f"Error fetching {label}: {e}")
+        changed_feeds.append(label)
         return None
 
+def load_local_data(path, url, label):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Always in the checkout, so only a new version counts as a change
+            if net.default_cache().file_changed(path):
+                changed_feeds.append(label)
+            return data
+        except Exception as e:
+            print(f"Error reading local {label} ({path}): {e}, fetching instead")
+    return fetch_data(url, label)
+
 def normalize_fancode_1(item):
     """Maps Fancode Source 1 item to standardized schema favoring passthrough"""
     try:
@@ -195,7 +220,6 @@ def merge_event(fancode_map, new_item):
         fancode_map[lookup_key] = new_item
 
 def generate_m3u(matches):
-    content = "#EXTM3U\n"
     for match in matches:
         title = match.get("title", "No Title")
         image = match.get("image", "")
@@ -207,18 +231,13 @@ def generate_m3u(matches):
         
         if primary_url:
             suffix = " [Main]" if dai_url else ""
-            display_title = f"{title}{suffix}"
-            content += f'#EXTINF:-1 tvg-logo="{image}" group-title="{source}",{display_title}\n'
-            content += f'{primary_url}\n'
+            yield m3u.Channel(f"{title}{suffix}", primary_url, logo=image, group=source)
             
         if dai_url:
-            display_title = f"{title} [DAI]"
-            content += f'#EXTINF:-1 tvg-logo="{image}" group-title="{source}",{display_title}\n'
-            content += f'{dai_url}\n'
-            
-    return content
+            yield m3u.Channel(f"{title} [DAI]", dai_url, logo=image, group=source)
 
 def main():
+    changed_feeds.clear()
     fancode_map = {} # str(match_id) -> event_dict
     other_matches = []
 
@@ -264,7 +283,7 @@ def main():
                 other_matches.append(norm)
 
     # 4. JioHotstar
-    jh_data = fetch_data(JIOHOTSTAR_URL, "JioHotstar")
+    jh_data = load_local_data(JIOHOTSTAR_FILE, JIOHOTSTAR_URL, "JioHotstar")
     if jh_data:
         jh_matches = []
         if isinstance(jh_data, dict) and "data" in jh_data:
@@ -276,6 +295,10 @@ def main():
             if norm:
                 other_matches.append(norm)
 
+    if not changed_feeds and os.path.exists(JSON_OUTPUT) and os.path.exists(M3U_OUTPUT):
+        print("No feed changed since the last run, keeping existing outputs.")
+        return
+
     final_matches = list(fancode_map.values()) + other_matches
     
     # Calculate counts
@@ -297,16 +320,14 @@ def main():
         "matches": final_matches
     }
 
-    # Write JSON
-    os.makedirs(os.path.dirname(JSON_OUTPUT), exist_ok=True)
-    with open(JSON_OUTPUT, "w", encoding="utf-8") as f:
-        json.dump(final_json, f, indent=2)
-    print(f"Generated {JSON_OUTPUT}")
+    # Write JSON; a new "last_updated" on its own does not rewrite the file
+    if m3u.write_json(JSON_OUTPUT, final_json, volatile=("last_updated",), indent=2, ensure_ascii=True):
+        print(f"Generated {JSON_OUTPUT}")
+    else:
+        print(f"{JSON_OUTPUT} unchanged")
 
     # Write M3U
-    m3u_content = generate_m3u(final_matches)
-    with open(M3U_OUTPUT, "w", encoding="utf-8") as f:
-        f.write(m3u_content)
+    m3u.write_playlist(M3U_OUTPUT, generate_m3u(final_matches))
     print(f"Generated {M3U_OUTPUT}")
 
 if __name__ == "__main__":
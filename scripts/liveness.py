@@ -0,0 +1,87 @@
+"""
+Liveness stage: probes every stream URL of the generated playlists and
+marks the ones that do not answer with status="offline" (or drops them
+with PROBE_DROP=1 / --drop).
+
+    python scripts/liveness.py                                   # PLAYLISTS
+    python scripts/liveness.py playlist/dreamtv.m3u --drop       # any playlist
+
+Streams that answered in the last half hour (net.probe.PROBE_TTL) are
+not probed again, so a run mostly re-checks the dead and the new ones.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import m3u
+import net
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAYLISTS = [
+    "playlist/dreamtv.m3u",
+    "playlist/omnix_bdix.m3u",
+    "playlist/kodi-tv.m3u",
+]
+DROP_ENV = "PROBE_DROP"
+OFFLINE = "offline"
+# Past this share of dead streams the runner's network is the likelier
+# culprit (BDIX servers only answer from Bangladesh), so nothing is touched
+MAX_DEAD_RATIO = 0.8
+
+
+def marked(entry, alive):
+    """The entry with its offline mark set or cleared."""
+    if not entry.extinf or alive == (entry.attrs.get("status") != OFFLINE):
+        return entry
+    extinf = m3u.set_extinf_attrs(entry.extinf, {"status": None if alive else OFFLINE})
+    return m3u.Entry(extinf, entry.url, entry.directives)
+
+
+async def check_playlist(path, cache, drop=False):
+    """Probes one playlist and rewrites it with dead entries marked or dropped; returns (entries, dead)."""
+    entries = list(m3u.parse_file(path))
+    probes = await net.probe_urls(map(net.stream_request, entries), cache)
+    dead = sum(1 for probe in probes if probe.alive is False)
+    name = os.path.basename(path)
+    if entries and dead > MAX_DEAD_RATIO * len(entries):
+        print(f"[liveness] {name}: {dead}/{len(entries)} dead, assuming a network problem and leaving it as is")
+        return len(entries), dead
+
+    with m3u.M3UWriter(path, header=m3u.read_banner(path), ignore_attrs=()) as writer:
+        for entry, probe in zip(entries, probes):
+            if probe.alive is False and drop:
+                continue
+            writer.write_entry(marked(entry, probe.alive is not False))
+    cached = sum(1 for probe in probes if probe.cached)
+    print(f"[liveness] {name}: {dead}/{len(entries)} dead ({'dropped' if drop else 'marked'}), {cached} known alive")
+    return len(entries), dead
+
+
+async def check_playlists(paths, drop=False):
+    with net.ProbeCache() as cache:
+        cache.prune()
+        return await asyncio.gather(*(check_playlist(path, cache, drop) for path in paths))
+
+
+def probe_playlists(paths=None, drop=None):
+    """run_all entry point: by default the PLAYLISTS that exist, dropping dead entries only with PROBE_DROP=1."""
+    if paths is None:
+        paths = [os.path.join(REPO_DIR, path) for path in PLAYLISTS]
+        paths = [path for path in paths if os.path.exists(path)]
+    if drop is None:
+        drop = os.environ.get(DROP_ENV) == "1"
+    asyncio.run(check_playlists(paths, drop))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mark or drop playlist entries whose streams do not answer.")
+    parser.add_argument("playlists", nargs="*", help="playlist files (default: PLAYLISTS)")
+    parser.add_argument("--drop", action="store_true", help="drop dead entries instead of marking them")
+    args = parser.parse_args(argv)
+    probe_playlists(args.playlists or None, args.drop or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Shared streaming M3U parsing and writing for the playlist generators.
+
+    import m3u
+
+    with m3u.M3UWriter(output_file) as writer:
+        for entry in m3u.fetch(url):
+            writer.write_entry(entry)
+"""
+from .channel import Channel, load_json_array, write_json_array
+from .dedupe import DedupeIndex, SourceStats, canonical_url, fingerprint
+from .hls import Variant, best_variant, parse_attr_list, parse_master, parse_media
+from .names import Candidate, NameIndex, normalize_name
+from .output import file_digest, json_digest, playlist_digest, read_banner, replace_if_changed, write_json
+from .parser import (
+    Entry,
+    fetch,
+    iter_lines,
+    parse,
+    parse_file,
+    parse_lines,
+    parse_local,
+    set_extinf_attrs,
+    split_extinf,
+)
+from .writer import M3UWriter, bd_time, omnix_banner, write_playlist
+
+__all__ = [
+    "Candidate",
+    "Channel",
+    "DedupeIndex",
+    "Entry",
+    "M3UWriter",
+    "NameIndex",
+    "SourceStats",
+    "Variant",
+    "bd_time",
+    "best_variant",
+    "canonical_url",
+    "fetch",
+    "file_digest",
+    "fingerprint",
+    "iter_lines",
+    "json_digest",
+    "load_json_array",
+    "normalize_name",
+    "omnix_banner",
+    "parse",
+    "parse_attr_list",
+    "parse_file",
+    "parse_lines",
+    "parse_local",
+    "parse_master",
+    "parse_media",
+    "playlist_digest",
+    "read_banner",
+    "replace_if_changed",
+    "set_extinf_attrs",
+    "split_extinf",
+    "write_json",
+    "write_json_array",
+    "write_playlist",
+]
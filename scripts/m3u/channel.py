@@ -0,0 +1,108 @@
+import json
+import sys
+
+# Attribute order used for every #EXTINF we generate
+EXTINF_ATTRS = (
+    ("tvg_id", "tvg-id"),
+    ("tvg_name", "tvg-name"),
+    ("logo", "tvg-logo"),
+    ("group", "group-title"),
+)
+
+
+def _intern(value):
+    return sys.intern(value) if value else ""
+
+
+class Channel:
+    """
+    Compact channel record shared by the generators.
+
+    group and logo repeat across hundreds of entries (one category, one CDN
+    path per provider), so they are interned and every record with the same
+    value points at the same string. options are the extra per-entry lines
+    (#EXTVLCOPT, #KODIPROP, #EXTHTTP) written between #EXTINF and the URL.
+    """
+    __slots__ = ("name", "url", "logo", "group", "tvg_id", "tvg_name", "options")
+
+    def __init__(self, name, url, logo="", group="", tvg_id="", tvg_name="", options=()):
+        self.name = name
+        self.url = url
+        self.logo = _intern(logo)
+        self.group = _intern(group)
+        self.tvg_id = tvg_id
+        self.tvg_name = tvg_name
+        self.options = tuple(options)
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Builds a Channel from a parsed m3u.Entry."""
+        attrs = entry.attrs
+        return cls(
+            entry.title,
+            entry.url,
+            logo=attrs.get("tvg-logo", ""),
+            group=attrs.get("group-title", ""),
+            tvg_id=attrs.get("tvg-id", ""),
+            tvg_name=attrs.get("tvg-name", ""),
+            options=entry.directives,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("name", ""),
+            data.get("url", ""),
+            logo=data.get("logo", ""),
+            group=data.get("group", ""),
+            tvg_id=data.get("tvg_id", ""),
+            tvg_name=data.get("tvg_name", ""),
+            options=data.get("options", ()),
+        )
+
+    def to_dict(self):
+        data = {"name": self.name, "logo": self.logo, "group": self.group, "url": self.url}
+        if self.tvg_id:
+            data["tvg_id"] = self.tvg_id
+        if self.tvg_name:
+            data["tvg_name"] = self.tvg_name
+        if self.options:
+            data["options"] = list(self.options)
+        return data
+
+    def extinf(self):
+        attrs = "".join(
+            f' {key}="{getattr(self, slot)}"' for slot, key in EXTINF_ATTRS if getattr(self, slot)
+        )
+        return f"#EXTINF:-1{attrs},{self.name}"
+
+    def lines(self):
+        yield self.extinf()
+        yield from self.options
+        yield self.url
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {self.url!r})"
+
+
+def write_json_array(fp, items, indent=4, ensure_ascii=False):
+    """
+    Streams items (Channels or anything with to_dict()) into fp as a JSON
+    array, one element at a time. The output matches json.dump(list, indent)
+    but only a single element's dict ever exists at once.
+    """
+    pad = " " * indent
+    fp.write("[")
+    count = 0
+    for item in items:
+        text = json.dumps(item.to_dict(), indent=indent, ensure_ascii=ensure_ascii)
+        fp.write(",\n" if count else "\n")
+        fp.write(pad + text.replace("\n", "\n" + pad))
+        count += 1
+    fp.write("\n]" if count else "]")
+    return count
+
+
+def load_json_array(fp, cls=Channel):
+    """Reads a JSON array written by write_json_array back into records."""
+    return [cls.from_dict(data) for data in json.load(fp)]
@@ -0,0 +1,102 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that change from one fetch to the next (CDN tokens,
+# expiry stamps, signatures) without changing which stream a URL points at
+VOLATILE_PARAMS = {
+    "__hdnea__", "__hdntl__", "hdnea", "hdntl", "hdnts",
+    "api_key", "apikey", "token", "play_token", "auth", "wmsauthsign",
+    "expire", "expires", "exp", "md5", "sig", "signature", "clienttime",
+}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+FINGERPRINT_BYTES = 8
+
+
+def canonical_url(url):
+    """
+    The stream a URL points at, in one spelling: no "|Header=..." suffix,
+    no fragment or volatile parameters, lowercase host without "www." or
+    a default port, and the remaining parameters sorted.
+    """
+    url = url.partition("|")[0].strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in VOLATILE_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def fingerprint(url):
+    """Short hash of canonical_url(url); what DedupeIndex keeps in memory."""
+    return hashlib.blake2b(canonical_url(url).encode("utf-8"), digest_size=FINGERPRINT_BYTES).digest()
+
+
+class SourceStats:
+    """What one source added to a DedupeIndex."""
+    __slots__ = ("name", "entries", "repeated", "elsewhere", "overlap")
+
+    def __init__(self, name):
+        self.name = name
+        self.entries = 0
+        # Listed earlier in the same source
+        self.repeated = 0
+        # First listed by an earlier source; overlap counts them by that source
+        self.elsewhere = 0
+        self.overlap = {}
+
+    @property
+    def duplicates(self):
+        return self.repeated + self.elsewhere
+
+    @property
+    def ratio(self):
+        return self.duplicates / self.entries if self.entries else 0.0
+
+
+class DedupeIndex:
+    """
+    Fingerprints of every stream URL seen, across sources, in one pass:
+
+        index = m3u.DedupeIndex()
+        for entry in m3u.parse_file(path):
+            if index.add("ayna", entry.url):
+                writer.write_entry(entry)
+
+    add() is True the first time a stream is seen; the per-source counts
+    of the rest are in index.sources.
+    """
+
+    def __init__(self):
+        self.sources = {}
+        self._first = {}
+
+    def add(self, source, url):
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = self.sources[source] = SourceStats(source)
+        stats.entries += 1
+        key = fingerprint(url)
+        first = self._first.get(key)
+        if first is None:
+            self._first[key] = source
+            return True
+        if first == source:
+            stats.repeated += 1
+        else:
+            stats.elsewhere += 1
+            stats.overlap[first] = stats.overlap.get(first, 0) + 1
+        return False
+
+    def __len__(self):
+        return len(self._first)
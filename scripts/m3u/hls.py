@@ -0,0 +1,51 @@
+import re
+from collections import namedtuple
+
+# One #EXT-X-STREAM-INF of a master playlist. resolution is (width, height)
+# or None when the tag does not say; uri is as written, possibly relative.
+Variant = namedtuple("Variant", ["bandwidth", "resolution", "codecs", "uri"])
+
+STREAM_INF = "#EXT-X-STREAM-INF:"
+# NAME=value pairs of an HLS attribute list; quoted values may hold commas
+ATTR_LIST_PATTERN = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+RESOLUTION_PATTERN = re.compile(r"^(\d+)[xX](\d+)$")
+
+
+def parse_attr_list(text):
+    """The attributes of an HLS tag as a dict, quotes removed."""
+    return {name: value.strip('"') for name, value in ATTR_LIST_PATTERN.findall(text)}
+
+
+def parse_master(text):
+    """
+    The variants of a master playlist, in the order listed. A media
+    playlist (segments, no #EXT-X-STREAM-INF) has none.
+    """
+    variants = []
+    pending = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith(STREAM_INF):
+            pending = parse_attr_list(line[len(STREAM_INF):])
+        elif pending is not None and line and not line.startswith("#"):
+            try:
+                bandwidth = int(pending.get("BANDWIDTH") or pending.get("AVERAGE-BANDWIDTH") or 0)
+            except ValueError:
+                bandwidth = 0
+            match = RESOLUTION_PATTERN.match(pending.get("RESOLUTION", ""))
+            resolution = (int(match.group(1)), int(match.group(2))) if match else None
+            variants.append(Variant(bandwidth, resolution, pending.get("CODECS", ""), line))
+            pending = None
+    return variants
+
+
+def parse_media(text):
+    """The segment URIs of a media playlist, oldest first, as written."""
+    return [line for line in (line.strip() for line in text.splitlines()) if line and not line.startswith("#")]
+
+
+def best_variant(variants):
+    """The variant with the most pixels, the highest bandwidth breaking ties; None if there are none."""
+    if not variants:
+        return None
+    return max(variants, key=lambda v: (v.resolution[0] * v.resolution[1] if v.resolution else 0, v.bandwidth))
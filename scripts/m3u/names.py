@@ -0,0 +1,135 @@
+import html
+import math
+import re
+import unicodedata
+from collections import namedtuple
+
+# Words that say how a channel is delivered, not which channel it is
+QUALITY_TOKENS = {
+    "hd", "fhd", "uhd", "sd", "hq", "lq", "4k", "8k", "hdr", "hevc",
+    "h264", "h265", "x264", "x265", "fps", "50fps", "60fps", "backup", "raw",
+}
+RESOLUTION_PATTERN = re.compile(r"^\d{3,4}[pi]$")
+# Country and language tags ("|AR|", "(BD)", "UK:") when they open or close a name
+COUNTRY_TAGS = {
+    "ae", "ar", "au", "bd", "br", "ca", "de", "es", "fr", "gb", "in", "ind", "it",
+    "ksa", "ma", "my", "nl", "pk", "pl", "pt", "qa", "ru", "sa", "tr", "uae", "uk", "us", "usa",
+}
+FILLER_TOKENS = {"tv", "channel", "live"}
+# Some providers append the group after a star: "BEIN SPORTS 1|AR| ✪ BEIN SPORT HD"
+GROUP_SEPARATOR = "✪"
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# "sports1" and "hd2" are "sports 1" and "hd 2"
+DIGIT_BOUNDARY = re.compile(r"(?<=[a-z])(?=[0-9])|(?<=[0-9])(?=[a-z])")
+
+# A match() result: the normalized name added to the index and its similarity
+Candidate = namedtuple("Candidate", ["key", "score"])
+MIN_SCORE = 0.6
+
+
+def _meaningful(word):
+    return word not in QUALITY_TOKENS and not RESOLUTION_PATTERN.match(word)
+
+
+def normalize_name(name):
+    """
+    A channel name reduced to what identifies the channel: lowercase ASCII
+    words with the punctuation, quality tokens and country tags dropped.
+    "STAR SPORTS 1 ᴴᴰ (BD)", "Star Sports1" and "Star Sports-1 HD" all
+    become "star sports 1".
+    """
+    name = html.unescape(name).partition(GROUP_SEPARATOR)[0]
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    words = [word for word in WORD_PATTERN.findall(text.replace("&", " and ")) if _meaningful(word)]
+    words = [part for word in words for part in DIGIT_BOUNDARY.split(word) if _meaningful(part)]
+    while len(words) > 1 and words[-1] in COUNTRY_TAGS:
+        words.pop()
+    while len(words) > 1 and words[0] in COUNTRY_TAGS:
+        words.pop(0)
+    kept = [word for word in words if word not in FILLER_TOKENS]
+    return " ".join(kept or words)
+
+
+def trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _numbers(key):
+    return tuple(word for word in key.split() if word.isdigit())
+
+
+class NameIndex:
+    """
+    Channel names by trigram, for matching the same channel across sources
+    without comparing every pair:
+
+        index = m3u.NameIndex()
+        for title in titles:
+            index.add(title)
+        index.match("Star Sports1 HD")  # [Candidate("star sports 1", 1.0), ...]
+
+    A name can only reach min_score if it shares one of the query's rarest
+    trigrams (prefix filtering), so a query only looks at the short posting
+    lists of those and never at the thousands of names containing " st".
+    Names whose numbers differ ("star sports 1" and "star sports 2") never
+    match.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._ids = {}
+        self._grams = []
+        self._postings = {}
+        # Ids by the numbers in their key: a query with numbers can only match these
+        self._by_numbers = {}
+
+    def add(self, name):
+        """Indexes name; returns its normalized key ("" for names with no words, which are not indexed)."""
+        key = normalize_name(name)
+        if key and key not in self._ids:
+            key_id = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            grams = frozenset(trigrams(key))
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(key_id)
+            self._by_numbers.setdefault(_numbers(key), []).append(key_id)
+        return key
+
+    def match(self, name, limit=5, min_score=MIN_SCORE):
+        """The indexed names most similar to name (Jaccard over trigrams), best first."""
+        key = normalize_name(name)
+        if not key:
+            return []
+        grams = trigrams(key)
+        # Jaccard >= min_score needs at least this many trigrams in common,
+        # so one of the rarest len(grams) - needed + 1 must be among them
+        needed = max(1, math.ceil(min_score * len(grams)))
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        postings = [self._postings.get(gram, ()) for gram in rarest[:len(grams) - needed + 1]]
+        numbers = _numbers(key)
+        same_numbers = self._by_numbers.get(numbers, ())
+        if len(same_numbers) < sum(map(len, postings)):
+            # "iron man 2008": fewer names have 2008 in them than " ir" and "ron"
+            seen = same_numbers
+        else:
+            seen = set().union(*postings)
+
+        candidates = []
+        for key_id in seen:
+            other = self._grams[key_id]
+            if not min_score * len(grams) <= len(other) <= len(grams) / min_score:
+                continue
+            common = len(grams & other)
+            score = common / (len(grams) + len(other) - common)
+            if score >= min_score and _numbers(self._keys[key_id]) == numbers:
+                candidates.append(Candidate(self._keys[key_id], score))
+        candidates.sort(key=lambda candidate: (-candidate.score, candidate.key))
+        return candidates[:limit]
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._ids
+
+    def __len__(self):
+        return len(self._keys)
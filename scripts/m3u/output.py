@@ -0,0 +1,114 @@
+import functools
+import hashlib
+import json
+import os
+import re
+
+from .parser import CHUNK_SIZE, DIRECTIVE_PREFIXES
+
+_DIRECTIVE_PREFIXES = tuple(prefix.encode() for prefix in DIRECTIVE_PREFIXES)
+
+# #EXTINF attributes the liveness and enrich stages add to generator outputs
+# in place. A generator comparing its fresh entries with the file on disk
+# leaves them out, or it would replace every file the stages touched.
+STAGE_ATTRS = ("status", "resolution", "bandwidth", "codecs")
+
+
+@functools.lru_cache(maxsize=8)
+def _attrs_pattern(names):
+    return re.compile(rb'\s+(?:' + b"|".join(re.escape(name.encode()) for name in names) + rb')="[^"]*"')
+
+
+def file_digest(path):
+    """sha256 of the whole file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def playlist_digest(path, ignore_attrs=()):
+    """
+    sha256 of a playlist without its banner. Leading blank lines, #EXTM3U and
+    plain comments ("# Last Updated: ...", "# TV channel counts :- ...") are
+    skipped; hashing starts at the first entry line or directive. The
+    ignore_attrs #EXTINF attributes are left out of the hash.
+    """
+    digest = hashlib.sha256()
+    strip = _attrs_pattern(tuple(ignore_attrs)).sub if ignore_attrs else None
+    in_header = True
+    with open(path, "rb") as f:
+        for line in f:
+            if in_header:
+                text = line.strip()
+                if not text or text.startswith(b"#EXTM3U"):
+                    continue
+                if text.startswith(b"#") and not text.startswith(_DIRECTIVE_PREFIXES):
+                    continue
+                in_header = False
+            if strip is not None and line.startswith(b"#EXTINF"):
+                line = strip(b"", line)
+            digest.update(line.rstrip(b"\r\n"))
+            digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def read_banner(path):
+    """
+    The header of a playlist file as text: the lines playlist_digest()
+    skips, up to the first entry line or directive. "#EXTM3U" if empty.
+    """
+    lines = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            text = line.strip()
+            if text and not text.startswith("#EXTM3U") and (
+                not text.startswith("#") or text.startswith(DIRECTIVE_PREFIXES)
+            ):
+                break
+            lines.append(line)
+    return "\n".join(lines).strip() or "#EXTM3U"
+
+
+def json_digest(path, volatile=()):
+    """sha256 of a JSON document with the top-level volatile keys removed."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key not in volatile}
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def replace_if_changed(tmp_path, path, digest=file_digest):
+    """
+    Moves a freshly written tmp_path over path, unless path already holds
+    the same content by digest(), in which case tmp_path is dropped and path
+    (and its mtime) is left alone. Returns True when path was replaced.
+    """
+    if os.path.exists(path):
+        try:
+            unchanged = digest(tmp_path) == digest(path)
+        except (OSError, ValueError):
+            unchanged = False
+        if unchanged:
+            os.remove(tmp_path)
+            return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_json(path, data, volatile=(), indent=4, ensure_ascii=False):
+    """
+    json.dump()s data to path atomically, keeping the old file when only the
+    volatile top-level keys (timestamps) differ. Returns True when written.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
+    return replace_if_changed(tmp_path, path, lambda p: json_digest(p, volatile))
@@ -0,0 +1,178 @@
+import codecs
+import os
+import re
+
+# Everything between "#EXTINF:" and the title comma: a duration token followed
+# by key="value" attributes. Commas inside quoted values are not separators.
+EXTINF_PATTERN = re.compile(r'^#EXTINF:\s*([^\s,]*)((?:[^,"]|"[^"]*")*),(.*)$')
+ATTR_PATTERN = re.compile(r'([\w-]+)="([^"]*)"')
+
+# Per-entry directives we carry over to the URL they belong to
+DIRECTIVE_PREFIXES = ("#EXT", "#KODIPROP")
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Entry:
+    """
+    One playlist entry as it appeared in the source: the raw #EXTINF line,
+    the #KODIPROP/#EXTVLCOPT/#EXTHTTP lines attached to it and the URL.
+    extinf is None for a bare URL with no #EXTINF in front of it.
+    """
+    __slots__ = ("extinf", "directives", "url", "_parsed")
+
+    def __init__(self, extinf, url, directives=()):
+        self.extinf = extinf
+        self.url = url
+        self.directives = directives
+        self._parsed = None
+
+    def _split(self):
+        if self._parsed is None:
+            self._parsed = split_extinf(self.extinf)
+        return self._parsed
+
+    @property
+    def duration(self):
+        return self._split()[0]
+
+    @property
+    def attrs(self):
+        return self._split()[1]
+
+    @property
+    def title(self):
+        return self._split()[2]
+
+    def lines(self):
+        if self.extinf:
+            yield self.extinf
+        yield from self.directives
+        yield self.url
+
+    def __repr__(self):
+        return f"Entry({self.title!r}, {self.url!r})"
+
+
+def split_extinf(line):
+    """Splits an #EXTINF line into (duration, attributes dict, title)."""
+    if not line:
+        return "-1", {}, ""
+    match = EXTINF_PATTERN.match(line)
+    if not match:
+        # No title comma at all, treat whatever follows the tag as the title
+        return "-1", {}, line.partition(":")[2].strip()
+    duration, attr_text, title = match.groups()
+    return duration or "-1", dict(ATTR_PATTERN.findall(attr_text)), title.strip()
+
+
+# The "#EXTINF:-1" in front of the attributes
+DURATION_PATTERN = re.compile(r"^#EXTINF:\s*[^\s,]*")
+
+
+def set_extinf_attrs(line, attrs):
+    """
+    The #EXTINF line with attrs (name -> value) set: existing attributes
+    get the new value in place, new ones go right after the duration, and
+    those whose value is None are removed.
+    """
+    added = []
+    for name, value in attrs.items():
+        if value is None:
+            line = re.sub(rf'\s+{re.escape(name)}="[^"]*"', "", line, count=1)
+            continue
+        value = str(value).replace('"', "'")
+        attr = f'{name}="{value}"'
+        pattern = re.compile(rf'(?<![\w-]){re.escape(name)}="[^"]*"')
+        line, count = pattern.subn(lambda _: attr, line, count=1)
+        if not count:
+            added.append(attr)
+    if added:
+        line = DURATION_PATTERN.sub(lambda match: " ".join([match.group(0)] + added), line, count=1)
+    return line
+
+
+def iter_lines(chunks, encoding="utf-8"):
+    """
+    Turns an iterable of bytes (or str) chunks, e.g. response.iter_content(),
+    into lines without ever holding more than one chunk plus the current
+    partial line in memory. Multi-byte characters split across chunks are
+    reassembled by the incremental decoder.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    tail = ""
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        if not chunk:
+            continue
+        parts = (tail + chunk).split("\n")
+        tail = parts.pop()
+        for part in parts:
+            yield part.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+def parse_lines(lines):
+    """
+    Groups playlist lines into Entry records in a single forward pass.
+
+    An #EXTINF that is followed by another #EXTINF before any URL is dropped,
+    directives seen before an #EXTINF are attached to the next entry, and
+    plain comments (banners, "# Last Updated" etc.) are skipped.
+    """
+    extinf = None
+    directives = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#EXTM3U"):
+            continue
+        if line.startswith("#EXTINF"):
+            if extinf is not None:
+                # Previous #EXTINF never got a URL, its directives go with it
+                directives = []
+            extinf = line
+        elif line.startswith("#"):
+            if line.startswith(DIRECTIVE_PREFIXES):
+                directives.append(line)
+        else:
+            yield Entry(extinf, line, tuple(directives))
+            extinf = None
+            directives = []
+
+
+def parse(chunks, encoding="utf-8"):
+    """Parses a playlist straight from a stream of bytes/str chunks."""
+    return parse_lines(iter_lines(chunks, encoding))
+
+
+def parse_file(path, encoding="utf-8"):
+    """Parses a playlist file from disk in CHUNK_SIZE reads."""
+    with open(path, "rb") as f:
+        yield from parse(iter(lambda: f.read(CHUNK_SIZE), b""), encoding)
+
+
+def fetch(url, session=None, timeout=30, encoding="utf-8", **kwargs):
+    """
+    Streams a remote playlist with requests and yields its entries as the
+    body arrives.
+    """
+    import requests
+
+    getter = session.get if session is not None else requests.get
+    with getter(url, stream=True, timeout=timeout, **kwargs) as response:
+        response.raise_for_status()
+        yield from parse(response.iter_content(chunk_size=CHUNK_SIZE), encoding)
+
+
+def parse_local(path, url, encoding="utf-8", **kwargs):
+    """
+    Parses a playlist this repo generates itself: the copy on disk when it
+    exists (freshly written by an upstream generator, or checked out), and
+    the published URL only as a fallback.
+    """
+    if os.path.exists(path):
+        return parse_file(path, encoding)
+    return fetch(url, encoding=encoding, **kwargs)
@@ -0,0 +1,123 @@
+import datetime
+import os
+import shutil
+import tempfile
+
+from .output import STAGE_ATTRS, playlist_digest, replace_if_changed
+
+BUFFER_SIZE = 64 * 1024
+
+OMNIX_BANNER = """#EXTM3U
+#=================================
+# Developed By: OMNIX EMPIER
+# IPTV Telegram Channels: https://t.me/omnix_Empire
+# Last Updated: {updated} (BD Time)
+# TV channel counts :- {count}
+# Disclaimer:
+# This tool does NOT host any content.
+# It aggregates publicly available data for informational purposes only.
+# For any issues or concerns, please contact the developer.
+#==================================  
+"""
+
+
+def bd_time():
+    """Current Bangladesh time (UTC + 6) in the banner format."""
+    utc_now = datetime.datetime.now(datetime.timezone.utc)
+    return (utc_now + datetime.timedelta(hours=6)).strftime("%Y-%m-%d %I:%M %p")
+
+
+def omnix_banner(count):
+    """The standard OMNIX playlist header for a list of count channels."""
+    return OMNIX_BANNER.format(updated=bd_time(), count=count)
+
+
+class M3UWriter:
+    """
+    Buffered playlist writer, used as a context manager.
+
+    header is either a ready string or a callable taking the final entry
+    count, for the banners that print "TV channel counts". With a callable
+    the body is spooled (in memory up to BUFFER_SIZE, then to a temp file)
+    and the header is written in front of it on close, so a single streaming
+    pass is still enough.
+
+    Output goes to a sibling ".tmp" file that only replaces path once the
+    block exits cleanly, so a failed download never truncates the playlist.
+    If the entries are the same as in the existing file (the banner with
+    its timestamp is ignored) the old file is kept as is and changed is
+    False, so there is nothing for the workflow to commit. So are the
+    ignore_attrs #EXTINF attributes, by default the ones the liveness and
+    enrich stages add afterwards; the stages themselves pass ().
+    """
+
+    def __init__(self, path, header="#EXTM3U", buffer_size=BUFFER_SIZE, ignore_attrs=STAGE_ATTRS):
+        self.path = path
+        self.header = header
+        self.buffer_size = buffer_size
+        self.ignore_attrs = tuple(ignore_attrs)
+        self.count = 0
+        self.changed = False
+        self._file = None
+        self._body = None
+        self._tmp_path = None
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._tmp_path = self.path + ".tmp"
+        self._file = open(self._tmp_path, "w", encoding="utf-8", newline="\n", buffering=self.buffer_size)
+        if callable(self.header):
+            self._body = tempfile.SpooledTemporaryFile(
+                max_size=self.buffer_size, mode="w+", encoding="utf-8", newline="\n"
+            )
+        else:
+            self._write_header(self.header)
+            self._body = self._file
+        return self
+
+    def _write_header(self, header):
+        if header:
+            self._file.write(header if header.endswith("\n") else header + "\n")
+
+    def write_line(self, line):
+        self._body.write(line)
+        self._body.write("\n")
+
+    def write_entry(self, entry):
+        """Writes anything with a lines() method and counts it."""
+        for line in entry.lines():
+            self.write_line(line)
+        self.count += 1
+
+    def write_entries(self, entries):
+        for entry in entries:
+            self.write_entry(entry)
+        return self.count
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._body is not self._file:
+                if exc_type is None:
+                    self._write_header(self.header(self.count))
+                    self._body.seek(0)
+                    shutil.copyfileobj(self._body, self._file, self.buffer_size)
+                self._body.close()
+        finally:
+            self._file.close()
+        if exc_type is None:
+            self.changed = replace_if_changed(
+                self._tmp_path, self.path, lambda path: playlist_digest(path, self.ignore_attrs)
+            )
+            if not self.changed:
+                print(f"{self.path} unchanged, keeping the existing file")
+        else:
+            os.remove(self._tmp_path)
+        return False
+
+
+def write_playlist(path, entries, header="#EXTM3U"):
+    """Writes an iterable of entries to path in one pass, returns the count."""
+    with M3UWriter(path, header) as writer:
+        return writer.write_entries(entries)
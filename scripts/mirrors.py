@@ -0,0 +1,199 @@
+"""
+Mirror ranking stage: channels listed by several sources (Star Sports in
+omnix_bdix, BEIN, jstar, crichd2h and Crichd, ...) are grouped by name
+through m3u.NameIndex, each mirror's speed is measured, and
+playlist/mirrors.m3u lists every such channel's mirrors fastest first.
+
+    python scripts/mirrors.py                         # SOURCES
+    python scripts/mirrors.py playlist/BEIN.m3u playlist/jstar.m3u
+
+A mirror is timed on its manifest (time to first byte, near enough for a
+few KiB) and on the newest few segments of its best variant (sustained
+throughput), within MEASURE_BUDGET seconds. Measurements are kept in
+.cache/mirrors.json and only MEASURE_PER_RUN mirrors, new ones first and
+then the longest unmeasured, are timed again on each run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urljoin, urlsplit
+
+import m3u
+import net
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = [
+    "playlist/omnix_bdix.m3u",
+    "playlist/BEIN.m3u",
+    "playlist/jstar.m3u",
+    "playlist/crichd2h.m3u",
+    "playlist/Crichd.m3u",
+]
+OUTPUT = os.path.join(REPO_DIR, "playlist", "mirrors.m3u")
+MEASUREMENTS = os.path.join(REPO_DIR, ".cache", "mirrors.json")
+
+MEASURE_PER_RUN = 150
+# Seconds one mirror gets for its manifests and segments together
+MEASURE_BUDGET = 10
+# Newest segments downloaded per mirror, and at most this much of each
+SEGMENTS = 3
+SEGMENT_BYTES = 2 * 1024 * 1024
+# Mirrors of one host measured at once, so they do not slow each other down
+MIRRORS_PER_HOST = 2
+# Measurements nobody has listed for this long are forgotten
+FORGET_AFTER = 7 * 24 * 3600
+
+# Names at least this similar are one channel: "Star Sports 1 Hindy" is
+# "Star Sports 1 Hindi", "Star Sports 1 Hindi" is not "Star Sports 1"
+MERGE_SCORE = 0.85
+
+
+def channel_key(index, title):
+    """The key of the channel already in index that title names, or title's own key after adding it."""
+    candidates = index.match(title, limit=1, min_score=MERGE_SCORE)
+    return candidates[0].key if candidates else index.add(title)
+
+
+def group_mirrors(paths):
+    """{channel key: [(source, Entry), ...]} for the channels listed by at least two of the playlists."""
+    groups = {}
+    index = m3u.NameIndex()
+    for path in paths:
+        source = os.path.splitext(os.path.basename(path))[0]
+        for entry in m3u.parse_file(path):
+            key = channel_key(index, entry.title) if entry.extinf else ""
+            if key and entry.url.startswith(("http://", "https://")):
+                groups.setdefault(key, []).append((source, entry))
+    return {
+        key: mirrors for key, mirrors in groups.items()
+        if len({source for source, _ in mirrors}) > 1
+    }
+
+
+def score(measurement):
+    """
+    Seconds to start playing: first byte plus one segment at the measured
+    throughput. Lower is faster; failed and unmeasured mirrors sort last.
+    """
+    if not measurement or not measurement.get("ok"):
+        return float("inf")
+    return measurement["ttfb"] + SEGMENT_BYTES / max(measurement["throughput"], 1)
+
+
+async def timed_get(engine, url, headers, max_bytes):
+    started = time.monotonic()
+    response = await engine.get(url, headers=headers, max_bytes=max_bytes)
+    return response, time.monotonic() - started
+
+
+async def measure(engine, url, headers):
+    """{"ttfb", "throughput", "ok"} of one mirror; raises on timeouts and connection errors."""
+    response, ttfb = await timed_get(engine, url, headers, SEGMENT_BYTES)
+    if not response.ok:
+        return {"ok": False}
+    if "#EXTM3U" not in response.text[:1024]:
+        # A plain stream (MPEG-TS over HTTP): its own body is the throughput sample
+        return {"ok": True, "ttfb": ttfb, "throughput": response.size / ttfb}
+
+    best = m3u.best_variant(m3u.parse_master(response.text))
+    if best is not None:
+        media_url = urljoin(response.url, best.uri)
+        response, _ = await timed_get(engine, media_url, headers, SEGMENT_BYTES)
+        if not response.ok:
+            return {"ok": False}
+    segments = m3u.parse_media(response.text)[-SEGMENTS:]
+    if not segments:
+        return {"ok": False}
+
+    size = seconds = 0
+    for segment in segments:
+        segment_response, elapsed = await timed_get(engine, urljoin(response.url, segment), headers, SEGMENT_BYTES)
+        if not segment_response.ok:
+            return {"ok": False}
+        size += segment_response.size
+        seconds += elapsed
+    return {"ok": True, "ttfb": ttfb, "throughput": size / max(seconds, 1e-6)}
+
+
+def pick_sample(urls, measurements, limit=MEASURE_PER_RUN):
+    """The mirrors to time this run: never measured first, then the stalest."""
+    return sorted(urls, key=lambda url: measurements.get(url, {}).get("measured_at", 0))[:limit]
+
+
+async def measure_all(targets, measurements):
+    """Times the (url, headers) targets and stores the results into measurements."""
+    host_limits = {}
+    async with net.FetchEngine(default=net.HostBudget(MIRRORS_PER_HOST * 2), timeout=MEASURE_BUDGET, retries=0) as engine:
+        async def one(url, headers):
+            host = urlsplit(url).hostname or ""
+            limit = host_limits.setdefault(host, asyncio.Semaphore(MIRRORS_PER_HOST))
+            async with limit:
+                try:
+                    result = await asyncio.wait_for(measure(engine, url, headers), MEASURE_BUDGET)
+                except Exception:
+                    result = {"ok": False}
+            result["measured_at"] = time.time()
+            measurements[url] = result
+
+        await asyncio.gather(*(one(url, headers) for url, headers in targets))
+
+
+def load_measurements():
+    try:
+        with open(MEASUREMENTS, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_mirrors(groups, measurements):
+    """The merged playlist: channels by name, each one's mirrors fastest first."""
+    with m3u.M3UWriter(OUTPUT, header=m3u.omnix_banner, ignore_attrs=()) as writer:
+        for key in sorted(groups):
+            ranked = sorted(groups[key], key=lambda mirror: score(measurements.get(net.stream_request(mirror[1])[0])))
+            for rank, (source, entry) in enumerate(ranked, 1):
+                extinf = m3u.set_extinf_attrs(entry.extinf, {"tvg-id": key, "mirror": f"{rank}/{len(ranked)} {source}"})
+                writer.write_entry(m3u.Entry(extinf, entry.url, entry.directives))
+    return writer.count
+
+
+def rank_mirrors(paths=None):
+    """run_all entry point."""
+    if paths is None:
+        paths = [os.path.join(REPO_DIR, path) for path in SOURCES]
+    groups = group_mirrors([path for path in paths if os.path.exists(path)])
+
+    targets = {}
+    for mirrors in groups.values():
+        for _, entry in mirrors:
+            url, headers = net.stream_request(entry)
+            targets.setdefault(url, headers)
+    measurements = load_measurements()
+    sample = pick_sample(targets, measurements, MEASURE_PER_RUN)
+    print(f"[mirrors] {len(groups)} channels in several sources, {len(targets)} mirrors, timing {len(sample)}")
+    asyncio.run(measure_all([(url, targets[url]) for url in sample], measurements))
+
+    cutoff = time.time() - FORGET_AFTER
+    measurements = {
+        url: measurement for url, measurement in measurements.items()
+        if url in targets or measurement.get("measured_at", 0) > cutoff
+    }
+    m3u.write_json(MEASUREMENTS, measurements, indent=None)
+    count = write_mirrors(groups, measurements)
+    working = sum(1 for url in targets if measurements.get(url, {}).get("ok"))
+    print(f"[mirrors] {count} entries written, {working}/{len(targets)} mirrors working at last measurement")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank the mirrors of channels listed by several playlists.")
+    parser.add_argument("playlists", nargs="*", help="playlist files (default: SOURCES)")
+    args = parser.parse_args(argv)
+    rank_mirrors(args.playlists or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Shared HTTP helpers for the playlist generators.
+
+    import net
+
+    response = net.cached_get(url, timeout=15)
+    if not response.not_modified:
+        data = response.json()
+
+    async with net.FetchEngine({"example.com": net.HostBudget(4, rate=5)}) as engine:
+        pages = await asyncio.gather(*(engine.get(url) for url in urls))
+
+    with net.ProbeCache() as cache:
+        probes = asyncio.run(net.probe_urls(map(net.stream_request, entries), cache))
+"""
+from .cache import CachedResponse, HTTPCache, cached_get, default_cache
+from .engine import FetchEngine, HostBudget, Response, TokenBucket
+from .probe import Probe, ProbeCache, probe_urls, stream_request
+from .resolutions import Resolution, ResolutionCache, probe_url, url_expiry
+from .sessions import close_sessions, impersonated_session, session
+
+__all__ = [
+    "CachedResponse",
+    "FetchEngine",
+    "HTTPCache",
+    "HostBudget",
+    "Probe",
+    "ProbeCache",
+    "Resolution",
+    "ResolutionCache",
+    "Response",
+    "TokenBucket",
+    "cached_get",
+    "close_sessions",
+    "default_cache",
+    "impersonated_session",
+    "probe_url",
+    "probe_urls",
+    "session",
+    "stream_request",
+    "url_expiry",
+]
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), ".cache", "http")
+MAX_BYTES = 256 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class HTTPCache:
+    """
+    On-disk response store keyed by URL.
+
+    Each body lives in its own file named after the URL's hash; index.json
+    keeps the validators (ETag / Last-Modified), size and last use time of
+    every entry. Once the bodies add up to more than max_bytes the least
+    recently used ones are evicted. Safe to share between threads.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(directory, "index.json")
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def body_path(self, url):
+        return os.path.join(self.directory, self.key(url) + ".body")
+
+    def lookup(self, url):
+        """The index record for url, or None if there is no usable body."""
+        with self._lock:
+            meta = self._index.get(self.key(url))
+        if meta and os.path.exists(self.body_path(url)):
+            return meta
+        return None
+
+    def validators(self, url):
+        """Conditional request headers for the cached copy of url."""
+        meta = self.lookup(url)
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def file_changed(self, path):
+        """
+        Whether a local file's content differs from when it was last checked,
+        recorded in the index under its file:// URL, so inputs read from
+        the checkout get the same "changed since the last run" test as
+        conditional GETs. True the first time.
+        """
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        url = "file://" + os.path.abspath(path)
+        with self._lock:
+            meta = self._index.get(self.key(url))
+            changed = meta is None or meta.get("digest") != digest.hexdigest()
+            self._index[self.key(url)] = {"url": url, "digest": digest.hexdigest(), "size": 0, "used": time.time()}
+            self._save_index()
+        return changed
+
+    def touch(self, url):
+        with self._lock:
+            meta = self._index.get(self.key(url))
+            if meta:
+                meta["used"] = time.time()
+                self._save_index()
+
+    def store(self, url, response, chunk_size=CHUNK_SIZE):
+        """Streams a 200 response body to disk and records its validators."""
+        path = self.body_path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "encoding": response.encoding or "",
+            "size": size,
+            "used": time.time(),
+        }
+        with self._lock:
+            self._index[self.key(url)] = meta
+            self._evict()
+            self._save_index()
+        return meta
+
+    def _evict(self):
+        total = sum(meta["size"] for meta in self._index.values())
+        for key, meta in sorted(self._index.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= meta["size"]
+            del self._index[key]
+            try:
+                os.remove(os.path.join(self.directory, key + ".body"))
+            except OSError:
+                pass
+
+    def _save_index(self):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+
+class CachedResponse:
+    """
+    The body of a cached_get() call, read back from the cache file.
+    not_modified is True when the server answered 304 and nothing new was
+    downloaded, so callers can skip re-parsing and re-writing.
+    """
+    __slots__ = ("url", "path", "encoding", "not_modified")
+
+    def __init__(self, url, path, encoding="", not_modified=False):
+        self.url = url
+        self.path = path
+        self.encoding = encoding or "utf-8"
+        self.not_modified = not_modified
+
+    def iter_content(self, chunk_size=CHUNK_SIZE):
+        with open(self.path, "rb") as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+
+    @property
+    def content(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """The process-wide cache in .cache/http, created on first use."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HTTPCache()
+        return _default_cache
+
+
+def cached_get(url, session=None, cache=None, timeout=30, headers=None, **kwargs):
+    """
+    GET url with If-None-Match / If-Modified-Since taken from the cache,
+    through the shared pooled session unless one is given. A 304 serves
+    the stored body, a 200 replaces it; anything else raises like
+    response.raise_for_status(), and so does a 304 with no cached body
+    to serve.
+    """
+    from .sessions import session as shared_session
+
+    cache = cache or default_cache()
+    getter = (session or shared_session()).get
+    conditional = cache.validators(url)
+    request_headers = dict(headers or {})
+    request_headers.update(conditional)
+    with getter(url, headers=request_headers, stream=True, timeout=timeout, **kwargs) as response:
+        if response.status_code == 304:
+            meta = cache.lookup(url) if conditional else None
+            if meta:
+                cache.touch(url)
+                return CachedResponse(url, cache.body_path(url), meta["encoding"], not_modified=True)
+            if not conditional:
+                import requests
+
+                raise requests.HTTPError(f"304 Not Modified for {url} with no cached copy", response=response)
+        else:
+            response.raise_for_status()
+            meta = cache.store(url, response)
+            return CachedResponse(url, cache.body_path(url), meta["encoding"])
+    # Body was evicted between sending the validators and the 304: ask again,
+    # this time without validators since there is nothing left to validate
+    return cached_get(url, session, cache, timeout, headers, **kwargs)
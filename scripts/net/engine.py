@@ -0,0 +1,146 @@
+import asyncio
+import random
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+# What one host may take from a scraper: at most `concurrency` requests in
+# flight and, if rate is set, `rate` request starts per second with bursts
+# of up to `burst` (default: rate, at least 1).
+HostBudget = namedtuple("HostBudget", ["concurrency", "rate", "burst"], defaults=[None, None])
+
+DEFAULT_BUDGET = HostBudget(8)
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class TokenBucket:
+    """Async token bucket: acquire() waits until a request may start."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Response:
+    """
+    The parts of a response the scrapers use, read before the connection
+    is released. size is the number of body bytes read.
+    """
+    __slots__ = ("url", "status", "headers", "text", "size")
+
+    def __init__(self, url, status, headers, text, size=0):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.text = text
+        self.size = size
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def __repr__(self):
+        return f"Response({self.status}, {self.url!r})"
+
+
+class FetchEngine:
+    """
+    Shared asyncio HTTP client for the scraper fan-outs, used as an async
+    context manager.
+
+    One aiohttp session (one keep-alive pool) serves every host. Each host
+    gets its own semaphore and optional token bucket from budgets, a dict of
+    hostname -> HostBudget; hosts not listed fall back to default. Failed
+    connections and 429/5xx answers are retried with jittered exponential
+    backoff.
+
+        budgets = {"example.com": net.HostBudget(concurrency=4, rate=5)}
+        async with net.FetchEngine(budgets, headers=HEADERS) as engine:
+            response = await engine.get(url)
+    """
+
+    def __init__(self, budgets=None, default=DEFAULT_BUDGET, headers=None, timeout=30,
+                 retries=2, backoff=0.5, pool_size=100):
+        self.budgets = dict(budgets or {})
+        self.default = default
+        self.headers = headers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._session = None
+        self._semaphores = {}
+        self._buckets = {}
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=0),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        return False
+
+    def _limits(self, host):
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            budget = self.budgets.get(host, self.default)
+            semaphore = self._semaphores[host] = asyncio.Semaphore(budget.concurrency)
+            if budget.rate:
+                self._buckets[host] = TokenBucket(budget.rate, budget.burst)
+        return semaphore, self._buckets.get(host)
+
+    def _delay(self, attempt):
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def request(self, method, url, max_bytes=None, **kwargs):
+        """
+        Sends one request within the host's budget and returns a Response.
+        The last retryable status is returned as is; the last connection
+        error or timeout is raised. With max_bytes only the start of the
+        body is read, for probes of streams that never end.
+        """
+        import aiohttp
+
+        semaphore, bucket = self._limits(urlsplit(url).hostname or "")
+        for attempt in range(self.retries + 1):
+            try:
+                async with semaphore:
+                    if bucket is not None:
+                        await bucket.acquire()
+                    async with self._session.request(method, url, **kwargs) as response:
+                        if max_bytes is None:
+                            body = await response.read()
+                            text = await response.text(errors="replace")
+                        else:
+                            body = await response.content.read(max_bytes)
+                            text = body.decode("utf-8", errors="replace")
+                        result = Response(str(response.url), response.status, response.headers, text, len(body))
+                if result.status not in RETRY_STATUSES or attempt == self.retries:
+                    return result
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self._delay(attempt))
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
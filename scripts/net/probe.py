@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from .cache import CACHE_DIR
+from .engine import FetchEngine, HostBudget
+
+PROBES_DB = os.path.join(os.path.dirname(CACHE_DIR), "probes.sqlite")
+# A stream that answered is not probed again for this long
+PROBE_TTL = 30 * 60
+# Seconds a stream gets to answer before it counts as dead
+PROBE_DEADLINE = 5
+# Streams probed at once per host, so one big server is not flooded
+PROBE_BUDGET = HostBudget(4)
+# Enough of a manifest to see "#EXTM3U"; servers ignoring the Range header
+# are cut off after this much
+PROBE_BYTES = 1024
+
+# alive is None for URLs that cannot be probed over HTTP (rtmp://, plugin://, ...)
+Probe = namedtuple("Probe", ["url", "alive", "status", "cached"])
+
+# #EXTVLCOPT options that are really request headers
+VLC_HEADERS = {
+    "http-user-agent": "User-Agent",
+    "http-referrer": "Referer",
+    "http-referer": "Referer",
+    "http-origin": "Origin",
+}
+
+
+def stream_request(entry):
+    """
+    (url, headers) a player would use for an Entry: the URL without its
+    "|Header=value&..." suffix, and the headers from that suffix and from
+    the entry's #EXTVLCOPT and #EXTHTTP lines.
+    """
+    url, _, suffix = entry.url.partition("|")
+    headers = {}
+    for part in suffix.split("&") if suffix else ():
+        name, _, value = part.partition("=")
+        if name:
+            headers[name.strip()] = value.strip()
+    for line in entry.directives:
+        if line.startswith("#EXTVLCOPT:"):
+            option, _, value = line[len("#EXTVLCOPT:"):].partition("=")
+            name = VLC_HEADERS.get(option.strip().lower())
+            if name:
+                headers.setdefault(name, value.strip())
+        elif line.startswith("#EXTHTTP:"):
+            try:
+                extra = json.loads(line[len("#EXTHTTP:"):])
+            except ValueError:
+                continue
+            if isinstance(extra, dict):
+                for name, value in extra.items():
+                    headers.setdefault(name, str(value))
+    return url, headers
+
+
+def looks_alive(url, response):
+    """A stream answered: no error status, and a manifest URL served an actual playlist."""
+    if response.status == 416:
+        # Range not satisfiable: the stream is there, only shorter than the range
+        return True
+    if response.status >= 400:
+        return False
+    if urlsplit(url).path.lower().endswith((".m3u8", ".m3u")):
+        return response.text.lstrip("\ufeff \t\r\n").startswith("#EXTM3U")
+    return True
+
+
+class ProbeCache:
+    """
+    When each stream URL last answered a probe (SQLite under .cache/).
+    Streams that answered within ttl seconds are not probed again; dead
+    ones always are, since most outages are short. Use as a context
+    manager or call close().
+    """
+
+    def __init__(self, ttl=PROBE_TTL, path=PROBES_DB):
+        self.ttl = ttl
+        self.hits = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS probes (url TEXT PRIMARY KEY, alive INTEGER NOT NULL, checked_at REAL NOT NULL)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def is_fresh(self, url):
+        row = self._db.execute("SELECT alive, checked_at FROM probes WHERE url = ?", (url,)).fetchone()
+        fresh = row is not None and row[0] and time.time() - row[1] < self.ttl
+        if fresh:
+            self.hits += 1
+        return bool(fresh)
+
+    def store(self, url, alive):
+        self._db.execute("INSERT OR REPLACE INTO probes VALUES (?, ?, ?)", (url, int(alive), time.time()))
+
+    def prune(self, older_than=7 * 24 * 3600):
+        """Forgets URLs not probed for a week, which playlists no longer list."""
+        self._db.execute("DELETE FROM probes WHERE checked_at < ?", (time.time() - older_than,))
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+
+async def probe_urls(targets, cache=None, deadline=PROBE_DEADLINE, budget=PROBE_BUDGET, max_bytes=PROBE_BYTES):
+    """
+    Checks (url, headers) pairs concurrently, within budget per host and
+    deadline seconds each, and returns a Probe for every pair in order.
+    Each distinct URL is requested once, as a ranged GET of its first
+    max_bytes (HEAD is refused by too many stream servers), and not at
+    all while cache holds a fresh answer for it.
+    """
+    targets = list(targets)
+    unique = {}
+    for url, headers in targets:
+        unique.setdefault(url, headers)
+
+    async with FetchEngine(default=budget, timeout=deadline, retries=0) as engine:
+        async def probe(url, headers):
+            if not url.startswith(("http://", "https://")):
+                return Probe(url, None, None, False)
+            if cache is not None and cache.is_fresh(url):
+                return Probe(url, True, None, True)
+            try:
+                response = await engine.get(url, max_bytes=max_bytes,
+                                            headers=dict(headers, Range=f"bytes=0-{max_bytes - 1}"))
+                alive, status = looks_alive(url, response), response.status
+            except Exception:
+                alive, status = False, None
+            if cache is not None:
+                cache.store(url, alive)
+            return Probe(url, alive, status, False)
+
+        results = await asyncio.gather(*(probe(url, headers) for url, headers in unique.items()))
+    by_url = dict(zip(unique, results))
+    return [by_url[url] for url, _ in targets]
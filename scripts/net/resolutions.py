@@ -0,0 +1,171 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .cache import CACHE_DIR
+
+RESOLUTIONS_DB = os.path.join(os.path.dirname(CACHE_DIR), "resolutions.sqlite")
+DEFAULT_TTL = 3 * 3600
+# Milliseconds a write waits for another source's write to the same file.
+# Every write is its own short transaction, so this is only ever a blip.
+BUSY_TIMEOUT = 2000
+
+# RESOLVE_VALIDATE=1 probes every cached stream URL before reusing it
+VALIDATE_ENV = "RESOLVE_VALIDATE"
+
+# Signed stream URLs usually say when they stop working: ?expires=...,
+# exp=... inside an Akamai style token (hdnea=st=...~exp=...~...), or a
+# /expire/... path segment (googlevideo manifests)
+EXPIRY_PATTERN = re.compile(r"(?:^|[?&~;/])(?:exp|expire|expires)[=/](\d{9,11})(?!\d)")
+
+
+def url_expiry(url):
+    """Unix time embedded in a signed URL, or None."""
+    match = EXPIRY_PATTERN.search(url)
+    return int(match.group(1)) if match else None
+
+
+class Resolution:
+    __slots__ = ("key", "url", "logo", "resolved_at", "expires_at", "failures")
+
+    def __init__(self, key, url, logo, resolved_at, expires_at, failures):
+        self.key = key
+        self.url = url
+        self.logo = logo
+        self.resolved_at = resolved_at
+        self.expires_at = expires_at
+        self.failures = failures
+
+    def __repr__(self):
+        return f"Resolution({self.key!r}, {self.url!r})"
+
+
+class ResolutionCache:
+    """
+    Remembers what each play/player page resolved to, per source, across
+    runs (SQLite under .cache/). lookup() hands back a stream URL while it is
+    fresh, so the play page is only fetched again for channels that are new,
+    expired, or failed last time.
+
+    An entry is fresh for ttl seconds, or until the expiry signed into its
+    URL if that comes first. With validate, a callable taking the URL, fresh
+    entries are also checked cheaply before being trusted; it defaults to
+    probe_url when RESOLVE_VALIDATE=1 is set in the environment.
+
+    The sources running side by side under run_all share one file, so
+    every write commits at once (WAL, autocommit) instead of holding the
+    write lock for a whole run, and a cache error is printed and ignored:
+    the cache can make a resolution slower, never make it fail.
+    Safe to share between threads; use as a context manager or call close().
+    """
+
+    def __init__(self, source, ttl=DEFAULT_TTL, path=RESOLUTIONS_DB, validate=None):
+        self.source = source
+        self.ttl = ttl
+        if validate is None and os.environ.get(VALIDATE_ENV) == "1":
+            validate = probe_url
+        self.validate = validate
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT}")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS resolutions ("
+            " source TEXT NOT NULL, key TEXT NOT NULL, url TEXT NOT NULL, logo TEXT NOT NULL,"
+            " resolved_at REAL NOT NULL, expires_at REAL NOT NULL, failures INTEGER NOT NULL,"
+            " PRIMARY KEY (source, key))"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _execute(self, sql, params=(), many=False):
+        """Runs one statement; returns the rows, or None when the database failed."""
+        try:
+            with self._lock:
+                if many:
+                    self._db.executemany(sql, params)
+                    return []
+                return self._db.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"[{self.source}] resolution cache: {e}")
+            return None
+
+    def get(self, key):
+        """The stored record for key, fresh or not, or None."""
+        rows = self._execute(
+            "SELECT key, url, logo, resolved_at, expires_at, failures FROM resolutions"
+            " WHERE source = ? AND key = ?",
+            (self.source, key),
+        )
+        return Resolution(*rows[0]) if rows else None
+
+    def lookup(self, key):
+        """The record for key if it can be used without re-resolving, else None."""
+        record = self.get(key)
+        usable = (
+            record is not None
+            and not record.failures
+            and record.expires_at > time.time()
+            and (self.validate is None or self.validate(record.url))
+        )
+        if usable:
+            self.hits += 1
+            return record
+        self.misses += 1
+        return None
+
+    def store(self, key, url, logo=""):
+        now = time.time()
+        expires_at = now + self.ttl
+        embedded = url_expiry(url)
+        if embedded:
+            expires_at = min(expires_at, embedded)
+        self._execute(
+            "INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?, ?, ?, ?, 0)",
+            (self.source, key, url, logo or "", now, expires_at),
+        )
+
+    def fail(self, key):
+        """Marks key as failed so the next lookup re-probes it."""
+        self._execute(
+            "UPDATE resolutions SET failures = failures + 1 WHERE source = ? AND key = ?",
+            (self.source, key),
+        )
+
+    def prune(self, keep_keys):
+        """Drops records for keys the source no longer lists."""
+        keep_keys = set(keep_keys)
+        rows = self._execute("SELECT key FROM resolutions WHERE source = ?", (self.source,))
+        self._execute(
+            "DELETE FROM resolutions WHERE source = ? AND key = ?",
+            [(self.source, row[0]) for row in rows or () if row[0] not in keep_keys],
+            many=True,
+        )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+        print(f"[{self.source}] resolution cache: {self.hits} reused, {self.misses} resolved")
+
+
+def probe_url(url, session=None, timeout=5):
+    """Cheap liveness check: opens the URL and reads nothing past the headers."""
+    from .sessions import session as shared_session
+
+    try:
+        with (session or shared_session()).get(url, stream=True, timeout=timeout) as response:
+            return response.status_code < 400
+    except Exception:
+        return False
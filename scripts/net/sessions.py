@@ -0,0 +1,71 @@
+import threading
+
+DEFAULT_POOL_SIZE = 20
+
+_sessions = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def session(name="default", headers=None, pool_size=DEFAULT_POOL_SIZE):
+    """
+    The process-wide requests.Session registered under name, created on
+    first use with an HTTPAdapter that keeps up to pool_size connections per
+    host alive. Size it to the number of worker threads that share it,
+    otherwise requests drops the extra connections after every response.
+
+    requests' connection pool is thread-safe, so one session is shared by
+    every thread; headers only apply when the session is created.
+    """
+    with _lock:
+        existing = _sessions.get(name)
+        if existing is not None:
+            return existing
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        new = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        new.mount("http://", adapter)
+        new.mount("https://", adapter)
+        if headers:
+            new.headers.update(headers)
+        _sessions[name] = new
+        return new
+
+
+def impersonated_session(impersonate="chrome", headers=None):
+    """
+    A curl_cffi session with a browser TLS fingerprint, one per thread and
+    per impersonate target. curl handles must not be shared between
+    threads, but each worker keeps its connections alive across requests.
+    Falls back to session() when curl_cffi is not installed.
+    """
+    sessions = getattr(_local, "sessions", None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+    existing = sessions.get(impersonate)
+    if existing is not None:
+        return existing
+
+    try:
+        from curl_cffi import requests as crequests
+    except ImportError:
+        if f"impersonate:{impersonate}" not in _sessions:
+            print("curl_cffi not found, falling back to requests (may fail)")
+        return session(f"impersonate:{impersonate}", headers)
+
+    new = crequests.Session(impersonate=impersonate)
+    if headers:
+        new.headers.update(headers)
+    sessions[impersonate] = new
+    return new
+
+
+def close_sessions():
+    """Closes the shared requests sessions (thread-local curl sessions close with their thread)."""
+    with _lock:
+        for existing in _sessions.values():
+            existing.close()
+        _sessions.clear()
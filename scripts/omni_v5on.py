@@ -1,10 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
-import datetime
-import pytz
-import os
 import concurrent.futures
 
+import dom
+import m3u
+import net
+
 # Configuration
 BASE_URL = "https://v5on.site"
 PLAYLIST_FILE = "playlist/omni_v5on.m3u"
@@ -13,22 +12,27 @@ HEADERS = {
     "Referer": "https://v5on.site/",
 }
 
-# Use a session for connection pooling
-session = requests.Session()
-session.headers.update(HEADERS)
+# Category fan-out workers
+MAX_WORKERS = 20
+
+# One pooled session with a keep-alive slot per worker thread
+session = net.session("v5on", headers=HEADERS, pool_size=MAX_WORKERS)
 
-def get_bd_time():
-    """Returns the current time in Bangladesh timezone."""
-    bd_tz = pytz.timezone('Asia/Dhaka')
-    now = datetime.datetime.now(bd_tz)
-    return now.strftime("%Y-%m-%d %I:%M %p (BD Time)")
+CARD_SELECTOR = '.channel-card, .card, .channel'
+PLAY_LINK_SELECTOR = 'a[href*="play.php?id="]'
+# Any h5/h6/div/span carrying one of the title classes
+TITLE_SELECTOR = ', '.join(
+    f'{tag}.{cls}'
+    for tag in ('h5', 'h6', 'div', 'span')
+    for cls in ('card-title', 'channel-name', 'title')
+)
 
 def fetch_soup(url):
-    """Fetches a URL and returns a BeautifulSoup object."""
+    """Fetches a URL and returns its parsed dom.Node tree (fastest installed parser)."""
     try:
         response = session.get(url, timeout=15)
         response.raise_for_status()
-        return BeautifulSoup(response.text, 'html.parser')
+        return dom.parse(response.text)
     except Exception as e:
         print(f"Error fetching {url}: {e}")
         return None
@@ -43,13 +47,13 @@ def get_categories():
         
         # Look for the 'All' category specifically to put it first if possible
         # But generic scraping is safer.
-        buttons = soup.find_all(['button', 'a'], href=True)
+        buttons = soup.select('button[href], a[href]')
         for btn in buttons:
-            href = btn['href']
+            href = btn.get('href')
             if '?cat=' in href:
                 # Convert relative to absolute
                 full_url = BASE_URL + "/" + href if not href.startswith('http') else href
-                name = btn.get_text(strip=True)
+                name = btn.text()
                 
                 # Check duplicates
                 if not any(c['url'] == full_url for c in categories):
@@ -70,18 +74,20 @@ def process_category(category):
     # print(f"Scanning: {cat_name}") 
     
     soup = fetch_soup(url)
-    found_channels = []
-    
     if not soup:
-        return found_channels
-        
-    cards = soup.select('.channel-card, .card, .channel')
+        return []
+    return extract_channels(soup, cat_name)
+
+def extract_channels(soup, cat_name):
+    """Channel records for every play.php card on a parsed category page."""
+    found_channels = []
+    cards = soup.select(CARD_SELECTOR)
     if not cards:
-        cards = soup.select('a[href*="play.php?id="]')
+        cards = soup.select(PLAY_LINK_SELECTOR)
 
     for card in cards:
         try:
-            link_tag = card if card.name == 'a' else card.find('a')
+            link_tag = card if card.tag == 'a' else card.select_one('a')
             if not link_tag: continue
                 
             href = link_tag.get('href')
@@ -89,59 +95,39 @@ def process_category(category):
             
             id_str = href.split('id=')[1].split('&')[0]
             
-            name_tag = card.find(['h5', 'h6', 'div', 'span'], class_=['card-title', 'channel-name', 'title'])
-            name = name_tag.get_text(strip=True) if name_tag else link_tag.get_text(strip=True)
+            name_tag = card.select_one(TITLE_SELECTOR)
+            name = name_tag.text() if name_tag else link_tag.text()
             
-            img_tag = card.find('img')
-            logo = img_tag['src'] if img_tag else ""
+            img_tag = card.select_one('img')
+            logo = img_tag.get('src', '') if img_tag else ""
             if logo and not logo.startswith('http'):
                 logo = BASE_URL + "/" + logo.lstrip('/')
                 
-            found_channels.append({
-                'id': id_str,
-                'name': name,
-                'logo': logo,
-                'category': cat_name,
-                'stream_url': f"{BASE_URL}/api/playlist.php?id={id_str}"
-            })
+            found_channels.append(make_channel(id_str, name, logo, cat_name))
         except:
             continue
             
     return found_channels
 
-def generate_m3u(channels):
-    """Generates the M3U content."""
-    bd_time = get_bd_time()
-    count = len(channels)
-    
-    header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {bd_time}
-# TV channel counts :- {count}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================
-
-"""
-    entries = []
-    for ch in channels:
-        name = ch['name'].replace(',', ' ')
-        cat = ch['category'].replace(',', ' ')
-        
-        # Construct URL with Pipe syntax for headers (Kodi/IPTV Standard)
-        # This often works where EXTVLCOPT fails
-        stream_url_with_headers = f'{ch["stream_url"]}|Referer={HEADERS["Referer"]}&User-Agent={HEADERS["User-Agent"]}'
-        
-        entries.append(f'#EXTINF:-1 tvg-id="{ch["id"]}" tvg-name="{name}" tvg-logo="{ch["logo"]}" group-title="{cat}",{name}')
-        entries.append(f'#EXTVLCOPT:http-referrer={HEADERS["Referer"]}')
-        entries.append(f'#EXTVLCOPT:http-user-agent={HEADERS["User-Agent"]}')
-        entries.append(stream_url_with_headers)
-        
-    return header + '\n'.join(entries)
+def make_channel(id_str, name, logo, cat_name):
+    """Builds the playlist record for one play.php id."""
+    name = name.replace(',', ' ')
+    # Construct URL with Pipe syntax for headers (Kodi/IPTV Standard)
+    # This often works where EXTVLCOPT fails
+    stream_url = f"{BASE_URL}/api/playlist.php?id={id_str}"
+    stream_url_with_headers = f'{stream_url}|Referer={HEADERS["Referer"]}&User-Agent={HEADERS["User-Agent"]}'
+    return m3u.Channel(
+        name,
+        stream_url_with_headers,
+        logo=logo,
+        group=cat_name.replace(',', ' '),
+        tvg_id=id_str,
+        tvg_name=name,
+        options=(
+            f'#EXTVLCOPT:http-referrer={HEADERS["Referer"]}',
+            f'#EXTVLCOPT:http-user-agent={HEADERS["User-Agent"]}',
+        )
+    )
 
 def main():
     print("Starting v5on.site scraper with multi-threading...")
@@ -155,7 +141,7 @@ def main():
     
     # Use ThreadPoolExecutor to fetch categories in parallel
     # 20 workers should be fast enough without killing the server
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         future_to_cat = {executor.submit(process_category, cat): cat for cat in categories}
         
         for future in concurrent.futures.as_completed(future_to_cat):
@@ -166,9 +152,9 @@ def main():
                 
                 new_count = 0
                 for ch in channels:
-                    if ch['id'] not in seen_ids:
+                    if ch.tvg_id not in seen_ids:
                         all_channels.append(ch)
-                        seen_ids.add(ch['id'])
+                        seen_ids.add(ch.tvg_id)
                         new_count += 1
                     else:
                         total_duplicates += 1
@@ -185,12 +171,9 @@ def main():
     print(f"Duplicates removed: {total_duplicates}")
     
     # Sort channels to ensure consistent order
-    all_channels.sort(key=lambda x: x['name'])
+    all_channels.sort(key=lambda x: x.name)
     
-    os.makedirs(os.path.dirname(PLAYLIST_FILE), exist_ok=True)
-    m3u_content = generate_m3u(all_channels)
-    with open(PLAYLIST_FILE, 'w', encoding='utf-8') as f:
-        f.write(m3u_content)
+    m3u.write_playlist(PLAYLIST_FILE, all_channels, header=m3u.omnix_banner)
         
     print(f"Playlist saved to {PLAYLIST_FILE}")
 
@@ -2,7 +2,8 @@ import json
 import os
 import urllib.request
 import urllib.error
-import datetime
+
+import m3u
 
 def fetch_token():
     token_url = "https://cookies.yecic62314.workers.dev/"
@@ -80,75 +81,51 @@ def generate_m3u(json_path, output_path):
 
     print(f"Found {len(channels)} channels.")
 
-    # Calculate BD Time (UTC + 6)
-    utc_now = datetime.datetime.now(datetime.timezone.utc)
-    bd_time = utc_now + datetime.timedelta(hours=6)
-    formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
-
-    m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {len(channels)}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  """
-
-    m3u_content = [m3u_header]
-
     # Official Headers identified
     user_agent = "plaYtv/7.1.5 (Linux;Android 13) ExoPlayerLib/2.11.6"
     referer = "https://www.jiotv.com/"
 
-    for channel in channels:
-        name = channel.get("channel-name", "Unknown Channel")
-        group = channel.get("group-title", "Uncategorized")
-        logo = channel.get("tvg-logo", "")
-        tvg_id = channel.get("tvg-id", "")
-        url = channel.get("mpd_url", "")
-        license_type = channel.get("license_type", "")
-        license_key = channel.get("license_key", "")
-        
-        if not url:
-            continue
-
-        # Append Token to URL
-        final_url = url
-        if token_value:
-            separator = "&" if "?" in final_url else "?"
-            final_url = f"{final_url}{separator}{token_value}"
-
-        # Start entry
-        m3u_content.append(f'#EXTINF:-1 tvg-id="{tvg_id}" tvg-logo="{logo}" group-title="{group}",{name}')
-        
-        # Add DRM props if present
-        if license_type == "clearkey" and license_key:
-            m3u_content.append('#KODIPROP:inputstream.adaptive.license_type=clearkey')
-            m3u_content.append(f'#KODIPROP:inputstream.adaptive.license_key={license_key}')
-        
-        # Add Network Headers via tags (VLC/Kodi)
-        m3u_content.append(f'#EXTVLCOPT:http-user-agent={user_agent}')
-        
-        # Add Cookie tag
-        if token_value:
-             m3u_content.append(f'#EXTVLCOPT:http-cookie={token_value}')
-
-        m3u_content.append(f'#EXTVLCOPT:http-referrer={referer}')
-        
-        # Append the URL
-        m3u_content.append(final_url)
-
     print(f"Writing M3U to {output_path}...")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(m3u_content))
-    
+    with m3u.M3UWriter(output_path, header=m3u.omnix_banner(len(channels))) as writer:
+        for channel in channels:
+            name = channel.get("channel-name", "Unknown Channel")
+            group = channel.get("group-title", "Uncategorized")
+            logo = channel.get("tvg-logo", "")
+            tvg_id = channel.get("tvg-id", "")
+            url = channel.get("mpd_url", "")
+            license_type = channel.get("license_type", "")
+            license_key = channel.get("license_key", "")
+
+            if not url:
+                continue
+
+            # Append Token to URL
+            final_url = url
+            if token_value:
+                separator = "&" if "?" in final_url else "?"
+                final_url = f"{final_url}{separator}{token_value}"
+
+            options = []
+            # Add DRM props if present
+            if license_type == "clearkey" and license_key:
+                options.append('#KODIPROP:inputstream.adaptive.license_type=clearkey')
+                options.append(f'#KODIPROP:inputstream.adaptive.license_key={license_key}')
+
+            # Add Network Headers via tags (VLC/Kodi)
+            options.append(f'#EXTVLCOPT:http-user-agent={user_agent}')
+
+            # Add Cookie tag
+            if token_value:
+                options.append(f'#EXTVLCOPT:http-cookie={token_value}')
+
+            options.append(f'#EXTVLCOPT:http-referrer={referer}')
+
+            writer.write_entry(m3u.Channel(name, final_url, logo=logo, group=group, tvg_id=tvg_id, options=options))
+
     print(f"Done! Playlist saved to {output_path}")
     print("To extend expiry in the future, simply run this script again.")
 
-if __name__ == "__main__":
+def main():
     json_file = "all_channels.json"
     m3u_file = "omnix_play.m3u"
     
@@ -160,3 +137,6 @@ if __name__ == "__main__":
     m3u_full_path = os.path.join(playlist_dir, m3u_file)
     
     generate_m3u(json_full_path, m3u_full_path)
+
+if __name__ == "__main__":
+    main()
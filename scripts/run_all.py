@@ -0,0 +1,252 @@
+"""
+Runs the playlist generators in one process instead of one workflow each.
+
+    python scripts/run_all.py                      # every source
+    python scripts/run_all.py ayna bein Crichd     # only these
+    python scripts/run_all.py --workers 4 --summary run_summary.json
+
+Each generator module is imported lazily inside its own task, so a missing
+optional dependency (curl_cffi, yt_dlp, bs4, ...) only fails that source.
+Sources that read another source's output (bein reads omni_v5on.m3u) list
+it in `after` and are only started once that source has finished, so they
+pick up the fresh file from disk instead of last cycle's copy on GitHub.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Generators import the shared packages (m3u, ...) as top-level modules
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+import m3u
+
+Source = namedtuple("Source", ["name", "script", "entry", "timeout", "outputs", "after"], defaults=[()])
+
+SOURCES = [
+    Source("ayna", "ayna.py", "main", 900, ["playlist/ayna.m3u"]),
+    Source("Crichd", "Crichd.py", "fetch_and_refresh", 300, ["playlist/Crichd.m3u"]),
+    Source("crichd2h", "crichd2h.py", "fetch_and_generate_m3u", 300, ["playlist/crichd2h.m3u"]),
+    Source("dreamtv", "dreamtv.py", "fetch_and_filter_m3u", 300, ["playlist/dreamtv.m3u"]),
+    Source("adultporn", "adultporn.py", "fetch_and_filter_adult_m3u", 300, ["playlist/adultporn.m3u"]),
+    Source("omni_v5on", "omni_v5on.py", "main", 600, ["playlist/omni_v5on.m3u"]),
+    Source("bein", "bein.py", "filter_bein_channels", 300, ["playlist/BEIN.m3u"], after=["omni_v5on"]),
+    Source("omnix_bdix", "omnix_bdix.py", "fetch_and_clean_playlist", 300, ["playlist/omnix_bdix.m3u"]),
+    Source("omnix_play", "omnix_play.py", "main", 300, ["playlist/omnix_play.m3u"]),
+    Source("jio_tv", "jio_tv_processor.py", "main", 300, ["playlist/jio-tv(omnix).m3u"]),
+    Source("jiohotstar_liv", "jiohotstar_liv.py", "main", 300, ["playlist/jiohotstar_liv.m3u"]),
+    Source("live-event", "live-event.py", "main", 300, ["playlist/live-event.m3u"]),
+    Source("sony_liv", "sony_liv.py", "main", 600, ["playlist/sony_liv.m3u"]),
+    Source("RoarZone", "RoarZone.py", "main", 900, ["playlist/RoarZone.m3u"]),
+    Source("RoarZoneTv", "RoarZoneTv.py", "main", 300, ["playlist/RoarZoneTv.m3u"]),
+    Source("kodi-tv", "kodi-tv.py", "main", 600, ["playlist/kodi-tv.m3u"]),
+    Source("yt_omnix", "yt_omnix.py", "main", 1500, ["playlist/yt_omnix.m3u"]),
+    # Not a generator: marks the dead streams of the playlists above
+    Source("liveness", "liveness.py", "probe_playlists", 600,
+           ["playlist/dreamtv.m3u", "playlist/omnix_bdix.m3u", "playlist/kodi-tv.m3u"],
+           after=["dreamtv", "omnix_bdix", "kodi-tv"]),
+    # Nor this one: writes HLS master quality into the playlists above
+    Source("enrich", "enrich.py", "enrich_all", 300,
+           ["playlist/ayna.m3u", "playlist/RoarZoneTv.m3u", "playlist/Crichd.m3u", "playlist/sony_liv.m3u"],
+           after=["ayna", "RoarZoneTv", "Crichd", "sony_liv"]),
+    # Merges the channels these generators (and the jstar workflow) share, fastest mirror first
+    Source("mirrors", "mirrors.py", "rank_mirrors", 600, ["playlist/mirrors.m3u"],
+           after=["omnix_bdix", "bein", "crichd2h", "Crichd"]),
+]
+# Reads every playlist, so it waits for all of the above
+SOURCES.append(Source("union", "union.py", "union_all", 300, ["playlist/union.m3u"],
+                      after=[source.name for source in SOURCES]))
+
+DEFAULT_WORKERS = 6
+
+
+def load_entry(source):
+    """Imports a generator script by path (names like kodi-tv.py are not valid module names)."""
+    module_name = os.path.splitext(source.script)[0].replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPT_DIR, source.script))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return getattr(module, source.entry)
+
+
+def count_entries(source):
+    total = 0
+    for output in source.outputs:
+        path = os.path.join(REPO_ROOT, output)
+        if os.path.exists(path):
+            total += sum(1 for _ in m3u.parse_file(path))
+    return total
+
+
+def output_digests(source):
+    digests = []
+    for output in source.outputs:
+        path = os.path.join(REPO_ROOT, output)
+        digests.append(m3u.playlist_digest(path) if os.path.exists(path) else None)
+    return digests
+
+
+def run_source(source):
+    """
+    Task body: import, run the entry point, count what it wrote. An output
+    counts as changed when its entries (banner aside, stage attributes
+    included) differ from before the run, whatever happened to its mtime.
+    """
+    before = output_digests(source)
+    entry = load_entry(source)
+    if inspect.iscoroutinefunction(entry):
+        asyncio.run(entry())
+    else:
+        entry()
+    return count_entries(source), output_digests(source) != before
+
+
+def check_dependencies(sources):
+    """Rejects unknown `after` names and dependency cycles before anything runs."""
+    by_name = {source.name: source for source in SOURCES}
+    for source in sources:
+        for upstream in source.after:
+            if upstream not in by_name:
+                raise ValueError(f"{source.name}: unknown dependency {upstream!r}")
+
+    visiting, done = set(), set()
+
+    def visit(name, path):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"dependency cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for upstream in by_name[name].after:
+            visit(upstream, path + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for source in sources:
+        visit(source.name, [])
+
+
+def run_sources(sources, workers=DEFAULT_WORKERS):
+    """
+    Runs sources on a bounded thread pool and returns one result dict per
+    source. A source is submitted once every source in its `after` list that
+    is part of this run has finished, whatever its status: the derived
+    scripts fall back to the copy already on disk. Timeouts are measured from
+    when a source actually starts; a timed-out generator cannot be killed, it
+    is reported and abandoned.
+    """
+    check_dependencies(sources)
+    results = {}
+    started = {}
+    selected = {source.name for source in sources}
+    waiting = list(sources)
+
+    def task(source):
+        started[source.name] = time.monotonic()
+        return run_source(source)
+
+    def submit_ready():
+        for source in list(waiting):
+            if all(name in results for name in source.after if name in selected):
+                waiting.remove(source)
+                pending[executor.submit(task, source)] = source
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    submit_ready()
+    while pending:
+        done, _ = concurrent.futures.wait(pending, timeout=1, return_when=concurrent.futures.FIRST_COMPLETED)
+        now = time.monotonic()
+        for future in done:
+            source = pending.pop(future)
+            elapsed = now - started.get(source.name, now)
+            try:
+                entries, changed = future.result()
+                results[source.name] = {"status": "ok", "entries": entries, "changed": changed, "seconds": elapsed}
+            except BaseException as e:
+                # SystemExit from scripts that sys.exit() on failure lands here too
+                results[source.name] = {"status": "failed", "error": repr(e), "seconds": elapsed}
+        for future, source in list(pending.items()):
+            start = started.get(source.name)
+            if start is not None and now - start > source.timeout:
+                future.cancel()
+                pending.pop(future)
+                results[source.name] = {"status": "timeout", "error": f"exceeded {source.timeout}s", "seconds": now - start}
+        submit_ready()
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def print_summary(sources, results, wall_time):
+    print("\n=== Playlist refresh summary ===")
+    print(f"{'source':<16} {'status':<8} {'entries':>8} {'output':<9} {'seconds':>8}  error")
+    for source in sources:
+        result = results.get(source.name, {"status": "skipped"})
+        entries = result.get("entries", "")
+        output = ("changed" if result["changed"] else "unchanged") if "changed" in result else ""
+        seconds = f"{result['seconds']:.1f}" if "seconds" in result else ""
+        print(f"{source.name:<16} {result['status']:<8} {entries:>8} {output:<9} {seconds:>8}  {result.get('error', '')}")
+    failed = sum(1 for r in results.values() if r["status"] != "ok")
+    unchanged = sum(1 for r in results.values() if r.get("changed") is False)
+    print(f"Total wall time: {wall_time:.1f}s, {len(results) - failed} ok ({unchanged} unchanged), {failed} failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh every playlist in one process.")
+    parser.add_argument("sources", nargs="*", help="source names to run (default: all)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel generators")
+    parser.add_argument("--summary", help="also write the summary as JSON to this path")
+    parser.add_argument("--list", action="store_true", help="list known sources and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for source in SOURCES:
+            after = f"  after={','.join(source.after)}" if source.after else ""
+            print(f"{source.name:<16} {source.script}:{source.entry}  timeout={source.timeout}s{after}")
+        return 0
+
+    by_name = {source.name.lower(): source for source in SOURCES}
+    unknown = [name for name in args.sources if name.lower() not in by_name]
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(unknown)}")
+    sources = [by_name[name.lower()] for name in args.sources] or SOURCES
+
+    # Generators write to relative "playlist/..." paths
+    os.chdir(REPO_ROOT)
+
+    start = time.monotonic()
+    results = run_sources(sources, args.workers)
+    wall_time = time.monotonic() - start
+    print_summary(sources, results, wall_time)
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({"wall_time": wall_time, "sources": results}, f, indent=2)
+
+    failed = any(r["status"] != "ok" for r in results.values())
+    if any(r["status"] == "timeout" for r in results.values()):
+        # Abandoned worker threads would otherwise keep the interpreter alive
+        sys.stdout.flush()
+        os._exit(1)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,11 @@
-import requests
+import asyncio
 from bs4 import BeautifulSoup
-import datetime
 import os
 import re
 import json
-import time
+
+import m3u
+import net
 
 # Source URL
 BASE_URL = "https://allinonereborn.xyz/sony"
@@ -13,6 +14,12 @@ HEADERS = {
     "Referer": "https://allinonereborn.xyz/sony/"
 }
 
+# Detail pages are fetched concurrently within this budget instead of one
+# by one with a fixed sleep in between
+HOST_BUDGETS = {"allinonereborn.xyz": net.HostBudget(concurrency=4, rate=4)}
+# How long a resolved detail page is reused without fetching it again
+RESOLVE_TTL = 6 * 3600
+
 # Determine the directory where this script resides
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Navigate up one level to root, then into 'playlist'
@@ -23,11 +30,12 @@ os.makedirs(PLAYLIST_DIR, exist_ok=True)
 
 OUTPUT_FILE = os.path.join(PLAYLIST_DIR, "sony_liv.m3u")
 
-def get_channel_links():
+async def get_channel_links(engine):
     try:
         print(f"Fetching main page: {BASE_URL}")
-        response = requests.get(BASE_URL, headers=HEADERS, timeout=15)
-        response.raise_for_status()
+        response = await engine.get(BASE_URL)
+        if not response.ok:
+            raise RuntimeError(f"HTTP {response.status}")
         
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -60,14 +68,13 @@ def get_channel_links():
         print(f"Error fetching channel list: {e}")
         return []
 
-def extract_stream_url(page_url):
+async def extract_stream_url(engine, page_url):
     try:
         print(f"  Fetching detail page: {page_url}")
-        time.sleep(0.5) 
-        response = requests.get(page_url, headers=HEADERS, timeout=10)
+        response = await engine.get(page_url)
         
-        if response.status_code != 200:
-            print(f"  Failed to load page: {response.status_code}")
+        if response.status != 200:
+            print(f"  Failed to load page: {response.status}")
             return None, None
             
         match = re.search(r'const\s+channelData\s*=\s*({.*?});', response.text)
@@ -104,12 +111,26 @@ def extract_stream_url(page_url):
         print(f"  Error extracting stream: {e}")
         return None, None
 
-def get_channels():
-    pages = get_channel_links()
+async def resolve_stream_url(engine, page_url, resolutions):
+    cached = resolutions.lookup(page_url)
+    if cached:
+        return cached.url, cached.logo
+    stream_url, logo = await extract_stream_url(engine, page_url)
+    if stream_url:
+        resolutions.store(page_url, stream_url, logo)
+    else:
+        resolutions.fail(page_url)
+    return stream_url, logo
+
+async def get_channels():
+    with net.ResolutionCache("sony_liv", ttl=RESOLVE_TTL) as resolutions:
+        async with net.FetchEngine(HOST_BUDGETS, headers=HEADERS, timeout=15) as engine:
+            pages = await get_channel_links(engine)
+            resolutions.prune(page['page_url'] for page in pages)
+            results = await asyncio.gather(*(resolve_stream_url(engine, page['page_url'], resolutions) for page in pages))
     valid_channels = []
     
-    for page in pages:
-        stream_url, logo = extract_stream_url(page['page_url'])
+    for page, (stream_url, logo) in zip(pages, results):
         if stream_url:
             print(f"  > Found stream for {page['name']}")
             valid_channels.append({
@@ -123,55 +144,29 @@ def get_channels():
     return valid_channels
 
 def generate_m3u(channels):
-    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        # Calculate BD Time (UTC + 6)
-        # Note: utcnow is deprecated, using now(datetime.timezone.utc) if possible or adjusting locally
-        utc_now = datetime.datetime.utcnow()
-        bd_time = utc_now + datetime.timedelta(hours=6)
-        formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
+    options = (
+        '#EXTVLCOPT:network-caching=1000',
+        f'#EXTVLCOPT:http-user-agent={HEADERS["User-Agent"]}',
+        f'#EXTVLCOPT:http-referrer={HEADERS["Referer"]}',
+    )
 
-        m3u_header = f"""#EXTM3U
-#=================================
-# Developed By: OMNIX EMPIER
-# IPTV Telegram Channels: https://t.me/omnix_Empire
-# Last Updated: {formatted_time} (BD Time)
-# TV channel counts :- {len(channels)}
-# Disclaimer:
-# This tool does NOT host any content.
-# It aggregates publicly available data for informational purposes only.
-# For any issues or concerns, please contact the developer.
-#==================================  """
-        
-        f.write(m3u_header + '\n')
-        # f.write(f'#EXTINF:-1, Updated: {current_time}\n') # Removing old updated line to avoid dupes
-        # f.write('#EXTVLCOPT:http-user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36\n') # Header already has user agent later? No, this is global
-        # Keeping global UA and status check if they are critical, but user asked for specific header.
-        
-        # Adding back global tags if needed by player, but standard header often replaces top metadata
-        # Let's keep the user agent as it might be useful, but put it after the banner
-        f.write('#EXTVLCOPT:http-user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36\n')
-        f.write('http://example.com/status\n\n')
+    with m3u.M3UWriter(OUTPUT_FILE, header=m3u.omnix_banner(len(channels))) as writer:
+        # Global user agent and status line kept right after the banner
+        writer.write_entry(m3u.Entry(None, 'http://example.com/status', (f'#EXTVLCOPT:http-user-agent={HEADERS["User-Agent"]}',)))
         
         for channel in channels:
-            name = channel['name']
-            url = channel['url']
-            logo = channel['logo']
-            
-            f.write(f'#EXTINF:-1 group-title="Sony Liv" tvg-logo="{logo}",{name}\n')
-            f.write('#EXTVLCOPT:network-caching=1000\n')
-            f.write(f'#EXTVLCOPT:http-user-agent={HEADERS["User-Agent"]}\n')
-            f.write(f'#EXTVLCOPT:http-referrer={HEADERS["Referer"]}\n')
-            f.write(f'{url}\n\n')
+            writer.write_entry(m3u.Channel(channel['name'], channel['url'], logo=channel['logo'], group="Sony Liv", options=options))
             
     print(f"Playlist generated: {OUTPUT_FILE} with {len(channels)} channels.")
 
-if __name__ == "__main__":
+def main():
     print(f"Script executing from: {SCRIPT_DIR}")
     print(f"Output targeted at: {OUTPUT_FILE}")
-    channels = get_channels()
+    channels = asyncio.run(get_channels())
     if channels:
         generate_m3u(channels)
     else:
         print("No channels found.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Union stage: reads every generated playlist once, reports how much of
+each one another playlist (or itself) already lists, and writes
+playlist/union.m3u with every stream exactly once.
+
+    python scripts/union.py                               # playlist/*.m3u
+    python scripts/union.py playlist/omnix_bdix.m3u playlist/playlist.m3u
+
+Streams are compared by m3u.canonical_url(), so the same stream behind a
+fresh token, a "|User-Agent=..." suffix or "www." still counts as one.
+The first playlist listing a stream keeps it; pass them in order of
+preference.
+"""
+import argparse
+import glob
+import os
+import sys
+
+import m3u
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAYLIST_DIR = os.path.join(REPO_DIR, "playlist")
+OUTPUT = os.path.join(PLAYLIST_DIR, "union.m3u")
+# Merged from the other playlists; counting them would only double everything
+DERIVED = {"union.m3u", "mirrors.m3u"}
+
+
+def default_playlists():
+    return [
+        path for path in sorted(glob.glob(os.path.join(PLAYLIST_DIR, "*.m3u")))
+        if os.path.basename(path) not in DERIVED
+    ]
+
+
+def build_union(paths, output=OUTPUT):
+    """Writes the de-duplicated union of paths to output in a single pass; returns the DedupeIndex."""
+    index = m3u.DedupeIndex()
+    with m3u.M3UWriter(output, header=m3u.omnix_banner, ignore_attrs=()) as writer:
+        for path in paths:
+            source = os.path.splitext(os.path.basename(path))[0]
+            for entry in m3u.parse_file(path):
+                if index.add(source, entry.url):
+                    writer.write_entry(entry)
+    return index
+
+
+def print_report(index):
+    print(f"{'source':<22} {'entries':>8} {'dup %':>6} {'repeated':>9} {'elsewhere':>10}  mostly in")
+    for stats in index.sources.values():
+        mostly = max(stats.overlap, key=stats.overlap.get) if stats.overlap else ""
+        print(f"{stats.name:<22} {stats.entries:>8} {stats.ratio:>6.1%} {stats.repeated:>9} {stats.elsewhere:>10}  {mostly}")
+    total = sum(stats.entries for stats in index.sources.values())
+    print(f"[union] {len(index)} distinct streams out of {total} entries")
+
+
+def union_all(paths=None):
+    """run_all entry point: by default every playlist/*.m3u but the derived ones."""
+    index = build_union(paths or default_playlists())
+    print_report(index)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report duplicate streams across playlists and write their union.")
+    parser.add_argument("playlists", nargs="*", help="playlist files, preferred first (default: playlist/*.m3u)")
+    args = parser.parse_args(argv)
+    union_all(args.playlists or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
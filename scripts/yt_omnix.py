@@ -1,8 +1,17 @@
 import os
-import json
+import bisect
 import concurrent.futures
+import contextlib
+import functools
+import json
+import multiprocessing
+import threading
+import time
 import yt_dlp
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
+
+import m3u
+import net
 
 # Categories to search for
 CATEGORIES = [
@@ -22,7 +31,8 @@ CATEGORIES = [
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
 # Output files
-PLAYLIST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "playlist")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAYLIST_DIR = os.path.join(REPO_DIR, "playlist")
 M3U_FILE = os.path.join(PLAYLIST_DIR, "yt_omnix.m3u")
 JSON_FILE = os.path.join(PLAYLIST_DIR, "yt_omnix.json")
 COOKIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cookies.txt")
@@ -33,118 +43,469 @@ os.makedirs(PLAYLIST_DIR, exist_ok=True)
 # Clients to try for fetching data
 CLIENTS = ['android', 'ios', 'tv', 'web']
 
-print(f"yt-dlp version: {yt_dlp.version.__version__}")
-if os.path.exists(COOKIES_FILE):
-    print(f"Cookies found at: {COOKIES_FILE}")
-else:
-    print("No cookies.txt found. Search results may be limited.")
+# Categories searched at once, and video resolutions in flight (all categories together)
+SEARCH_WORKERS = 5
+RESOLVE_WORKERS = int(os.environ.get("YT_RESOLVE_WORKERS", "10"))
+# YT_RESOLVE_MODE=process resolves in warm worker processes instead of
+# threads: extraction is mostly CPU (player JSON, signatures, format
+# sorting), which threads only take turns at under the GIL
+RESOLVE_MODE = os.environ.get("YT_RESOLVE_MODE", "thread")
 
-def get_live_streams(category):
-    """
-    Fetches live streams for a given category using yt-dlp with client fallback strategies.
-    Uses parallel processing to check valid streams faster.
-    """
-    print(f"Fetching live streams for category: {category}...")
-    
-    results = []
-    query = f"{category} live"
-    
-    for client in CLIENTS:
-        print(f"  Trying client: {client}...")
-        
-        # yt-dlp options
-        ydl_opts = {
+# Each client's success rate and latency, kept between runs (the workflow
+# restores .cache/) to decide which client every category tries first
+CLIENT_STATS = os.path.join(REPO_DIR, ".cache", "yt-clients.json")
+# Weight of the latest attempt in a client's running averages
+CLIENT_DECAY = 0.3
+# A client that keeps failing still counts as this likely to work
+MIN_SUCCESS = 0.02
+# YT_CLIENT_RACE=1 searches with the two best clients at once per category
+# and keeps whichever finds streams first
+RACE_CLIENTS = os.environ.get("YT_CLIENT_RACE") == "1"
+
+# Between discovery runs (category searches), the previous run's streams
+# are only refreshed: those whose manifest URL expires within
+# YT_EXPIRY_MARGIN seconds, or that stopped playing, are resolved again.
+# YT_DISCOVER=1 forces a search.
+REFRESH_STATE = os.path.join(REPO_DIR, ".cache", "yt-refresh.json")
+EXPIRY_MARGIN = int(os.environ.get("YT_EXPIRY_MARGIN", str(60 * 60)))
+DISCOVER_EVERY = int(os.environ.get("YT_DISCOVER_EVERY", str(24 * 60 * 60)))
+DISCOVER_ENV = "YT_DISCOVER"
+
+# Channels that have been live before, checked through their /live page on
+# every run so new broadcasts show up between searches; one not seen live
+# for WATCH_FOR seconds is dropped
+WATCHLIST = os.path.join(REPO_DIR, ".cache", "yt-watchlist.json")
+WATCH_FOR = 7 * 24 * 60 * 60
+
+def ydl_options(client, search=False):
+    """yt-dlp options for a flat search or a full resolution with one player client."""
+    if search:
+        opts = {
             'quiet': True,
             'no_warnings': True,
             'extract_flat': True,
             'ignoreerrors': True,
             'extractor_args': {'youtube': {'player_client': [client]}},
         }
-        
-        # Add cookies if available
-        if os.path.exists(COOKIES_FILE):
-            ydl_opts['cookiefile'] = COOKIES_FILE
-            # Enable verbose logging if using cookies to debug potential issues, or if explicitly needed
-            # ydl_opts['verbose'] = True 
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                # INCREASED: Search for 60 entries to get "big data"
-                search_results = ydl.extract_info(f"ytsearch60:{query}", download=False)
-                
-                if 'entries' in search_results:
-                    entries = [e for e in search_results['entries'] if e]
-                    print(f"    Found {len(entries)} raw entries with {client}.")
-                    
-                    if not entries:
-                        print(f"    No entries found with {client}, trying next...")
-                        continue
-
-                    # Prepare list of potential videos to resolve
-                    videos_to_check = []
-                    for entry in entries:
-                        video_url = entry.get('url')
-                        if not video_url:
-                            video_id = entry.get('id')
-                            if video_id:
-                                video_url = f"https://www.youtube.com/watch?v={video_id}"
-                        
-                        if video_url:
-                            videos_to_check.append(video_url)
-
-                    # Use ThreadPoolExecutor to resolve streams in parallel
-                    # We limit to 10 workers per category
-                    client_results = []
-                    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                        future_to_url = {
-                            executor.submit(resolve_stream_info, url, category, client): url 
-                            for url in videos_to_check
-                        }
-                        
-                        for future in concurrent.futures.as_completed(future_to_url):
-                            try:
-                                stream_info = future.result()
-                                if stream_info:
-                                    client_results.append(stream_info)
-                            except Exception:
-                                pass
-                    
-                    if client_results:
-                        print(f"    Successfully extracted {len(client_results)} valid streams with {client}.")
-                        results.extend(client_results)
-                        # If we found data, stop trying other clients for this category
-                        break
-                    else:
-                         print(f"    Found entries but failed to resolve streams with {client}. Trying next...")
-
-            except Exception as e:
-                print(f"    Error searching with {client}: {e}")
-                
+    else:
+        opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'format': 'best', 
+            'ignoreerrors': True,
+            'extractor_args': {'youtube': {'player_client': [client]}},
+        }
+    # Add cookies if available
+    if os.path.exists(COOKIES_FILE):
+        opts['cookiefile'] = COOKIES_FILE
+    return opts
+
+class ExtractorPool:
+    """
+    Long-lived yt_dlp.YoutubeDL instances, kept per player client (and per
+    search/resolve options). A YoutubeDL must not be used by two threads
+    at once, so each borrow takes an idle instance or creates one; the pool
+    never grows past the number of threads using it at the same time.
+    Reusing instances keeps their extractor setup, player cache and HTTP
+    connections instead of rebuilding them for every video.
+    """
+
+    def __init__(self, factory=None):
+        # factory(options) -> YoutubeDL; the benchmark swaps in a replaying one
+        self.factory = factory or yt_dlp.YoutubeDL
+        self._idle = {}
+        self._created = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def extractor(self, client, search=False):
+        key = (client, search)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            ydl = idle.pop() if idle else None
+        if ydl is None:
+            ydl = self.factory(ydl_options(client, search))
+            with self._lock:
+                self._created.append(ydl)
+        try:
+            yield ydl
+        finally:
+            with self._lock:
+                self._idle[key].append(ydl)
+
+    def close(self):
+        with self._lock:
+            for ydl in self._created:
+                ydl.close()
+            self._created = []
+            self._idle = {}
+
+class VideoTable:
+    """
+    Every video id seen this run, so each live video is resolved once no
+    matter how many categories' searches return it ("Cricket" and "Sports"
+    find the same matches). A successful resolution is shared by all
+    callers; a failure is only remembered per player client, so a category
+    falling back to the next client still gets to retry the video with it.
+    """
+
+    def __init__(self, executor, resolve, pool):
+        self.executor = executor
+        self.resolve_video = resolve
+        self.pool = pool
+        self.resolved = 0
+        self._live = {}
+        self._futures = {}
+        # How many callers asked for each (video_id, client), for release()
+        self._waiting = {}
+        # Reentrant: a future that is already done runs its callback right away
+        self._lock = threading.RLock()
+
+    def resolve(self, video_id, video_url, client):
+        """Future of the video's stream info (or None), shared between categories."""
+        with self._lock:
+            future = self._live.get(video_id) or self._futures.get((video_id, client))
+            if future is None:
+                future = self.executor.submit(self.resolve_video, video_url, client)
+                self._futures[(video_id, client)] = future
+                future.add_done_callback(lambda done: self._finished(video_id, done))
+                self.resolved += 1
+            self._waiting[(video_id, client)] = self._waiting.get((video_id, client), 0) + 1
+            return future
+
+    def release(self, keys):
+        """
+        Drops a caller's interest in the (video_id, client) resolutions it
+        asked for, cancelling those no other category asked for that have
+        not started yet.
+        """
+        with self._lock:
+            for key in keys:
+                self._waiting[key] = self._waiting.get(key, 1) - 1
+                future = self._futures.get(key)
+                if future is not None and self._waiting[key] <= 0 and future.cancel():
+                    del self._futures[key]
+                    self.resolved -= 1
+
+    def _finished(self, video_id, future):
+        if not future.cancelled() and future.exception() is None and future.result():
+            with self._lock:
+                self._live.setdefault(video_id, future)
+
+class ClientStats:
+    """
+    Success rate and latency of each player client over its recent
+    attempts, carried between runs. A client broken for days sinks to the
+    back, instead of every category paying for its search and a round of
+    failed resolutions before falling through to one that works.
+    """
+
+    def __init__(self, path=CLIENT_STATS, clients=CLIENTS):
+        self.path = path
+        self.clients = list(clients)
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            self.stats = {}
+
+    def record(self, client, ok, seconds):
+        with self._lock:
+            entry = self.stats.get(client)
+            if entry is None:
+                self.stats[client] = {"success": float(ok), "latency": seconds, "attempts": 1}
+            else:
+                entry["success"] += CLIENT_DECAY * (ok - entry["success"])
+                entry["latency"] += CLIENT_DECAY * (seconds - entry["latency"])
+                entry["attempts"] += 1
+
+    def cost(self, client):
+        """Expected seconds until the client finds streams: latency over success rate."""
+        entry = self.stats.get(client)
+        if entry is None:
+            # Untried: an even chance at the average latency of the others
+            known = [entry["latency"] for entry in self.stats.values()]
+            return (sum(known) / len(known) if known else 0.0) / 0.5
+        return entry["latency"] / max(entry["success"], MIN_SUCCESS)
+
+    def ranked(self):
+        """Clients cheapest first; ties keep the CLIENTS order."""
+        with self._lock:
+            return sorted(self.clients, key=self.cost)
+
+    def describe(self):
+        return ", ".join(
+            f"{client} ({self.stats[client]['success']:.0%}, {self.stats[client]['latency']:.0f}s)"
+            if client in self.stats else f"{client} (untried)"
+            for client in self.ranked()
+        )
+
+    def save(self):
+        m3u.write_json(self.path, self.stats, indent=None)
+
+class Watchlist:
+    """
+    Channels that have streamed live, by channel id: the category they
+    were found under, their name and when they were last seen live.
+    """
+
+    def __init__(self, path=WATCHLIST):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.channels = json.load(f)
+        except (OSError, ValueError):
+            self.channels = {}
+
+    def __len__(self):
+        return len(self.channels)
+
+    def update(self, streams, now):
+        """Adds the channels of streams live now, or marks them as seen."""
+        for stream in streams:
+            channel_id = stream.get("channel_id")
+            if channel_id:
+                entry = self.channels.setdefault(channel_id, {"category": stream["category"]})
+                entry["channel"] = stream.get("channel", "")
+                entry["last_live"] = now
+
+    def expire(self, now):
+        """Drops channels not live for WATCH_FOR; returns how many."""
+        stale = [channel_id for channel_id, entry in self.channels.items()
+                 if now - entry.get("last_live", 0) > WATCH_FOR]
+        for channel_id in stale:
+            del self.channels[channel_id]
+        return len(stale)
+
+    def save(self):
+        m3u.write_json(self.path, self.channels, indent=None)
+
+def search_videos(pool, category, client):
+    """(video id, url) of the ytsearch results for the category, in result order."""
+    with pool.extractor(client, search=True) as ydl:
+        # INCREASED: Search for 60 entries to get "big data"
+        search_results = ydl.extract_info(f"ytsearch60:{category} live", download=False)
+
+    videos = []
+    entries = [e for e in (search_results or {}).get('entries') or [] if e]
+    print(f"    Found {len(entries)} raw entries with {client}.")
+    for entry in entries:
+        video_id = entry.get('id')
+        video_url = entry.get('url')
+        if not video_url and video_id:
+            video_url = f"https://www.youtube.com/watch?v={video_id}"
+        if video_url:
+            videos.append((video_id or video_url, video_url))
+    return videos
+
+def try_client(category, table, client, stats, cancelled=None):
+    """
+    Searches the category with one player client and resolves what it
+    finds: the category's streams, or [] if the client came up empty.
+    Returns None, resolving nothing more, once cancelled is set.
+    """
+    print(f"  Trying client: {client}...")
+    started = time.monotonic()
+    try:
+        videos = search_videos(table.pool, category, client)
+    except Exception as e:
+        print(f"    Error searching with {client}: {e}")
+        stats.record(client, False, time.monotonic() - started)
+        return []
+    if cancelled is not None and cancelled.is_set():
+        return None
+
+    if not videos:
+        print(f"    No entries found with {client}, trying next...")
+        stats.record(client, False, time.monotonic() - started)
+        return []
+
+    results = []
+    seen_ids = set()
+    futures = [(video_id, table.resolve(video_id, video_url, client)) for video_id, video_url in videos]
+    for video_id, future in futures:
+        if cancelled is not None and cancelled.is_set():
+            table.release([(requested, client) for requested, _ in videos])
+            return None
+        try:
+            info = future.result()
+        except Exception:
+            continue
+        if info and video_id not in seen_ids:
+            seen_ids.add(video_id)
+            results.append({
+                "name": info["name"],
+                "logo": info["logo"],
+                "url": info["url"],
+                "category": category,
+                "channel": info["channel"],
+                "id": video_id,
+                "client": client,
+                "channel_id": info["channel_id"]
+            })
+
+    stats.record(client, bool(results), time.monotonic() - started)
+    if results:
+        print(f"    Successfully extracted {len(results)} valid streams with {client}.")
+    else:
+        print(f"    Found entries but failed to resolve streams with {client}. Trying next...")
+    return results
+
+def race_clients(category, table, clients, stats):
+    """
+    try_client() with several clients at once. The first to find streams
+    wins, and the others stop before resolving anything more.
+    """
+    cancelled = {client: threading.Event() for client in clients}
+    racer = concurrent.futures.ThreadPoolExecutor(max_workers=len(clients))
+    try:
+        pending = {racer.submit(try_client, category, table, client, stats, cancelled[client]): client
+                   for client in clients}
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                results = future.result()
+                if results:
+                    for loser in pending.values():
+                        cancelled[loser].set()
+                    return results
+        return []
+    finally:
+        racer.shutdown(wait=False)
+
+def get_live_streams(category, table, stats):
+    """
+    Fetches live streams for a given category using yt-dlp with client fallback strategies.
+    Clients are tried best first by their record in earlier runs, the two
+    best racing each other with RACE_CLIENTS. Resolution goes through the
+    shared table, so videos already resolved for another category are not
+    extracted again.
+    """
+    print(f"Fetching live streams for category: {category}...")
+
+    clients = stats.ranked()
+    if RACE_CLIENTS and len(clients) > 1:
+        results = race_clients(category, table, clients[:2], stats)
         if results:
-            break
+            return results
+        clients = clients[2:]
+
+    for client in clients:
+        results = try_client(category, table, client, stats)
+        if results:
+            # If we found data, stop trying other clients for this category
+            return results
             
-    if not results:
-        print(f"Warning: Could not find any streams for {category} with any client.")
+    print(f"Warning: Could not find any streams for {category} with any client.")
+    return []
 
-    return results
+def load_previous_streams():
+    """The streams of the last run's JSON output, or []."""
+    try:
+        with open(JSON_FILE, encoding="utf-8") as f:
+            return json.load(f).get("streams") or []
+    except (OSError, ValueError, AttributeError):
+        return []
+
+def load_refresh_state():
+    try:
+        with open(REFRESH_STATE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-def resolve_stream_info(video_url, category, client_type='android', retries=2):
+def needs_discovery(state, previous):
+    return (
+        os.environ.get(DISCOVER_ENV) == "1"
+        or time.time() - state.get("discovered_at", 0) > DISCOVER_EVERY
+        or not previous
+        # Written before streams remembered their video id and client
+        or any("id" not in stream or "client" not in stream for stream in previous)
+    )
+
+def expiry_index(streams):
+    """(expiry times ascending, streams in the same order); URLs without an expiry sort first."""
+    pairs = sorted(((net.url_expiry(stream["url"]) or 0, i) for i, stream in enumerate(streams)))
+    return [expires for expires, _ in pairs], [streams[i] for _, i in pairs]
+
+def refresh_streams(previous, table, executor):
     """
-    Resolves the M3U8 stream URL and other details for a specific video.
+    The previous run's streams, brought up to date without searching.
+    Streams expiring within EXPIRY_MARGIN are resolved again right away;
+    the rest are probed, and resolved again only if their manifest no
+    longer answers. Videos that are no longer live drop out. Keeps the
+    previous order.
     """
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'format': 'best', 
-        'ignoreerrors': True,
-        'extractor_args': {'youtube': {'player_client': [client_type]}},
+    expiries, streams = expiry_index(previous)
+    due = bisect.bisect_right(expiries, time.time() + EXPIRY_MARGIN)
+    stale = streams[:due]
+    alive = executor.map(lambda stream: net.probe_url(stream["url"]), streams[due:])
+    stale += [stream for stream, ok in zip(streams[due:], alive) if not ok]
+    print(f"Refreshing {len(previous)} streams: {due} near expiry, {len(stale) - due} no longer answering.")
+
+    futures = {
+        stream["id"]: table.resolve(stream["id"], f"https://www.youtube.com/watch?v={stream['id']}", stream["client"])
+        for stream in stale
     }
-    
-    if os.path.exists(COOKIES_FILE):
-        ydl_opts['cookiefile'] = COOKIES_FILE
-    
+    refreshed = []
+    for stream in previous:
+        future = futures.get(stream["id"])
+        if future is None:
+            refreshed.append(stream)
+            continue
+        try:
+            info = future.result()
+        except Exception:
+            info = None
+        if info:
+            refreshed.append(dict(stream, name=info["name"], logo=info["logo"], url=info["url"], channel=info["channel"],
+                                  channel_id=info["channel_id"] or stream.get("channel_id")))
+    print(f"{len(previous) - len(refreshed)} streams ended.")
+    return refreshed
+
+def check_watchlist(watchlist, streams, table, client):
+    """
+    Streams of watched channels that went live since streams were found,
+    checked all at once through each channel's /live page rather than by
+    searching their category.
+    """
+    live_channels = {stream.get("channel_id") for stream in streams}
+    known_ids = {stream["id"] for stream in streams}
+    futures = [
+        (channel_id, entry, table.resolve(f"channel/{channel_id}",
+                                          f"https://www.youtube.com/channel/{channel_id}/live", client))
+        for channel_id, entry in watchlist.channels.items() if channel_id not in live_channels
+    ]
+    found = []
+    for channel_id, entry, future in futures:
+        try:
+            info = future.result()
+        except Exception:
+            continue
+        if info and info["id"] and info["id"] not in known_ids:
+            known_ids.add(info["id"])
+            found.append({
+                "name": info["name"],
+                "logo": info["logo"],
+                "url": info["url"],
+                "category": entry["category"],
+                "channel": info["channel"],
+                "id": info["id"],
+                "client": client,
+                "channel_id": channel_id
+            })
+    print(f"Watchlist: {len(futures)} channels checked, {len(found)} newly live.")
+    return found
+
+def resolve_stream_info(pool, video_url, client_type='android', retries=2):
+    """
+    Resolves the M3U8 stream URL and other details for a specific video,
+    with a pooled extractor for the client.
+    """
     for attempt in range(retries + 1):
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with pool.extractor(client_type) as ydl:
             try:
                 info = ydl.extract_info(video_url, download=False)
                 
@@ -159,47 +520,78 @@ def resolve_stream_info(video_url, category, client_type='android', retries=2):
                     "name": info.get('title', 'Unknown Title'),
                     "logo": info.get('thumbnail', ''),
                     "url": info.get('url', ''), 
-                    "category": category,
-                    "channel": info.get('uploader', 'Unknown Channel')
+                    "channel": info.get('uploader', 'Unknown Channel'),
+                    "id": info.get('id'),
+                    "channel_id": info.get('channel_id')
                 }
             except Exception:
-                if attempt == retries:
-                    pass
                 continue
     return None
 
-def generate_m3u(streams):
-    print(f"Generating M3U playlist with {len(streams)} streams...")
-    # BD Time (UTC + 6)
-    utc_now = datetime.now(timezone.utc)
-    bd_time = utc_now + timedelta(hours=6)
-    formatted_time = bd_time.strftime("%Y-%m-%d %I:%M %p")
+# Extractors of a resolver worker process, created once by its initializer
+_worker_pool = None
 
-    m3u_header = f"""#EXTM3U
+def _init_worker(factory=None):
+    global _worker_pool
+    _worker_pool = ExtractorPool(factory)
+
+def _resolve_in_worker(video_url, client):
+    return resolve_stream_info(_worker_pool, video_url, client)
+
+@contextlib.contextmanager
+def resolver(mode=RESOLVE_MODE, workers=RESOLVE_WORKERS, factory=None):
+    """
+    (executor, resolve) for resolving videos: resolve(video_url, client)
+    submitted to executor returns resolve_stream_info()'s result.
+
+    "thread" shares one ExtractorPool between worker threads. "process"
+    starts warm worker processes, each building its own extractors once
+    and sending back only the small result dicts as they finish. Workers
+    are spawned rather than forked, since the parent already runs search
+    threads when they start.
+    """
+    if mode == "process":
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                    initializer=_init_worker, initargs=(factory,)) as executor:
+            yield executor, _resolve_in_worker
+    elif mode == "thread":
+        pool = ExtractorPool(factory)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                yield executor, functools.partial(resolve_stream_info, pool)
+        finally:
+            pool.close()
+    else:
+        raise ValueError(f"unknown resolve mode {mode!r}, expected 'thread' or 'process'")
+
+def yt_banner(count):
+    return f"""#EXTM3U
 #=================================
 # Developed By: OMNIX EMPIRE
 # Source: YouTube Live API
-# Last Updated: {formatted_time} (BD Time)
-# Total Channels: {len(streams)}
+# Last Updated: {m3u.bd_time()} (BD Time)
+# Total Channels: {count}
 #================================="""
-    
-    with open(M3U_FILE, 'w', encoding='utf-8') as f:
-        f.write(m3u_header + '\n')
-        
+
+def generate_m3u(streams):
+    print(f"Generating M3U playlist with {len(streams)} streams...")
+    options = (
+        f'#EXTVLCOPT:http-user-agent={USER_AGENT}',
+        f'#EXTHTTP:{{"User-Agent": "{USER_AGENT}"}}',
+    )
+
+    with m3u.M3UWriter(M3U_FILE, header=yt_banner) as writer:
         for stream in streams:
             name = stream.get('name', 'Unknown')
-            logo = stream.get('logo', '')
-            url = stream.get('url', '')
-            group = stream.get('category', 'Uncategorized')
             channel_name = stream.get('channel', '')
-            
-            # Write #EXTINF line
-            f.write(f'#EXTINF:-1 tvg-logo="{logo}" group-title="{group}",{name} ({channel_name})\n')
-            # Write User-Agent headers
-            f.write(f'#EXTVLCOPT:http-user-agent={USER_AGENT}\n')
-            f.write(f'#EXTHTTP:{{"User-Agent": "{USER_AGENT}"}}\n')
-            # Write URL
-            f.write(f'{url}\n')
+            writer.write_entry(m3u.Channel(
+                f"{name} ({channel_name})",
+                stream.get('url', ''),
+                logo=stream.get('logo', ''),
+                group=stream.get('category', 'Uncategorized'),
+                options=options,
+            ))
 
     print(f"Saved M3U to {M3U_FILE}")
 
@@ -210,27 +602,67 @@ def generate_json(streams):
         "total": len(streams),
         "streams": streams
     }
-    with open(JSON_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
-    print("Saved JSON.")
+    # "updated" alone changing does not rewrite the file
+    if m3u.write_json(JSON_FILE, data, volatile=("updated",), ensure_ascii=True):
+        print("Saved JSON.")
+    else:
+        print("JSON unchanged.")
 
 def main():
     print("Starting YouTube Live Playlist Generator...")
+    print(f"yt-dlp version: {yt_dlp.version.__version__}")
+    if os.path.exists(COOKIES_FILE):
+        print(f"Cookies found at: {COOKIES_FILE}")
+    else:
+        print("No cookies.txt found. Search results may be limited.")
+    print(f"Resolving with {RESOLVE_WORKERS} {RESOLVE_MODE} workers.")
+    stats = ClientStats()
+    print(f"Client order: {stats.describe()}")
+
+    previous = load_previous_streams()
+    state = load_refresh_state()
+    watchlist = Watchlist()
     all_streams = []
+    pool = ExtractorPool()
     
-    # Use ThreadPoolExecutor to fetch categories in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_category = {executor.submit(get_live_streams, cat): cat for cat in CATEGORIES}
-        for future in concurrent.futures.as_completed(future_to_category):
-            category = future_to_category[future]
-            try:
-                streams = future.result()
-                all_streams.extend(streams)
-                print(f"Found {len(streams)} streams for {category}")
-            except Exception as e:
-                print(f"Exception for category {category}: {e}")
+    # Categories are searched in parallel; every resolution, whichever
+    # category asked for it, shares one RESOLVE_WORKERS pool
+    try:
+        with resolver() as (resolve_executor, resolve), \
+                concurrent.futures.ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+            table = VideoTable(resolve_executor, resolve, pool)
+            if not needs_discovery(state, previous):
+                all_streams = refresh_streams(previous, table, executor)
+                all_streams += check_watchlist(watchlist, all_streams, table, stats.ranked()[0])
+                # Channels found live on the watchlist join their category
+                rank = {category: i for i, category in enumerate(CATEGORIES)}
+                all_streams.sort(key=lambda stream: rank.get(stream["category"], len(rank)))
+                if not all_streams:
+                    print("No stream survived the refresh, searching instead.")
+
+            if not all_streams:
+                by_category = {}
+                future_to_category = {executor.submit(get_live_streams, cat, table, stats): cat for cat in CATEGORIES}
+                for future in concurrent.futures.as_completed(future_to_category):
+                    category = future_to_category[future]
+                    try:
+                        by_category[category] = future.result()
+                        print(f"Found {len(by_category[category])} streams for {category}")
+                    except Exception as e:
+                        print(f"Exception for category {category}: {e}")
+                # Category order, not completion order, so unchanged results give an unchanged playlist
+                all_streams = [stream for cat in CATEGORIES for stream in by_category.get(cat, [])]
+                state["discovered_at"] = time.time()
+    finally:
+        pool.close()
+    stats.save()
+    m3u.write_json(REFRESH_STATE, state, indent=None)
+    watchlist.update(all_streams, time.time())
+    dropped = watchlist.expire(time.time())
+    watchlist.save()
+    print(f"Watching {len(watchlist)} channels ({dropped} no longer live dropped).")
     
-    print(f"Total streams found: {len(all_streams)}")
+    print(f"Total streams found: {len(all_streams)} ({table.resolved} videos resolved)")
     
     generate_m3u(all_streams)
     generate_json(all_streams)
@@ -0,0 +1,131 @@
+"""
+net.probe_urls and net.ProbeCache against a local HTTP server.
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+import net
+
+DEADLINE = 1
+# How long /slow.m3u8 keeps a probe waiting; well past DEADLINE
+SLOW_SECONDS = 3
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/vnd.apple.mpegurl")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        hits = self.server.hits
+        hits[self.path] = hits.get(self.path, 0) + 1
+        if self.path == "/live.m3u8":
+            self.send_body(200, b"#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXTINF:6,\nseg1.ts\n")
+        elif self.path == "/slow.m3u8":
+            time.sleep(SLOW_SECONDS)
+            self.send_body(200, b"#EXTM3U\n")
+        elif self.path == "/error.m3u8":
+            self.send_body(200, b"<html>stream offline</html>")
+        else:
+            self.send_body(404, b"")
+
+
+def refused_port():
+    """A local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ProbeUrlsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StreamHandler)
+        cls.server.daemon_threads = True
+        cls.server.hits = {}
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.live = f"{base}/live.m3u8"
+        cls.slow = f"{base}/slow.m3u8"
+        cls.missing = f"{base}/missing.m3u8"
+        cls.error = f"{base}/error.m3u8"
+        cls.refused = f"http://127.0.0.1:{refused_port()}/live.m3u8"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.hits.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = net.ProbeCache(path=os.path.join(directory.name, "probes.sqlite"))
+        self.addCleanup(self.cache.close)
+
+    def probe(self, urls):
+        return asyncio.run(net.probe_urls([(url, {}) for url in urls], self.cache, deadline=DEADLINE))
+
+    def test_alive_flags(self):
+        urls = [self.live, self.missing, self.error, self.refused, "rtmp://127.0.0.1/live"]
+        probes = self.probe(urls)
+        self.assertEqual([probe.url for probe in probes], urls)
+        self.assertEqual([probe.alive for probe in probes], [True, False, False, False, None])
+        self.assertEqual(probes[0].status, 200)
+        self.assertEqual(probes[1].status, 404)
+        self.assertIsNone(probes[3].status)
+
+    def test_deadline(self):
+        started = time.monotonic()
+        slow, live = self.probe([self.slow, self.live])
+        elapsed = time.monotonic() - started
+        self.assertFalse(slow.alive)
+        self.assertIsNone(slow.status)
+        self.assertTrue(live.alive)
+        self.assertLess(elapsed, SLOW_SECONDS)
+
+    def test_duplicate_urls_probed_once(self):
+        probes = self.probe([self.live, self.live])
+        self.assertEqual([probe.alive for probe in probes], [True, True])
+        self.assertEqual(self.server.hits["/live.m3u8"], 1)
+
+    def test_ttl_skips_fresh_live_urls(self):
+        self.probe([self.live, self.missing])
+        live, missing = self.probe([self.live, self.missing])
+        self.assertTrue(live.alive)
+        self.assertTrue(live.cached)
+        self.assertEqual(self.server.hits["/live.m3u8"], 1)
+        # Dead streams are always probed again
+        self.assertFalse(missing.cached)
+        self.assertEqual(self.server.hits["/missing.m3u8"], 2)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_expired_live_urls_probed_again(self):
+        self.cache.ttl = 0
+        self.probe([self.live])
+        live, = self.probe([self.live])
+        self.assertFalse(live.cached)
+        self.assertEqual(self.server.hits["/live.m3u8"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()